@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Pipeline asyncio : un seul processus, plusieurs vidéos, des centaines de
+requêtes API en vol sans un thread par requête
+Clients asynchrones Google (SpeechAsyncClient, TextToSpeechAsyncClient,
+TranslationServiceAsyncClient) sous gouvernance par service (governance.py) ;
+yt-dlp et ffmpeg tournent dans des exécuteurs.
+Utilisation: uv run python async_pipeline.py URL [URL...]
+"""
+
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from config import Config
+from lazy import LazyClient, speech, texttospeech, translate_v2, translate_v3
+import metrics
+from metrics import api_call
+from chunked_transcription import (
+    align_chunks,
+    plan_chunks,
+    read_pcm,
+    recognition_config,
+    words_from_response,
+)
+from governance import Governor
+from translation_batch import apply_translations, pack_batches, translated_text
+from translation_memory import get_translation_memory, normalize
+from tts_cache import cache_key, encoding_tag, get_tts_cache
+from audio_utils import convert_to_wav
+from mixdown import mixdown_timeline
+from timeline import PCMTimeline, decode_linear16, expected_duration
+from jobs import JobStore, run_stage, stage_inputs, video_id_from_url
+from workspace import Workspace
+from word_timeline import WordTimeline
+import translate_youtube_complete as complete
+
+
+class AsyncServices:
+    """Clients asynchrones partagés par toutes les vidéos de la boucle"""
+
+    def __init__(self):
+        # Clients construits au premier appel : rien à ouvrir pour une vidéo en cache
+        self.speech = LazyClient(lambda: speech.SpeechAsyncClient())
+        self.tts = LazyClient(lambda: texttospeech.TextToSpeechAsyncClient())
+        if Config.GOOGLE_PROJECT:
+            self.translate = LazyClient(
+                lambda: translate_v3.TranslationServiceAsyncClient()
+            )
+        else:
+            # Pas de projet : client v2 synchrone, appelé dans un thread
+            self.translate = None
+            self.translate_v2 = LazyClient(lambda: translate_v2.Client())
+        self.governors = {
+            service: Governor(service, size)
+            for service, size in Config.ASYNC_LIMITS.items()
+        }
+        self._tts_inflight = {}
+
+    # Speech-to-Text
+    async def recognize_chunk(self, wav_file, start, end):
+        pcm = await asyncio.to_thread(read_pcm, wav_file, start, end)
+        audio = speech.RecognitionAudio(content=pcm)
+
+        async def recognize():
+            with api_call("speech", "long_running_recognize") as call:
+                call.sent(len(pcm))
+                operation = await self.speech.long_running_recognize(
+                    config=recognition_config(), audio=audio
+                )
+                return await operation.result(timeout=Config.API_TIMEOUT)
+
+        response = await self.governors["stt"].acall(recognize)
+        return words_from_response(response, offset=start)
+
+    async def transcribe(self, wav_file):
+        chunks = await asyncio.to_thread(plan_chunks, wav_file)
+        overlap = Config.TRANSCRIBE_OVERLAP_SECONDS
+        print(f"⏳ Transcription en {len(chunks)} morceaux...")
+        chunk_words = await asyncio.gather(
+            *(
+                self.recognize_chunk(wav_file, max(0.0, start - overlap), end)
+                for start, end in chunks
+            )
+        )
+        words = WordTimeline.concat(align_chunks(chunk_words, [s for s, _ in chunks]))
+        metrics.inc("segments_total", len(words), kind="words")
+        return words
+
+    # Traduction
+    async def translate_batch(self, values, source_language, target_language):
+        return await self.governors["translate"].acall(
+            self._translate_batch, values, source_language, target_language
+        )
+
+    async def _translate_batch(self, values, source_language, target_language):
+        with api_call("translate", "translate") as call:
+            call.sent(chars=sum(len(v) for v in values))
+            if self.translate is None:
+                response = await asyncio.to_thread(
+                    self.translate_v2.translate,
+                    values,
+                    source_language=source_language,
+                    target_language=target_language,
+                )
+                return [translated_text(item) for item in response]
+
+            response = await self.translate.translate_text(
+                request={
+                    "parent": f"projects/{Config.GOOGLE_PROJECT}/locations/global",
+                    "contents": values,
+                    "mime_type": "text/plain",
+                    "source_language_code": source_language,
+                    "target_language_code": target_language,
+                }
+            )
+            return [t.translated_text for t in response.translations]
+
+    async def translate_texts(self, texts, source_language="en", target_language="fr"):
+        """Traduit via la mémoire puis l'API par lots concurrents
+
+        Même contrat que `translate_texts` : liste alignée de (traduction, erreur).
+        """
+        memory = get_translation_memory()
+        found = {}
+        if memory is not None:
+            found = await asyncio.to_thread(
+                memory.lookup_many, texts, source_language, target_language
+            )
+
+        unique = list(dict.fromkeys(normalize(t) for t in texts))
+        missing = [t for t in unique if t not in found]
+
+        async def run(batch):
+            values = [missing[i] for i in batch]
+            try:
+                response = await self.translate_batch(
+                    values, source_language, target_language
+                )
+                return [(v, (dst, None)) for v, dst in zip(values, response)]
+            except Exception as e:
+                print(f"⚠️ Erreur traduction lot de {len(values)} segments: {e}")
+                return [(v, (None, e)) for v in values]
+
+        batches = await asyncio.gather(*(run(b) for b in pack_batches(missing)))
+        translated = dict(pair for batch in batches for pair in batch)
+        if memory is not None:
+            await asyncio.to_thread(
+                memory.store_many,
+                [(src, dst) for src, (dst, error) in translated.items() if error is None],
+                source_language,
+                target_language,
+            )
+        results = {text: (dst, None) for text, dst in found.items()}
+        results.update(translated)
+        metrics.inc("segments_total", len(texts), kind="translated")
+        return [results[normalize(t)] for t in texts]
+
+    # Text-to-Speech
+    async def synthesize(self, text, voice_name, caches, language="fr"):
+        """Synthèse LINEAR16 avec caches ; les requêtes identiques partagent un appel"""
+        language_code = Config.LANGUAGES[language]["code"]
+        key = cache_key(
+            text,
+            voice_name,
+            language_code,
+            Config.SPEAKING_RATE,
+            encoding_tag("LINEAR16"),
+        )
+        for cache in caches:
+            data = await asyncio.to_thread(cache.get, key)
+            if data is not None:
+                return data
+
+        task = self._tts_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._synthesize(text, voice_name, language_code)
+            )
+            self._tts_inflight[key] = task
+            task.add_done_callback(lambda _: self._tts_inflight.pop(key, None))
+        data = await task
+        for cache in caches:
+            await asyncio.to_thread(cache.put, key, data)
+        return data
+
+    async def _synthesize(self, text, voice_name, language_code):
+        async def send():
+            with api_call("tts", "synthesize_speech") as call:
+                call.sent(chars=len(text))
+                response = await self.tts.synthesize_speech(
+                    input=texttospeech.SynthesisInput(text=text),
+                    voice=texttospeech.VoiceSelectionParams(
+                        language_code=language_code, name=voice_name
+                    ),
+                    audio_config=texttospeech.AudioConfig(
+                        audio_encoding=texttospeech.AudioEncoding.LINEAR16,
+                        speaking_rate=Config.SPEAKING_RATE,
+                        sample_rate_hertz=Config.TTS_SAMPLE_RATE,
+                    ),
+                )
+                call.received(len(response.audio_content))
+            return response.audio_content
+
+        return await self.governors["tts"].acall(send)
+
+
+async def resume_stage_async(job, name, compute):
+    """Comme `resume_stage`, pour une étape coroutine (clé de `stage_inputs`)"""
+    if job is not None:
+        data = await asyncio.to_thread(job.load, name, job.keys[name])
+        if data is not None:
+            print(f"♻️ Étape reprise: {name}")
+            return data
+    data = await compute()
+    if job is not None:
+        await asyncio.to_thread(job.save, name, job.keys[name], data)
+    return data
+
+
+async def translate_video(services, url):
+    """Traduit une vidéo ; renvoie le chemin du MP3 produit ou None"""
+    job = JobStore.for_url(url) if Config.JOBS_ENABLED else None
+    job_metrics = metrics.start_job(
+        f"{video_id_from_url(url)}_{datetime.now():%Y%m%d_%H%M%S}"
+    )
+    workspace = Workspace(video_id_from_url(url))
+
+    try:
+        # Téléchargement (ou métadonnées seules en flux) dans un exécuteur
+        streamed = Config.DOWNLOAD_MODE == "stream"
+        if streamed:
+            audio_file, metadata = await asyncio.to_thread(
+                run_stage,
+                job,
+                "download",
+                [url, "stream"],
+                lambda: (None, complete.fetch_metadata(url)),
+            )
+        else:
+            output_base = str(job.dir / "source") if job else workspace.path("source")
+            audio_file, metadata = await asyncio.to_thread(
+                run_stage,
+                job,
+                "download",
+                [url, Config.DOWNLOAD_FORMAT],
+                lambda: complete.download_audio(url, output_base),
+                lambda data: Path(data[0]).exists(),
+            )
+        if job:
+            stage_inputs(job)
+
+        # Chaque étape reprise par sa clé ; une étape reprise n'exécute (ni ne
+        # relit) les précédentes
+        async def transcribe():
+            if streamed:
+                return await asyncio.to_thread(complete.transcribe_url, url)
+            wav_file = await asyncio.to_thread(
+                convert_to_wav, audio_file, workspace.path("audio_mono.wav")
+            )
+            return await services.transcribe(wav_file)
+
+        async def group():
+            words = await resume_stage_async(job, "words", transcribe)
+            return complete.group_segments_by_speaker(words)
+
+        async def translate():
+            grouped = await resume_stage_async(job, "grouped", group)
+            metrics.inc("segments_total", len(grouped), kind="grouped")
+            results = await services.translate_texts([s["text"] for s in grouped])
+            return list(apply_translations(grouped, results))
+
+        translated = await resume_stage_async(job, "translated", translate)
+
+        # Synthèse concurrente, ordre conservé par gather ; clips PCM en mémoire
+        job_cache = job.tts_cache() if job else None
+        caches = [c for c in (job_cache, get_tts_cache()) if c is not None]
+        voices = Config.LANGUAGES["fr"]["voices"]
+
+        async def synthesize(i, segment):
+            voice_name = voices.get(segment["speaker"], voices[1])
+            try:
+                audio = await services.synthesize(segment["text_fr"], voice_name, caches)
+                return decode_linear16(audio), segment["start_time"]
+            except Exception as e:
+                metrics.drop("tts", i, e, start_time=segment["start_time"])
+                return None
+
+        print(f"⏳ Génération audio TTS: {len(translated)} segments")
+        clips = await asyncio.gather(
+            *(synthesize(i, s) for i, s in enumerate(translated))
+        )
+        clips = [clip for clip in clips if clip is not None]
+        metrics.inc("segments_total", len(clips), kind="tts")
+
+        # Sortie longue : tampon mappé sur un fichier, comme les scripts
+        duration = expected_duration(metadata.get("duration"), translated)
+        timeline = PCMTimeline(
+            duration,
+            sample_rate=Config.TTS_SAMPLE_RATE,
+            backing_file=(
+                workspace.path("timeline.pcm")
+                if duration > Config.TIMELINE_MMAP_MIN_SECONDS
+                else None
+            ),
+        )
+        for pcm, start_time in clips:
+            timeline.place(start_time, pcm)
+
+        safe_title = metadata["title"].replace("/", "_").replace("\\", "_")
+        final_output = f"output/{safe_title}_traduit.mp3"
+        Path("output").mkdir(exist_ok=True)
+        ok = await asyncio.to_thread(
+            mixdown_timeline, timeline, final_output, metadata
+        )
+        if ok:
+            print(f"🎉 {url} → {final_output}")
+            return final_output
+        return None
+
+    except SystemExit as e:
+        # Les étapes partagées avec les scripts s'arrêtent par sys.exit
+        print(f"❌ {url}: sortie anticipée (code {e.code})")
+        return None
+    except Exception as e:
+        print(f"❌ {url}: {e}")
+        return None
+    finally:
+        workspace.cleanup()
+        metrics.write_reports(job_metrics)
+
+
+async def run(urls):
+    """Traduit plusieurs vidéos en parallèle dans une seule boucle"""
+    services = AsyncServices()
+    return await asyncio.gather(*(translate_video(services, url) for url in urls))
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: uv run python async_pipeline.py URL [URL...]")
+        sys.exit(1)
+
+    outputs = asyncio.run(run(sys.argv[1:]))
+    failed = sum(output is None for output in outputs)
+    print(f"🎉 {len(outputs) - failed} vidéos traduites, {failed} échecs")
+    sys.exit(0 if failed == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Téléchargement en flux : yt-dlp → ffmpeg → PCM 16 kHz mono sur stdout
+Le PCM est découpé aux silences au fil de la lecture : la reconnaissance des
+premières minutes commence pendant que la fin se télécharge, sans fichier temporaire.
+"""
+
+import subprocess
+import sys
+from contextlib import contextmanager
+
+from config import Config
+from lazy import yt_dlp
+from limits import limit, popen_limited
+from metrics import api_call, timed_stage
+from jobs import video_id_from_url
+from source_cache import get_source_cache
+from chunked_transcription import (
+    BYTES_PER_SECOND,
+    FRAME_MS,
+    find_split_points,
+    iter_pcm_chunk_words,
+    max_chunk_seconds,
+)
+from vad import pcm_levels
+from word_timeline import WordTimeline
+
+SAMPLE_RATE = 16000
+READ_BYTES = BYTES_PER_SECOND  # Lecture par blocs d'une seconde
+
+
+@timed_stage("download")
+def fetch_metadata(url):
+    """Titre, auteur et durée de la vidéo, sans télécharger l'audio"""
+    with limit("download"), api_call("youtube", "metadata"):
+        with yt_dlp.YoutubeDL({"quiet": True}) as ydl:
+            info = ydl.extract_info(url, download=False)
+    if not info:
+        raise Exception("Impossible d'extraire les informations de la vidéo")
+    metadata = {
+        "title": info.get("title", "Unknown Title"),
+        "uploader": info.get("uploader", "Unknown Uploader"),
+        "duration": info.get("duration") or 0,
+    }
+    print(f"✅ Métadonnées: {metadata['title']}")
+    return metadata
+
+
+def stream_commands(url, audio_format=None, source=None):
+    """Commandes yt-dlp (audio sur stdout) et ffmpeg (PCM s16le 16 kHz mono)
+
+    Avec `source` (audio déjà en cache), ffmpeg lit le fichier et yt-dlp n'est
+    pas lancé (commande None).
+    """
+    audio_format = audio_format or Config.DOWNLOAD_FORMAT
+    download = None if source else [
+        sys.executable,
+        "-m",
+        "yt_dlp",
+        "--quiet",
+        "--no-part",
+        "-f",
+        audio_format,
+        "-o",
+        "-",
+        url,
+    ]
+    convert = [
+        "ffmpeg",
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-i",
+        str(source) if source else "pipe:0",
+        "-ac",
+        "1",
+        "-ar",
+        str(SAMPLE_RATE),
+        "-f",
+        "s16le",
+        "pipe:1",
+    ]
+    return download, convert
+
+
+@contextmanager
+def open_pcm_stream(url):
+    """Ouvre le flux PCM d'une vidéo (objet fichier binaire de ffmpeg)
+
+    Les deux processus sont arrêtés à la sortie ; un code de retour non nul
+    après lecture complète lève une exception. yt-dlp n'occupe une place de
+    téléchargement que jusqu'à sa fin ; le décodeur, actif pendant toute la
+    transcription, a sa propre limite ("stream") et ne prive pas les
+    conversions courtes des autres jobs de leurs places ffmpeg.
+    """
+    source_cache = get_source_cache()
+    source = source_cache and source_cache.path(
+        video_id_from_url(url), Config.DOWNLOAD_FORMAT
+    )
+    if source:
+        print("♻️ Audio source repris du cache")
+    download_cmd, convert_cmd = stream_commands(url, source=source)
+
+    with limit("stream"), api_call("youtube", "stream") as call:
+        download = None
+        if download_cmd:
+            download = popen_limited(
+                "download", download_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
+        convert = subprocess.Popen(
+            convert_cmd,
+            stdin=download.stdout if download else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        if download:
+            # ffmpeg détient désormais la lecture : yt-dlp reçoit SIGPIPE s'il s'arrête
+            download.stdout.close()
+        processes = [p for p in (convert, download) if p]
+        reader = _CountingReader(convert.stdout)
+        completed = False
+        try:
+            yield reader
+            completed = True
+        finally:
+            call.received(reader.bytes_read)
+            for process in processes:
+                if not completed and process.poll() is None:
+                    process.kill()
+            convert.stdout.close()
+            errors = [p.stderr.read().decode(errors="replace") for p in processes]
+            for process in processes:
+                process.wait()
+
+        if download and download.returncode != 0:
+            raise Exception(f"yt-dlp a échoué: {errors[1].strip()}")
+        if convert.returncode != 0:
+            raise Exception(f"ffmpeg a échoué: {errors[0].strip()}")
+
+
+class _CountingReader:
+    """Lecture bloquante par blocs complets, avec compte des octets lus"""
+
+    def __init__(self, raw):
+        self._raw = raw
+        self.bytes_read = 0
+
+    def read(self, size):
+        data = self._raw.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def iter_pcm_chunks(stream, max_seconds=None, overlap=None):
+    """Générateur : morceaux (début, début des données, PCM) coupés aux silences
+
+    Même découpage que `plan_chunks`, mais au fil de la lecture : un morceau est
+    rendu dès que l'audio lu dépasse `max_seconds` après son début.
+    """
+    max_seconds = max_seconds or max_chunk_seconds()
+    overlap = Config.TRANSCRIBE_OVERLAP_SECONDS if overlap is None else overlap
+    frame_samples = SAMPLE_RATE * FRAME_MS // 1000
+    max_bytes = int(max_seconds * BYTES_PER_SECOND)
+
+    buffer = bytearray()
+    buffer_start = 0  # Position (octets) du début du tampon dans le flux
+    chunk_start = 0  # Position (octets) du début du morceau courant
+
+    def seconds(position):
+        return position / BYTES_PER_SECOND
+
+    def emit(end):
+        data_start = max(0, chunk_start - int(overlap * SAMPLE_RATE) * 2)
+        pcm = bytes(buffer[data_start - buffer_start : end - buffer_start])
+        return seconds(chunk_start), seconds(data_start), pcm
+
+    while True:
+        data = stream.read(READ_BYTES)
+        buffer += data
+        buffer_end = buffer_start + len(buffer)
+
+        while buffer_end - chunk_start > max_bytes:
+            # Vue sur le tampon, libérée avant qu'il ne soit raccourci
+            with memoryview(buffer) as view:
+                levels = pcm_levels(view[chunk_start - buffer_start :], frame_samples)
+            splits = find_split_points(levels, max_seconds)
+            if splits:
+                cut = chunk_start + int(splits[0] * SAMPLE_RATE) * 2
+            else:
+                cut = chunk_start + max_bytes // 2 * 2
+            yield emit(cut)
+            chunk_start = cut
+
+            # On ne garde que le recouvrement du prochain morceau
+            keep_from = max(buffer_start, chunk_start - int(overlap * SAMPLE_RATE) * 2)
+            del buffer[: keep_from - buffer_start]
+            buffer_start = keep_from
+
+        if not data:
+            break
+
+    if buffer_start + len(buffer) > chunk_start:
+        yield emit(buffer_start + len(buffer))
+
+
+def iter_url_words(url, client=None, max_workers=None):
+    """Générateur : mots alignés de chaque morceau, lus en flux depuis YouTube"""
+    print("⏳ Transcription en flux pendant le téléchargement...")
+    with open_pcm_stream(url) as stream:
+        yield from iter_pcm_chunk_words(iter_pcm_chunks(stream), client, max_workers)
+
+
+def transcribe_url(url, client=None):
+    """Transcrit une vidéo en flux, sans fichier audio intermédiaire"""
+    return WordTimeline.concat(iter_url_words(url, client))
@@ -0,0 +1,42 @@
+"""
+Utilitaires audio partagés (conversion ffmpeg)
+"""
+
+import subprocess
+
+from limits import limit
+from metrics import api_call, timed_stage
+
+
+@timed_stage("ffmpeg_wav")
+def convert_to_wav(input_file, output_file="temp_audio_mono.wav"):
+    """Convertit l'audio en WAV mono pour Google Speech-to-Text"""
+    try:
+        # Convertir en WAV mono 16kHz (format requis par Google)
+        cmd = [
+            "ffmpeg",
+            "-y",
+            "-i",
+            input_file,
+            "-ac",
+            "1",  # Mono
+            "-ar",
+            "16000",  # 16kHz
+            "-acodec",
+            "pcm_s16le",  # WAV format
+            output_file,
+        ]
+
+        with limit("ffmpeg"), api_call("ffmpeg", "convert_to_wav"):
+            result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"⚠️ Erreur ffmpeg: {result.stderr}")
+            # Si ffmpeg échoue, essayer de continuer avec le fichier original
+            return input_file
+
+        print("✅ Conversion audio: WAV mono 16kHz")
+        return output_file
+
+    except FileNotFoundError:
+        print("⚠️ ffmpeg non trouvé, utilisation du fichier original")
+        return input_file
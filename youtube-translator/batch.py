@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Mode batch : playlists, chaînes ou fichiers d'URL
+Les vidéos passent dans un pool de jobs ; les ressources (téléchargement,
+ffmpeg, STT, traduction, TTS) gardent chacune leur limite de concurrence.
+Utilisation: uv run python batch.py [--complete] [--jobs N] SOURCE [SOURCE...]
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from config import Config
+from jobs import video_id_from_url
+from lazy import yt_dlp
+
+
+_VIDEO_PARAM = re.compile(r"[?&]v=")
+
+
+def is_batch_source(source):
+    """Vrai si la source désigne plusieurs vidéos (fichier d'URL ou playlist)
+
+    watch?v=ID&list=... désigne une seule vidéo (lue depuis une playlist).
+    """
+    if Path(source).is_file() or "/@" in source:
+        return True
+    return "list=" in source and not _VIDEO_PARAM.search(source)
+
+
+def expand_source(source, failures=None):
+    """Liste des URL de vidéos d'une source (fichier, playlist, chaîne ou vidéo)
+
+    Avec `failures`, une playlist ou chaîne illisible y est notée (même forme
+    qu'un job en échec) au lieu d'interrompre le batch.
+    """
+    if Path(source).is_file():
+        lines = Path(source).read_text().splitlines()
+        urls = []
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                urls.extend(expand_source(line, failures))
+        return urls
+
+    if not is_batch_source(source):
+        return [source]
+
+    ydl_opts = {"extract_flat": "in_playlist", "quiet": True}
+    try:
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(source, download=False)
+    except Exception as e:
+        if failures is None:
+            raise
+        print(f"❌ Source illisible {source}: {e}")
+        failures.append(
+            {"url": source, "status": "failed", "output": None, "error": str(e)}
+        )
+        return []
+
+    urls = []
+    for entry in info.get("entries") or []:
+        if not entry:
+            continue
+        if entry.get("_type") == "playlist" or entry.get("entries"):
+            urls.extend(
+                expand_source(entry.get("url") or entry["webpage_url"], failures)
+            )
+        else:
+            urls.append(
+                entry.get("webpage_url")
+                or entry.get("url")
+                or f"https://youtu.be/{entry['id']}"
+            )
+    return urls
+
+
+def expand_sources(sources, failures=None):
+    """URL des vidéos de toutes les sources, une seule par vidéo
+
+    Les doublons sont repérés par identifiant YouTube : youtu.be/ID et
+    watch?v=ID&t=30 désignent le même job (on garde la première URL).
+    `failures` : voir `expand_source`.
+    """
+    urls = {}
+    for source in sources:
+        for url in expand_source(source, failures):
+            urls.setdefault(video_id_from_url(url), url)
+    return list(urls.values())
+
+
+def run_job(url, main):
+    """Exécute un job sans jamais interrompre le batch"""
+    start = time.perf_counter()
+    job = {"url": url, "status": "ok", "output": None, "error": None}
+    try:
+        job["output"] = main(url, preflight=False)
+        if not job["output"]:
+            job["status"] = "failed"
+            job["error"] = "aucun fichier produit"
+    except SystemExit as e:
+        job["status"] = "failed"
+        job["error"] = f"sortie anticipée (code {e.code})"
+    except Exception as e:
+        job["status"] = "failed"
+        job["error"] = str(e)
+    job["seconds"] = round(time.perf_counter() - start, 2)
+    return job
+
+
+def run_batch(sources, main, max_jobs=None):
+    """Traduit toutes les vidéos des sources et écrit le bilan JSON"""
+    max_jobs = max_jobs or Config.BATCH_MAX_JOBS
+    if not Config.JOBS_ENABLED and max_jobs > 1:
+        # Sans répertoire par vidéo, les fichiers temporaires seraient partagés
+        print("⚠️ JOBS_ENABLED=0 : traitement d'une vidéo à la fois")
+        max_jobs = 1
+
+    failures = []  # Sources illisibles, reportées dans le bilan
+    urls = expand_sources(sources, failures)
+    print(f"📋 Batch: {len(urls)} vidéos, {max_jobs} en parallèle")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_jobs) as executor:
+        jobs = list(executor.map(lambda url: run_job(url, main), urls))
+    jobs += [{**failure, "seconds": 0.0} for failure in failures]
+
+    summary = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "seconds": round(time.perf_counter() - start, 2),
+        "succeeded": sum(job["status"] == "ok" for job in jobs),
+        "failed": sum(job["status"] != "ok" for job in jobs),
+        "jobs": jobs,
+    }
+
+    summary_dir = Path(Config.BATCH_SUMMARY_DIR)
+    summary_dir.mkdir(parents=True, exist_ok=True)
+    summary_file = summary_dir / f"batch_{datetime.now():%Y%m%d_%H%M%S}.json"
+    summary_file.write_text(json.dumps(summary, indent=2, ensure_ascii=False))
+
+    print("=" * 50)
+    for job in jobs:
+        icon = "✅" if job["status"] == "ok" else "❌"
+        detail = job["output"] if job["status"] == "ok" else job["error"]
+        print(f"{icon} {job['seconds']:>8.1f}s  {job['url']}  {detail}")
+    print(
+        f"🎉 Batch terminé: {summary['succeeded']} réussies, {summary['failed']} échouées"
+    )
+    print(f"📁 Bilan: {summary_file}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Traduction YouTube en batch")
+    parser.add_argument("sources", nargs="+", help="URL, playlist, chaîne ou fichier")
+    parser.add_argument(
+        "--complete",
+        action="store_true",
+        help="utiliser translate_youtube_complete au lieu de translate_youtube",
+    )
+    parser.add_argument("--jobs", type=int, help="vidéos traitées simultanément")
+    args = parser.parse_args()
+
+    if args.complete:
+        import translate_youtube_complete as translator
+    else:
+        import translate_youtube as translator
+
+    if not translator.test_basic_connectivity():
+        sys.exit(1)
+
+    summary = run_batch(args.sources, translator.main, args.jobs)
+    sys.exit(0 if summary["failed"] == 0 else 1)
+
+
+if __name__ == "__main__":
+    main()
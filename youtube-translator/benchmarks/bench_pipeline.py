@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Benchmark de bout en bout du pipeline sur backends factices
+Exécute main() sur des entrées synthétiques de 5, 30 et 120 minutes et relève
+le temps par étape (spans du rapport de mesures du job), le pic de mémoire
+(RSS) et le nombre d'appels API.
+Utilisation: uv run python benchmarks/bench_pipeline.py [--minutes 5 30 120]
+"""
+
+import argparse
+import importlib
+import io
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests"))
+
+
+def stage_spans(report):
+    """Plage [début, fin] de chaque étape d'après les spans du rapport du job
+
+    Une étape exécutée plusieurs fois (segments, morceaux) couvre de sa
+    première exécution à la fin de la dernière ; `busy` cumule leurs durées.
+    """
+    stages = {}
+    for span in report["spans"]:
+        stage = stages.setdefault(
+            span["name"], {"start": span["start"], "end": span["end"], "busy": 0.0}
+        )
+        stage["start"] = min(stage["start"], span["start"])
+        stage["end"] = max(stage["end"], span["end"])
+        stage["busy"] += span["end"] - span["start"]
+    return {
+        name: {
+            "start": stage["start"],
+            "end": stage["end"],
+            "seconds": round(stage["end"] - stage["start"], 3),
+            "busy": round(stage["busy"], 3),
+        }
+        for name, stage in stages.items()
+    }
+
+
+def failure_reason(log, default=None):
+    """Dernière erreur (❌) affichée par le job"""
+    errors = [line.strip() for line in log.splitlines() if "❌" in line]
+    return errors[-1] if errors else default
+
+
+def run_one(minutes, engine, latency, jitter, error_rate):
+    """Exécute un job dans ce processus et renvoie ses mesures"""
+    from config import Config
+    from fakes import FakeBackend, install, offline_env
+
+    module_name = (
+        "translate_youtube_complete" if engine == "complete" else "translate_youtube"
+    )
+    with tempfile.TemporaryDirectory() as tmp, offline_env(tmp):
+
+        translator = importlib.import_module(module_name)
+        backend = FakeBackend(latency=latency, jitter=jitter, error_rate=error_rate)
+        restore = install(backend, minutes)
+
+        log = io.StringIO()
+        error = None
+        origin = time.perf_counter()
+        try:
+            with redirect_stdout(log):
+                output = translator.main(
+                    "https://youtu.be/benchmark00", preflight=False
+                )
+        except SystemExit as e:
+            output = None
+            error = f"sortie anticipée (code {e.code})"
+        total = time.perf_counter() - origin
+        restore()
+
+        # Étapes mesurées par le pipeline lui-même (rapport du job)
+        reports = sorted(Path(Config.METRICS_DIR).glob("benchmark00_*.json"))
+        stages = stage_spans(json.loads(reports[-1].read_text())) if reports else {}
+
+    return {
+        "minutes": minutes,
+        "engine": engine,
+        "ok": bool(output),
+        "error": None if output else failure_reason(log.getvalue(), error),
+        "total_seconds": round(total, 3),
+        "stages": stages,
+        "peak_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+        ),
+        "api_calls": backend.calls,
+        "api_bytes": backend.bytes_in,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du pipeline (factice)")
+    parser.add_argument("--minutes", type=float, nargs="+", default=[5, 30, 120])
+    parser.add_argument("--engine", choices=["complete", "simple"], default="complete")
+    parser.add_argument("--latency", type=float, default=0.05, help="s par appel")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--output", help="fichier JSON des résultats")
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        # Un processus par taille : le pic RSS ne mélange pas les exécutions
+        result = run_one(
+            args.minutes[0], args.engine, args.latency, args.jitter, args.error_rate
+        )
+        print(json.dumps(result))
+        return
+
+    results = []
+    for minutes in args.minutes:
+        cmd = [
+            sys.executable,
+            __file__,
+            "--single",
+            "--minutes",
+            str(minutes),
+            "--engine",
+            args.engine,
+            "--latency",
+            str(args.latency),
+            "--jitter",
+            str(args.jitter),
+            "--error-rate",
+            str(args.error_rate),
+        ]
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"❌ {minutes} min: {proc.stderr.strip()[-500:]}")
+            continue
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    print(f"📊 Pipeline {args.engine} (latence factice {args.latency}s/appel)")
+    for r in results:
+        calls = sum(r["api_calls"].values())
+        status = "✅" if r["ok"] else "❌"
+        print(
+            f"{status} {r['minutes']:>6} min  total {r['total_seconds']:>8.2f}s  "
+            f"RSS {r['peak_rss_mb']:>7.1f} Mo  {calls} appels API"
+        )
+        if not r["ok"]:
+            print(f"      {r['error'] or 'aucun fichier produit'}")
+        for name, stage in r["stages"].items():
+            print(
+                f"      {name:<14} {stage['seconds']:>8.2f}s  "
+                f"[{stage['start']:.2f} → {stage['end']:.2f}]  "
+                f"cumul {stage['busy']:.2f}s"
+            )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark du démarrage de la ligne de commande
+Temps (meilleur de N lancements, processus neufs) de `main.py --help`,
+`main.py --dry-run` et de l'import de chaque moteur, avec la liste des
+bibliothèques lourdes chargées au passage (aucune attendue).
+Utilisation: uv run python benchmarks/bench_startup.py [--runs 5]
+"""
+
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+HEAVY = ("google.cloud.speech", "google.cloud.texttospeech", "yt_dlp", "grpc")
+
+CASES = {
+    "--help": ["main.py", "--help"],
+    "--dry-run": ["main.py", "--dry-run", "https://youtu.be/dQw4w9WgXcQ"],
+    **{
+        f"import {name}": [
+            "-c",
+            f"import sys, {name}; print(*[m for m in {HEAVY!r} if m in sys.modules])",
+        ]
+        for name in ("translate_youtube", "translate_youtube_complete", "async_pipeline")
+    },
+}
+
+
+def measure(args, runs, cwd):
+    best, output = float("inf"), ""
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, *args], cwd=cwd, capture_output=True, text=True
+        )
+        best = min(best, time.perf_counter() - start)
+        output = result.stdout.strip() if result.returncode == 0 else "échec"
+    return best, output
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"📊 Démarrage: meilleur temps sur {args.runs} lancements")
+    print(f"{'commande':>36} {'temps (s)':>10}  modules lourds")
+    for name, case in CASES.items():
+        seconds, output = measure(case, args.runs, ROOT)
+        heavy = output if name.startswith("import") else ""
+        print(f"{name:>36} {seconds:>10.3f}  {heavy or '-'}")
+
+
+if __name__ == "__main__":
+    main()
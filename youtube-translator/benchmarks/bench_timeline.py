@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'assemblage audio : concaténation répétée vs timeline préallouée
+Utilisation: uv run python benchmarks/bench_timeline.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from timeline import PCMTimeline
+
+SAMPLE_RATE = 24000
+CLIP_SECONDS = 3
+GAP_SECONDS = 0.5
+
+
+def make_clip():
+    return b"\x01\x00" * int(SAMPLE_RATE * CLIP_SECONDS)
+
+
+def assemble_concat(clip, count):
+    """Équivalent de `final_audio += silence; final_audio += clip` (copie complète)"""
+    silence = bytes(int(SAMPLE_RATE * GAP_SECONDS) * 2)
+    audio = b""
+    for _ in range(count):
+        audio = audio + silence
+        audio = audio + clip
+    return len(audio)
+
+
+def assemble_timeline(clip, count):
+    """Placement de chaque clip dans un tampon dimensionné une fois"""
+    step = CLIP_SECONDS + GAP_SECONDS
+    timeline = PCMTimeline(count * step, sample_rate=SAMPLE_RATE)
+    for i in range(count):
+        timeline.place(i * step + GAP_SECONDS, clip, min_gap_ms=0)
+    return timeline.length
+
+
+def measure(func, clip, count):
+    start = time.perf_counter()
+    func(clip, count)
+    return time.perf_counter() - start
+
+
+def main():
+    print("📊 Assemblage audio: temps (s) selon le nombre de segments")
+    print(f"{'segments':>10} {'concaténation':>15} {'timeline':>10} {'timeline/seg (ms)':>18}")
+    clip = make_clip()
+    for count in (50, 100, 200, 400, 800, 1600, 3200):
+        # La concaténation quadratique devient trop lente au-delà de 400 segments
+        concat = (
+            f"{measure(assemble_concat, clip, count):.3f}" if count <= 400 else "-"
+        )
+        timeline = measure(assemble_timeline, clip, count)
+        print(
+            f"{count:>10} {concat:>15} {timeline:>10.3f} {timeline / count * 1000:>18.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Transcription par morceaux des longs audios
+Découpe le WAV 16 kHz mono aux silences, reconnaît les morceaux en parallèle,
+recale les horodatages et harmonise les locuteurs entre morceaux
+"""
+
+from bisect import bisect_left
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from lazy import shared_client, speech
+from governance import governed
+from metrics import api_call, inc, propagate
+from word_timeline import WordTimeline
+from wav_reader import MappedWav
+import vad
+
+FRAME_MS = vad.FRAME_MS
+BYTES_PER_SECOND = 16000 * 2
+
+
+def max_chunk_seconds():
+    """Durée maximale d'un morceau compatible avec la limite d'envoi inline"""
+    size_limit = Config.MAX_AUDIO_SIZE_MB * 1024 * 1024 / BYTES_PER_SECOND
+    return min(Config.TRANSCRIBE_CHUNK_SECONDS, size_limit * 0.95)
+
+
+def frame_levels(wav_path, frame_ms=FRAME_MS):
+    """Niveau crête de chaque trame, lu sur le WAV mappé en mémoire"""
+    with MappedWav(wav_path) as wav:
+        return vad.frame_levels(wav.samples, wav.rate * frame_ms // 1000)
+
+
+def find_split_points(
+    levels,
+    max_seconds,
+    frame_ms=FRAME_MS,
+    silence_threshold=None,
+    min_silence_ms=None,
+):
+    """Choisit les points de coupe (secondes) au milieu des silences
+
+    Chaque morceau dure au plus `max_seconds`. On coupe dans le dernier silence
+    de la seconde moitié du morceau, ou brutalement à `max_seconds` à défaut.
+    """
+    silence_threshold = silence_threshold or Config.SILENCE_THRESHOLD
+    min_silence_frames = (min_silence_ms or Config.MIN_SILENCE_MS) // frame_ms
+    max_frames = int(max_seconds * 1000 // frame_ms)
+
+    # Milieux des silences suffisamment longs
+    candidates = [
+        (a + b) // 2
+        for a, b in vad.silence_runs(levels, silence_threshold, min_silence_frames)
+    ]
+
+    splits = []
+    chunk_start = 0
+    c = 0
+    while len(levels) - chunk_start > max_frames:
+        limit = chunk_start + max_frames
+        best = None
+        while c < len(candidates) and candidates[c] <= limit:
+            if candidates[c] >= chunk_start + max_frames // 2:
+                best = candidates[c]
+            c += 1
+        cut = best or limit
+        splits.append(cut * frame_ms / 1000)
+        chunk_start = cut
+    return splits
+
+
+def plan_chunks(wav_path, max_seconds=None):
+    """Renvoie la liste des morceaux (début, fin) en secondes"""
+    max_seconds = max_seconds or max_chunk_seconds()
+    with MappedWav(wav_path) as wav:
+        duration = wav.duration
+        if duration <= max_seconds:
+            return [(0.0, duration)]
+        levels = vad.frame_levels(wav.samples, wav.rate * FRAME_MS // 1000)
+
+    splits = find_split_points(levels, max_seconds)
+    bounds = [0.0] + splits + [duration]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def read_pcm(wav_path, start, end):
+    """Copie les octets PCM bruts entre deux instants (seule copie : l'envoi)"""
+    with MappedWav(wav_path) as wav:
+        with wav.pcm(start, end) as view:
+            return bytes(view)
+
+
+def recognition_config():
+    """Configuration Speech-to-Text pour un morceau LINEAR16 16 kHz"""
+    return speech.RecognitionConfig(
+        encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+        sample_rate_hertz=16000,
+        language_code="en-US",
+        enable_speaker_diarization=True,
+        diarization_speaker_count=2,
+        enable_word_time_offsets=True,
+        enable_automatic_punctuation=True,
+        model="latest_long",
+    )
+
+
+def words_from_response(response, offset=0.0):
+    """Extrait les mots horodatés d'une réponse (décalés de `offset` secondes)
+
+    Avec la diarization, le dernier résultat reprend tous les mots avec leur
+    locuteur : on l'utilise seul pour éviter les doublons.
+    """
+    results = [r for r in response.results if r.alternatives]
+    if not results:
+        return WordTimeline()
+
+    words = results[-1].alternatives[0].words
+    if not any(w.speaker_tag for w in words):
+        words = [w for r in results for w in r.alternatives[0].words]
+
+    return WordTimeline(
+        [w.word for w in words],
+        [w.start_time.total_seconds() + offset for w in words],
+        [w.end_time.total_seconds() + offset for w in words],
+        [w.speaker_tag for w in words],
+    )
+
+
+def recognize_chunk(client, wav_path, start, end):
+    """Reconnaît un morceau et renvoie ses mots en temps global"""
+    return recognize_pcm(client, read_pcm(wav_path, start, end), start)
+
+
+def recognize_pcm(client, pcm, start):
+    """Reconnaît un bloc PCM 16 kHz mono commençant à `start` secondes"""
+    audio = speech.RecognitionAudio(content=pcm)
+
+    def recognize():
+        with api_call("speech", "long_running_recognize") as call:
+            call.sent(len(audio.content))
+            operation = client.long_running_recognize(
+                config=recognition_config(), audio=audio
+            )
+            return operation.result(timeout=Config.API_TIMEOUT)
+
+    response = governed("stt").call(recognize)
+    return words_from_response(response, offset=start)
+
+
+def speaker_mapping(previous_words, words, boundary, known_tags=()):
+    """Associe les locuteurs d'un morceau à ceux du précédent
+
+    Les mots reconnus deux fois dans la zone de recouvrement votent pour
+    l'association de leurs étiquettes. Les étiquettes sans vote reprennent les
+    locuteurs connus encore libres.
+    """
+    words = WordTimeline.from_words(words)
+    votes = Counter()
+    window_start = boundary - Config.TRANSCRIBE_OVERLAP_SECONDS
+    # Un mot dure moins de quelques secondes : inutile de parcourir tout le morceau
+    recent = WordTimeline.from_words(previous_words).since(window_start - 5.0)
+    previous = [w for w in recent if w["end_time"] > window_start]
+    for w in words[: bisect_left(words.starts, boundary)]:
+        for p in previous:
+            same_word = p["word"].lower() == w["word"].lower()
+            if same_word and abs(p["start_time"] - w["start_time"]) < 0.3:
+                votes[(w["speaker"], p["speaker"])] += 1
+                break
+
+    mapping = {}
+    used = set()
+    for (tag, previous_tag), _ in votes.most_common():
+        if tag not in mapping and previous_tag not in used:
+            mapping[tag] = previous_tag
+            used.add(previous_tag)
+
+    free = sorted(set(known_tags) - used)
+    for tag in sorted(set(words.speakers) - set(mapping)):
+        mapping[tag] = free.pop(0) if free else tag
+    return mapping
+
+
+def align_chunks(chunk_words, boundaries):
+    """Générateur : mots de chaque morceau, locuteurs harmonisés, sans recouvrement"""
+    previous = WordTimeline()
+    known_tags = set()
+    for k, words in enumerate(chunk_words):
+        words = WordTimeline.from_words(words)
+        if k > 0:
+            boundary = boundaries[k]
+            mapping = speaker_mapping(previous, words, boundary, known_tags)
+            words = words.since(boundary).remap_speakers(mapping)
+        known_tags.update(words.speakers)
+        previous = words
+        yield words
+
+
+def merge_chunks(chunk_words, boundaries):
+    """Fusionne les mots des morceaux en harmonisant les locuteurs"""
+    return WordTimeline.concat(align_chunks(chunk_words, boundaries))
+
+
+def iter_chunk_words(wav_path, client=None, max_workers=None):
+    """Générateur : mots alignés de chaque morceau, dans l'ordre, dès qu'il est prêt"""
+    chunks = plan_chunks(wav_path)
+    print(f"⏳ Transcription en {len(chunks)} morceaux...")
+
+    # Chaque morceau déborde sur le précédent pour aligner les locuteurs
+    overlap = Config.TRANSCRIBE_OVERLAP_SECONDS
+    pcm_chunks = (
+        (start, max(0.0, start - overlap), read_pcm(wav_path, max(0.0, start - overlap), end))
+        for start, end in chunks
+    )
+    yield from iter_pcm_chunk_words(pcm_chunks, client, max_workers)
+
+
+def iter_pcm_chunk_words(pcm_chunks, client=None, max_workers=None):
+    """Générateur : mots alignés de morceaux PCM reçus au fil de l'eau
+
+    `pcm_chunks` rend des (début du morceau, début des données, PCM) ; les données
+    commencent avant le morceau pour le recouvrement. Les morceaux sont envoyés
+    dès leur arrivée, au plus `max_workers * 2` en attente.
+    """
+    client = client or shared_client("speech", lambda: speech.SpeechClient())
+    max_workers = max_workers or Config.STT_MAX_WORKERS
+    # Complétée au fil des envois : la limite du morceau k est connue
+    # avant que align_chunks ne reçoive ses mots
+    boundaries = []
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def recognized():
+        pending = deque()
+        for boundary, start, pcm in pcm_chunks:
+            boundaries.append(boundary)
+            pending.append(executor.submit(propagate(recognize_pcm), client, pcm, start))
+            while pending and (pending[0].done() or len(pending) >= max_workers * 2):
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+    try:
+        for words in align_chunks(recognized(), boundaries):
+            inc("segments_total", len(words), kind="words")
+            yield words
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def transcribe_chunked(wav_path, client=None, max_workers=None):
+    """Transcrit un WAV 16 kHz mono de longueur quelconque"""
+    return WordTimeline.concat(iter_chunk_words(wav_path, client, max_workers))
@@ -12,11 +12,138 @@ class Config:
         2: "fr-FR-Wavenet-E",  # Féminin premium
     }
 
+    # Langues cibles : code Text-to-Speech et voix par locuteur (fanout.py)
+    LANGUAGES = {
+        "fr": {"name": "français", "code": "fr-FR", "voices": VOICES},
+        "de": {
+            "name": "allemand",
+            "code": "de-DE",
+            "voices": {1: "de-DE-Wavenet-B", 2: "de-DE-Wavenet-A"},
+        },
+        "es": {
+            "name": "espagnol",
+            "code": "es-ES",
+            "voices": {1: "es-ES-Wavenet-B", 2: "es-ES-Wavenet-C"},
+        },
+        "it": {
+            "name": "italien",
+            "code": "it-IT",
+            "voices": {1: "it-IT-Wavenet-C", 2: "it-IT-Wavenet-A"},
+        },
+    }
+    TARGET_LANGUAGES = os.getenv("TARGET_LANGUAGES", "fr")  # Ex. "fr,de,es"
+
     # Paramètres audio
     MIN_SILENCE_MS = 200  # Pause minimale conservée (ms)
+    SILENCE_THRESHOLD = 500  # Niveau crête PCM 16 bits considéré comme silence
     AUDIO_FORMAT = "mp3"
     SAMPLE_RATE = 44100
+    SPEAKING_RATE = 1.0
+    TTS_SAMPLE_RATE = 24000  # Fréquence demandée à Text-to-Speech
+    # pcm : clips LINEAR16 en mémoire, un seul encodage MP3 ; mixdown | concat : clips MP3
+    ASSEMBLY_MODE = os.getenv("ASSEMBLY_MODE", "pcm")  # pcm | mixdown | concat
+    TIMELINE_MMAP_MIN_SECONDS = 3600  # Au-delà, timeline sur fichier mappé
 
     # Timeouts et limites
     API_TIMEOUT = 300  # 5 minutes pour les longues opérations
     MAX_AUDIO_SIZE_MB = 10  # Limite Google Cloud
+
+    # Transcription par morceaux
+    TRANSCRIBE_MODE = os.getenv("TRANSCRIBE_MODE", "chunked")  # chunked | streaming | inline
+    TRANSCRIBE_CHUNK_SECONDS = 300  # Durée maximale d'un morceau
+    TRANSCRIBE_OVERLAP_SECONDS = 5  # Recouvrement pour aligner les locuteurs
+    STREAM_LIMIT_SECONDS = 290  # Audio par flux (limite du service : ~305 s)
+    STREAM_FRAME_MS = 100  # Taille des trames envoyées en mode streaming
+
+    # Traduction par lots (limites Translation API v2 par requête)
+    TRANSLATE_MAX_STRINGS = 128
+    TRANSLATE_MAX_CHARS = 5000
+
+    # Découpage des longs tours de parole (octets UTF-8)
+    TTS_MAX_BYTES = 5000  # Limite Text-to-Speech par requête
+    SEGMENT_MAX_BYTES = 3000  # Texte source : marge pour l'allongement à la traduction
+
+    # Mémoire de traduction
+    TRANSLATION_MEMORY_ENABLED = os.getenv("TRANSLATION_MEMORY_ENABLED", "1") != "0"
+    TRANSLATION_MEMORY_PATH = os.getenv(
+        "TRANSLATION_MEMORY_PATH", ".cache/translation_memory.sqlite"
+    )
+
+    # Format yt-dlp : le plus petit flux audio seul suffisant pour la
+    # reconnaissance (16 kHz mono), à défaut le meilleur disponible
+    DOWNLOAD_FORMAT = os.getenv(
+        "DOWNLOAD_FORMAT", "bestaudio[abr<=64]/worstaudio[abr>=32]/bestaudio/best"
+    )
+
+    # Cache des audios sources (par identifiant vidéo et format)
+    SOURCE_CACHE_ENABLED = os.getenv("SOURCE_CACHE_ENABLED", "1") != "0"
+    SOURCE_CACHE_DIR = os.getenv("SOURCE_CACHE_DIR", ".cache/source")
+    SOURCE_CACHE_MAX_MB = 2000
+
+    # Téléchargement : fichier (yt-dlp puis ffmpeg) ou flux (yt-dlp | ffmpeg → PCM)
+    DOWNLOAD_MODE = os.getenv("DOWNLOAD_MODE", "file")  # file | stream
+
+    # Pipeline en flux
+    PIPELINE_MODE = os.getenv("PIPELINE_MODE", "streaming")  # streaming | sequential
+    PIPELINE_QUEUE_SIZE = 16  # Éléments en attente entre deux étapes
+
+    # Espaces de travail isolés par job (fichiers intermédiaires)
+    WORKSPACE_DIR = os.getenv("WORKSPACE_DIR", ".cache/work")
+    WORKSPACE_TMPFS = os.getenv("WORKSPACE_TMPFS", "0") == "1"  # /dev/shm si présent
+
+    # Points de reprise par vidéo
+    JOBS_ENABLED = os.getenv("JOBS_ENABLED", "1") != "0"
+    JOBS_DIR = os.getenv("JOBS_DIR", ".cache/jobs")
+
+    # Concurrence
+    STT_MAX_WORKERS = 4  # Morceaux Speech-to-Text simultanés
+    TTS_MAX_WORKERS = 8  # Requêtes Text-to-Speech simultanées
+
+    # Limites par ressource, communes à tous les jobs (mode batch) ;
+    # pour les API, plafond de la concurrence adaptative (governance.py)
+    RESOURCE_LIMITS = {
+        "download": 2,
+        "ffmpeg": 2,
+        "stream": 3,  # Décodeurs ffmpeg du téléchargement en flux (longue durée)
+        "stt": 8,
+        "translate": 4,
+        "tts": 16,
+    }
+    BATCH_MAX_JOBS = 3  # Vidéos traitées simultanément
+    BATCH_SUMMARY_DIR = "output"
+
+    # Mode serveur (server.py) : API HTTP locale, clients gardés ouverts
+    SERVER_HOST = os.getenv("SERVER_HOST", "127.0.0.1")
+    SERVER_PORT = int(os.getenv("SERVER_PORT", "8765"))
+    SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "3"))  # Jobs simultanés
+    SERVER_HISTORY = 200  # Jobs terminés conservés pour GET /jobs
+
+    # Mode asyncio : plafond des requêtes en vol par service, toutes vidéos confondues
+    ASYNC_LIMITS = {
+        "stt": 32,
+        "translate": 16,
+        "tts": 200,
+    }
+
+    # Gouvernance des appels API
+    RATE_LIMITS = {  # Requêtes par minute (quotas du projet Google Cloud)
+        "stt": 900,
+        "translate": 600,
+        "tts": 1000,
+    }
+    RETRY_MAX_ATTEMPTS = 5
+    RETRY_BASE_DELAY = 0.5  # Secondes, doublées à chaque tentative (avec aléa)
+    RETRY_MAX_DELAY = 30.0
+    TARGET_LATENCY = {  # Secondes ; au-delà, la concurrence cesse d'augmenter
+        "stt": 120.0,
+        "translate": 5.0,
+        "tts": 5.0,
+    }
+
+    # Mesures (rapport JSON par job, export Prometheus)
+    METRICS_DIR = os.getenv("METRICS_DIR", "output/metrics")
+
+    # Cache TTS
+    TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "1") != "0"
+    TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", ".cache/tts")
+    TTS_CACHE_MAX_MB = 500
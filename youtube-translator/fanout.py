@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Traduction multilingue : un seul téléchargement, une seule transcription
+Mots et tours de parole sont calculés (ou repris) une fois ; traduction,
+synthèse et assemblage tournent ensuite en parallèle pour chaque langue cible
+(Config.LANGUAGES : code et voix par locuteur). Un MP3 par langue, et un
+rapport de temps commun dans Config.METRICS_DIR.
+Utilisation: uv run python main.py --languages fr,de,es URL
+"""
+
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from config import Config
+import metrics
+from metrics import propagate
+from jobs import JobStore, resume_stage, run_stage, stage_inputs, translation_stage
+from jobs import video_id_from_url
+from workspace import Workspace
+from tts_cache import get_tts_cache
+import translate_youtube as engine
+
+
+def parse_languages(value):
+    """Langues cibles à partir de "fr,de,es" (ValueError si l'une est inconnue)"""
+    languages = list(dict.fromkeys(code.strip() for code in value.split(",")))
+    languages = [code for code in languages if code]
+    unknown = [code for code in languages if code not in Config.LANGUAGES]
+    if unknown or not languages:
+        raise ValueError(
+            f"langue(s) inconnue(s): {', '.join(unknown) or repr(value)}"
+            f" (disponibles: {', '.join(Config.LANGUAGES)})"
+        )
+    return languages
+
+
+def timed(timings, name, func, *args, **kwargs):
+    """Appelle `func` et note sa durée (secondes) dans `timings[name]`"""
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        timings[name] = round(time.perf_counter() - start, 2)
+
+
+def transcribe_once(url, job, workspace, timings, languages=("fr",)):
+    """Téléchargement, transcription et regroupement communs à toutes les langues
+
+    Les clés des étapes (traduction de chaque langue comprise) sont celles de
+    `stage_inputs`, comme pour --dry-run.
+    """
+    streamed = Config.DOWNLOAD_MODE == "stream"
+    if streamed:
+        audio_file, metadata = timed(
+            timings,
+            "download",
+            run_stage,
+            job,
+            "download",
+            [url, "stream"],
+            lambda: (None, engine.fetch_metadata(url)),
+        )
+    else:
+        output_base = str(job.dir / "source") if job else workspace.path("source")
+        audio_file, metadata = timed(
+            timings,
+            "download",
+            run_stage,
+            job,
+            "download",
+            [url, Config.DOWNLOAD_FORMAT],
+            lambda: engine.download_audio(url, output_base),
+            valid=lambda data: Path(data[0]).exists(),
+        )
+
+    if job:
+        stage_inputs(job, languages)
+    segments = timed(
+        timings,
+        "transcription",
+        resume_stage,
+        job,
+        "words",
+        lambda: (
+            engine.transcribe_url(url)
+            if streamed
+            else engine.transcribe_with_diarization(
+                audio_file, workspace.path("audio_mono.wav")
+            )
+        ),
+    )
+    grouped = timed(
+        timings,
+        "grouping",
+        resume_stage,
+        job,
+        "grouped",
+        lambda: engine.group_segments_by_speaker(segments),
+    )
+    metrics.inc("segments_total", len(grouped), kind="grouped")
+    return metadata, grouped
+
+
+def render_language(language, grouped, metadata, job, workspace, caches):
+    """Traduction, synthèse et export d'une langue ; renvoie son bilan
+
+    Une langue en échec n'interrompt pas les autres.
+    """
+    timings = {}
+    start = time.perf_counter()
+    result = {"language": language, "status": "ok", "output": None, "error": None}
+    try:
+        translated = timed(
+            timings,
+            "translation",
+            resume_stage,
+            job,
+            translation_stage(language),
+            lambda: engine.translate_segments(grouped, language),
+        )
+        timeline = timed(
+            timings,
+            "tts_assembly",
+            engine.assemble_final_audio,
+            translated,
+            metadata["duration"],
+            caches,
+            workspace.path(f"timeline_{language}.pcm"),
+            language,
+        )
+        result["output"] = timed(
+            timings,
+            "export",
+            engine.export_with_metadata,
+            timeline,
+            metadata,
+            language=language,
+        )
+    except Exception as e:
+        print(f"❌ Langue {language}: {e}")
+        result["status"] = "failed"
+        result["error"] = str(e)
+    timings["total"] = round(time.perf_counter() - start, 2)
+    result["seconds"] = timings
+    return result
+
+
+def write_timing_report(job_name, metadata, shared, results, wall_seconds):
+    """Rapport de temps commun : étapes partagées, puis chaque langue
+
+    `sequential_seconds` estime la durée de lancements séparés (un par langue,
+    étapes communes refaites à chaque fois).
+    """
+    directory = Path(Config.METRICS_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    shared_seconds = sum(shared.values())
+    report = {
+        "title": metadata["title"],
+        "wall_seconds": round(wall_seconds, 2),
+        "shared": shared,
+        "languages": {result["language"]: result for result in results},
+        "sequential_seconds": round(
+            shared_seconds * len(results)
+            + sum(result["seconds"]["total"] for result in results),
+            2,
+        ),
+    }
+    path = directory / f"{job_name}_languages.json"
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+
+    print("⏱️ Étapes communes: " + ", ".join(f"{k} {v}s" for k, v in shared.items()))
+    for result in results:
+        seconds = result["seconds"]
+        steps = ", ".join(f"{k} {v}s" for k, v in seconds.items() if k != "total")
+        print(
+            f"   {result['language']}: {seconds['total']}s ({steps})"
+            f" → {result['output'] or result['error']}"
+        )
+    print(
+        f"⏱️ Total: {report['wall_seconds']}s"
+        f" (≈{report['sequential_seconds']}s en lancements séparés)"
+    )
+    print(f"📈 Rapport des langues: {path}")
+    return path
+
+
+def main(url, languages=None, preflight=True):
+    """Traduit une vidéo dans chaque langue ; renvoie les fichiers produits"""
+    languages = languages or parse_languages(Config.TARGET_LANGUAGES)
+    print(f"🌍 Traducteur YouTube: anglais → {', '.join(languages)}")
+    print("=" * 50)
+
+    if preflight and not engine.test_basic_connectivity():
+        sys.exit(1)
+
+    video_id = video_id_from_url(url)
+    job = JobStore.for_url(url) if Config.JOBS_ENABLED else None
+    job_metrics = metrics.start_job(f"{video_id}_{datetime.now():%Y%m%d_%H%M%S}")
+    workspace = Workspace(video_id)
+    start = time.perf_counter()
+    shared = {}
+
+    try:
+        metadata, grouped = transcribe_once(url, job, workspace, shared, languages)
+
+        # Caches créés avant la répartition : communs à toutes les langues
+        caches = [job.tts_cache(), get_tts_cache()] if job else None
+        with ThreadPoolExecutor(
+            max_workers=len(languages), thread_name_prefix="lang"
+        ) as executor:
+            futures = [
+                executor.submit(
+                    propagate(render_language),
+                    language,
+                    grouped,
+                    metadata,
+                    job,
+                    workspace,
+                    caches,
+                )
+                for language in languages
+            ]
+            results = [future.result() for future in futures]
+
+        write_timing_report(
+            job_metrics.job, metadata, shared, results, time.perf_counter() - start
+        )
+        outputs = [result["output"] for result in results if result["output"]]
+        print(f"🎉 {len(outputs)}/{len(languages)} langues traduites")
+        return outputs
+
+    except KeyboardInterrupt:
+        print("\n⏹️ Interrompu par l'utilisateur")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Erreur inattendue: {e}")
+        if job:
+            print(f"♻️ Étapes conservées dans {job.dir}, relancez pour reprendre")
+        sys.exit(1)
+    finally:
+        # Aussi après sys.exit (échec du téléchargement ou de la transcription)
+        engine.cleanup_temp_files(workspace)
+        metrics.write_reports(job_metrics)
@@ -0,0 +1,255 @@
+"""
+Gouvernance des appels API : débit (seau à jetons), nouvelles tentatives avec
+attente exponentielle aléatoire, et concurrence adaptative (AIMD) par service
+Utilisable depuis des threads comme depuis asyncio.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+
+from config import Config
+from metrics import inc, retry
+
+# Codes gRPC pour lesquels une nouvelle tentative a du sens
+RETRYABLE_CODES = {
+    "UNAVAILABLE",
+    "RESOURCE_EXHAUSTED",
+    "DEADLINE_EXCEEDED",
+    "ABORTED",
+    "INTERNAL",
+}
+
+# Codes HTTP (client REST, ex. Translation v2) → code gRPC équivalent
+_HTTP_CODES = {
+    429: "RESOURCE_EXHAUSTED",
+    500: "INTERNAL",
+    502: "UNAVAILABLE",
+    503: "UNAVAILABLE",
+    504: "DEADLINE_EXCEEDED",
+}
+
+
+def error_code(error):
+    """Code gRPC d'une exception (google.api_core, client REST ou factice)"""
+    status = getattr(error, "grpc_status_code", None)
+    if status is not None:
+        return status.name
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return _HTTP_CODES.get(code, str(code))
+    if isinstance(code, str):
+        return code
+    if isinstance(error, TimeoutError):
+        return "DEADLINE_EXCEEDED"
+    return None
+
+
+def is_retryable(error):
+    return error_code(error) in RETRYABLE_CODES
+
+
+def backoff_delay(attempt, base=None, cap=None):
+    """Attente avant la tentative `attempt + 1` : exponentielle, « full jitter »"""
+    base = base if base is not None else Config.RETRY_BASE_DELAY
+    cap = cap if cap is not None else Config.RETRY_MAX_DELAY
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class TokenBucket:
+    """Seau à jetons : `rate` jetons par seconde, au plus `capacity` en réserve"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        """Réserve des jetons, renvoie l'attente (secondes) avant de les utiliser
+
+        Le seau peut devenir négatif : les demandeurs suivants attendent d'autant,
+        ce qui sert les réservations dans l'ordre d'arrivée.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+
+class AIMDLimiter:
+    """Limite de concurrence adaptative
+
+    Augmentation additive (+1 par « fenêtre » de réponses rapides), division par
+    deux sur un refus de quota (au plus une fois par `cooldown` secondes).
+    """
+
+    def __init__(
+        self, maximum, minimum=1, initial=None, target_latency=None, cooldown=1.0
+    ):
+        self.maximum = maximum
+        self.minimum = minimum
+        self.limit = float(initial or max(minimum, maximum // 2))
+        self.target_latency = target_latency
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._last_decrease = 0.0
+        self._condition = threading.Condition()
+        self._async_waiters = deque()
+
+    def _has_room(self):
+        return self.in_flight < int(self.limit)
+
+    def _wake(self):
+        self._condition.notify_all()
+        while self._async_waiters:
+            loop, future = self._async_waiters.popleft()
+            if future.done():  # Attente annulée
+                continue
+            try:
+                loop.call_soon_threadsafe(_resolve, future)
+            except RuntimeError:  # Boucle fermée (asyncio.run terminé)
+                continue
+
+    def acquire(self):
+        with self._condition:
+            while not self._has_room():
+                self._condition.wait()
+            self.in_flight += 1
+
+    async def acquire_async(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                if self._has_room():
+                    self.in_flight += 1
+                    return
+                future = loop.create_future()
+                waiter = (loop, future)
+                self._async_waiters.append(waiter)
+            try:
+                await future
+            except asyncio.CancelledError:
+                with self._condition:
+                    if waiter in self._async_waiters:
+                        self._async_waiters.remove(waiter)
+                raise
+
+    def release(self):
+        with self._condition:
+            self.in_flight -= 1
+            self._wake()
+
+    def on_success(self, latency):
+        if self.target_latency is not None and latency > self.target_latency:
+            return
+        with self._condition:
+            if self.limit < self.maximum:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                self._wake()
+
+    def on_throttle(self):
+        with self._condition:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.cooldown:
+                self.limit = max(self.minimum, self.limit / 2)
+                self._last_decrease = now
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+_governors = {}
+_governors_lock = threading.Lock()
+
+
+def get_bucket(service):
+    """Seau à jetons du service, commun à tout le processus (None sans quota)"""
+    with _buckets_lock:
+        if service not in _buckets:
+            per_minute = Config.RATE_LIMITS.get(service)
+            _buckets[service] = TokenBucket(per_minute / 60) if per_minute else None
+        return _buckets[service]
+
+
+class Governor:
+    """Appels gouvernés vers un service : débit, concurrence, nouvelles tentatives"""
+
+    def __init__(self, service, max_concurrency):
+        self.service = service
+        self.bucket = get_bucket(service)
+        self.limiter = AIMDLimiter(
+            max_concurrency, target_latency=Config.TARGET_LATENCY.get(service)
+        )
+
+    def _wait(self):
+        return self.bucket.reserve() if self.bucket else 0.0
+
+    def _after_failure(self, error, attempt):
+        """Attente avant nouvelle tentative ; relance l'erreur si c'est fini"""
+        code = error_code(error)
+        if code == "RESOURCE_EXHAUSTED":
+            self.limiter.on_throttle()
+            inc("throttled_total", service=self.service)
+        if code not in RETRYABLE_CODES or attempt + 1 >= Config.RETRY_MAX_ATTEMPTS:
+            error.attempts = attempt + 1
+            raise error
+        retry(self.service)
+        return backoff_delay(attempt)
+
+    def call(self, func, *args, **kwargs):
+        """Exécute `func` sous gouvernance (appel bloquant)"""
+        attempt = 0
+        while True:
+            time.sleep(self._wait())
+            self.limiter.acquire()
+            start = time.monotonic()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                error = e
+            else:
+                self.limiter.on_success(time.monotonic() - start)
+                return result
+            finally:
+                self.limiter.release()
+            time.sleep(self._after_failure(error, attempt))
+            attempt += 1
+
+    async def acall(self, func, *args, **kwargs):
+        """Version asyncio : `func(...)` renvoie une coroutine, recréée à chaque tentative"""
+        attempt = 0
+        while True:
+            await asyncio.sleep(self._wait())
+            await self.limiter.acquire_async()
+            start = time.monotonic()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                error = e
+            else:
+                self.limiter.on_success(time.monotonic() - start)
+                return result
+            finally:
+                self.limiter.release()
+            await asyncio.sleep(self._after_failure(error, attempt))
+            attempt += 1
+
+
+def governed(service):
+    """Gouverneur du service pour les appels bloquants, commun au processus"""
+    with _governors_lock:
+        if service not in _governors:
+            _governors[service] = Governor(service, Config.RESOURCE_LIMITS[service])
+        return _governors[service]
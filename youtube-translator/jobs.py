@@ -0,0 +1,188 @@
+"""
+Points de reprise par vidéo
+Chaque étape enregistre sa sortie dans le répertoire de la vidéo avec la clé
+(hash) de ses entrées et des paramètres Config concernés : une relance saute
+toutes les étapes dont les entrées n'ont pas changé.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from config import Config
+from tts_cache import TTSCache
+
+_VIDEO_ID = re.compile(r"(?:v=|youtu\.be/|shorts/|embed/|live/)([A-Za-z0-9_-]{11})")
+
+
+def video_id_from_url(url):
+    """Identifiant YouTube extrait de l'URL (hash de l'URL à défaut)"""
+    match = _VIDEO_ID.search(url)
+    if match:
+        return match.group(1)
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+
+
+def stage_key(*inputs):
+    """Clé d'une étape : hash JSON de ses entrées"""
+    payload = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class JobStore:
+    """Répertoire de travail persistant d'une vidéo"""
+
+    def __init__(self, video_id, root=None):
+        self.video_id = video_id
+        self.dir = Path(root or Config.JOBS_DIR) / video_id
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.keys = {}
+        self._tts_cache = None
+
+    @classmethod
+    def for_url(cls, url, root=None):
+        return cls(video_id_from_url(url), root)
+
+    def _stage_file(self, name):
+        return self.dir / f"{name}.json"
+
+    def load(self, name, key):
+        """Sortie enregistrée de l'étape si sa clé correspond, sinon None"""
+        try:
+            stored = json.loads(self._stage_file(name).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if stored.get("key") != key:
+            return None
+        return stored["data"]
+
+    def has(self, name, key):
+        """Vrai si l'étape est enregistrée avec cette clé, sans lire ses données
+
+        `save` écrit la clé en tête du fichier : quelques octets suffisent.
+        """
+        prefix = json.dumps({"key": key})[:-1].encode("utf-8")
+        try:
+            with open(self._stage_file(name), "rb") as f:
+                return f.read(len(prefix)) == prefix
+        except FileNotFoundError:
+            return False
+
+    def save(self, name, key, data):
+        """Enregistre la sortie de l'étape (écriture atomique)
+
+        Fichier temporaire propre à chaque écriture : deux jobs d'une même
+        vidéo ne se volent pas leur fichier avant `os.replace`.
+        """
+        path = self._stage_file(name)
+        fd, tmp = tempfile.mkstemp(dir=self.dir, prefix=f"{name}.", suffix=".tmp")
+        try:
+            # default=list : séquences non JSON (WordTimeline) enregistrées élément par élément
+            with os.fdopen(fd, "w") as f:
+                f.write(
+                    json.dumps(
+                        {"key": key, "data": data}, ensure_ascii=False, default=list
+                    )
+                )
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def key_for(self, name, inputs):
+        """Calcule (et retient) la clé d'une étape à partir de ses entrées
+
+        Les entrées d'une étape incluent la clé de l'étape précédente : toute la
+        chaîne de clés est connue avant d'exécuter quoi que ce soit.
+        """
+        key = stage_key(name, inputs)
+        self.keys[name] = key
+        return key
+
+    def stage(self, name, inputs, compute, valid=None):
+        """Renvoie la sortie de l'étape, en la recalculant seulement si nécessaire
+
+        `inputs` : entrées et paramètres Config de l'étape (sérialisables JSON).
+        `valid(data)` permet de vérifier que les fichiers référencés existent encore.
+        """
+        self.key_for(name, inputs)
+        return self.resume(name, compute, valid)
+
+    def resume(self, name, compute, valid=None):
+        """Comme `stage`, avec la clé déjà calculée (`key_for`, `stage_inputs`)"""
+        key = self.keys[name]
+        data = self.load(name, key)
+        if data is not None and (valid is None or valid(data)):
+            print(f"♻️ Étape reprise: {name}")
+            return data
+
+        data = compute()
+        self.save(name, key, data)
+        return data
+
+    def tts_cache(self):
+        """Clips TTS de la vidéo (sans limite de taille)"""
+        if self._tts_cache is None:
+            self._tts_cache = TTSCache(self.dir / "tts", max_bytes=float("inf"))
+        return self._tts_cache
+
+
+def run_stage(job, name, inputs, compute, valid=None):
+    """Exécute une étape avec point de reprise si `job` est défini"""
+    if job is None:
+        return compute()
+    return job.stage(name, inputs, compute, valid)
+
+
+def resume_stage(job, name, compute, valid=None):
+    """Comme `run_stage`, pour une étape dont `stage_inputs` a calculé la clé"""
+    if job is None:
+        return compute()
+    return job.resume(name, compute, valid)
+
+
+def save_checkpoint(job):
+    """Rappel `on_done(name, données)` qui enregistre une étape du pipeline en
+    flux dès qu'elle est terminée (None sans job)"""
+    if job is None:
+        return None
+    return lambda name, data: job.save(name, job.keys[name], data)
+
+
+def translation_stage(language):
+    """Nom de l'étape de traduction d'une langue ("translated" pour le français)"""
+    return "translated" if language == "fr" else f"translated_{language}"
+
+
+def stage_inputs(job, languages=("fr",)):
+    """Clés des étapes texte (mots, segments, traductions) d'une vidéo téléchargée"""
+    job.key_for("words", [job.keys["download"], transcription_config()])
+    job.key_for("grouped", [job.keys["words"], segmentation_config()])
+    for language in languages:
+        job.key_for(
+            translation_stage(language),
+            [job.keys["grouped"], "en", language, Config.TTS_MAX_BYTES],
+        )
+    return job.keys
+
+
+def transcription_config():
+    """Paramètres Config qui influencent la transcription"""
+    return {
+        "mode": Config.TRANSCRIBE_MODE,
+        "chunk_seconds": Config.TRANSCRIBE_CHUNK_SECONDS,
+        "overlap_seconds": Config.TRANSCRIBE_OVERLAP_SECONDS,
+        "silence_threshold": Config.SILENCE_THRESHOLD,
+        "min_silence_ms": Config.MIN_SILENCE_MS,
+    }
+
+
+def segmentation_config():
+    """Paramètres Config qui influencent le découpage des tours de parole"""
+    return {
+        "segment_max_bytes": Config.SEGMENT_MAX_BYTES,
+        "tts_max_bytes": Config.TTS_MAX_BYTES,
+    }
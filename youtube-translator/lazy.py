@@ -0,0 +1,87 @@
+"""
+Imports et clients différés
+Les bibliothèques Google Cloud et yt-dlp coûtent plusieurs centaines de
+millisecondes à importer, et chaque client ouvre un canal gRPC : ils ne sont
+chargés qu'au premier usage réel (`--help`, simulation et jobs déjà en cache
+n'en ont pas besoin).
+"""
+
+import importlib
+import threading
+
+
+class LazyModule:
+    """Module importé au premier accès à l'un de ses attributs"""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        state = "chargé" if self._module is not None else "différé"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+class LazyClient:
+    """Client construit au premier appel de méthode, partagé ensuite
+
+    `factory()` renvoie le vrai client ; la construction est protégée par un
+    verrou (clients partagés entre workers).
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    def warm(self):
+        """Construit le client s'il ne l'est pas encore, et le renvoie"""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._factory()
+        return self._client
+
+    def __getattr__(self, attr):
+        return getattr(self.warm(), attr)
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def shared_client(name, factory):
+    """Client `name` commun au processus, construit au premier usage
+
+    Canaux gRPC et identifiants restent ouverts d'un job à l'autre (batch,
+    serveur) ; les clients Google Cloud sont utilisables depuis plusieurs threads.
+    """
+    with _shared_lock:
+        client = _shared.get(name)
+        if client is None:
+            client = _shared[name] = LazyClient(factory)
+        return client
+
+
+def shared_clients():
+    """Clients partagés déjà déclarés, par nom"""
+    with _shared_lock:
+        return dict(_shared)
+
+
+def reset_clients():
+    """Oublie les clients partagés (le prochain usage en construit de nouveaux)"""
+    with _shared_lock:
+        _shared.clear()
+
+
+speech = LazyModule("google.cloud.speech")
+texttospeech = LazyModule("google.cloud.texttospeech")
+translate_v2 = LazyModule("google.cloud.translate_v2")
+translate_v3 = LazyModule("google.cloud.translate_v3")
+yt_dlp = LazyModule("yt_dlp")
@@ -0,0 +1,52 @@
+"""
+Limites de concurrence par ressource, partagées par tous les jobs du processus
+(téléchargement, ffmpeg, Speech-to-Text, traduction, Text-to-Speech)
+"""
+
+import subprocess
+import threading
+from contextlib import contextmanager
+
+from config import Config
+
+_semaphores = {}
+_lock = threading.Lock()
+
+
+def _semaphore(resource):
+    with _lock:
+        if resource not in _semaphores:
+            _semaphores[resource] = threading.BoundedSemaphore(
+                Config.RESOURCE_LIMITS[resource]
+            )
+        return _semaphores[resource]
+
+
+@contextmanager
+def limit(resource):
+    """Bloque tant que la ressource a atteint sa limite d'utilisations simultanées"""
+    semaphore = _semaphore(resource)
+    with semaphore:
+        yield
+
+
+def popen_limited(resource, *args, **kwargs):
+    """Lance un processus qui occupe une place de la ressource jusqu'à sa fin
+
+    La place est rendue dès que le processus se termine (thread de
+    surveillance), pas à la fin de la lecture de sa sortie.
+    """
+    semaphore = _semaphore(resource)
+    semaphore.acquire()
+    try:
+        process = subprocess.Popen(*args, **kwargs)
+    except BaseException:
+        semaphore.release()
+        raise
+
+    def release():
+        process.wait()
+        semaphore.release()
+
+    threading.Thread(target=release, daemon=True).start()
+    return process
@@ -1,6 +1,182 @@
-def main():
-    print("Hello from youtube-translator!")
+#!/usr/bin/env python3
+"""
+Point d'entrée unique du traducteur : vidéo, playlist, chaîne ou fichier d'URL
+Seuls la configuration et l'analyse des arguments sont chargées au démarrage ;
+moteurs, clients Google Cloud et yt-dlp ne sont importés que par l'étape qui
+s'en sert. La vérification préalable tourne dans ce même processus.
+Utilisation: uv run python main.py [--engine simple|complete|async] [--jobs N]
+             [--languages fr,de,es] [--dry-run] [--no-preflight] SOURCE [SOURCE...]
+"""
+
+import argparse
+import functools
+import importlib
+import sys
+import time
+from pathlib import Path
+
+from config import Config
+
+ENGINES = {
+    "simple": "translate_youtube",
+    "complete": "translate_youtube_complete",
+    "async": "async_pipeline",
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Traduction YouTube anglais → français avec voix distinctes"
+    )
+    parser.add_argument("sources", nargs="+", help="URL, playlist, chaîne ou fichier")
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="simple",
+        help="moteur de traduction (défaut: simple)",
+    )
+    parser.add_argument("--jobs", type=int, help="vidéos traitées simultanément")
+    parser.add_argument(
+        "--languages",
+        help="langues cibles, ex. fr,de,es (un seul téléchargement et une seule"
+        " transcription, moteur simple ; défaut: TARGET_LANGUAGES ou fr)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="affiche les étapes à exécuter ou à reprendre, sans appel API",
+    )
+    parser.add_argument(
+        "--no-preflight",
+        action="store_true",
+        help="saute la vérification des identifiants et des outils",
+    )
+    args = parser.parse_args(argv)
+    if args.languages and args.engine != "simple":
+        parser.error("--languages n'est disponible qu'avec le moteur simple")
+    if args.engine == "simple":
+        args.languages = args.languages or Config.TARGET_LANGUAGES
+    # Français seul : moteur habituel, sans répartition par langue
+    if args.languages in (None, "fr"):
+        args.languages = None
+    else:
+        from fanout import parse_languages
+
+        try:
+            args.languages = parse_languages(args.languages)
+        except ValueError as e:
+            parser.error(str(e))
+    return args
+
+
+def download_inputs(url):
+    """Entrées de l'étape de téléchargement, comme dans les moteurs"""
+    if Config.DOWNLOAD_MODE == "stream":
+        return [url, "stream"]
+    return [url, Config.DOWNLOAD_FORMAT]
+
+
+def plan_video(url, languages=("fr",)):
+    """Étapes reprises ou à exécuter pour une vidéo, sans rien écrire
+
+    Renvoie {"video_id", "stages": {étape: reprise?}, "source_cached"}.
+    """
+    from jobs import JobStore, stage_inputs, translation_stage, video_id_from_url
+
+    video_id = video_id_from_url(url)
+    names = ("download", "words", "grouped", *map(translation_stage, languages))
+    stages = dict.fromkeys(names, False)
+    if Config.JOBS_ENABLED and (Path(Config.JOBS_DIR) / video_id).is_dir():
+        job = JobStore(video_id)
+        job.key_for("download", download_inputs(url))
+        keys = stage_inputs(job, languages)
+        stages = {name: job.has(name, keys[name]) for name in stages}
+
+    source_cached = False
+    if Config.SOURCE_CACHE_ENABLED and Path(Config.SOURCE_CACHE_DIR).is_dir():
+        from source_cache import get_source_cache
+
+        source_cached = (
+            get_source_cache().path(video_id, Config.DOWNLOAD_FORMAT) is not None
+        )
+    return {"video_id": video_id, "stages": stages, "source_cached": source_cached}
+
+
+def dry_run(sources, engine, languages=None):
+    """Affiche le plan de chaque source ; aucun téléchargement ni appel API"""
+    from batch import is_batch_source
+
+    print("🔎 Simulation (aucun appel API)")
+    print(
+        f"   Moteur: {engine} | téléchargement: {Config.DOWNLOAD_MODE}"
+        f" | pipeline: {Config.PIPELINE_MODE} | assemblage: {Config.ASSEMBLY_MODE}"
+    )
+    for source in sources:
+        if is_batch_source(source):
+            print(f"📋 {source}: plusieurs vidéos, listées au lancement")
+            continue
+        plan = plan_video(source, languages or ("fr",))
+        done = [name for name, cached in plan["stages"].items() if cached]
+        todo = [name for name, cached in plan["stages"].items() if not cached]
+        print(f"📹 {plan['video_id']}  {source}")
+        if done:
+            print(f"   ♻️ Reprises: {', '.join(done)}")
+        if todo:
+            print(f"   ⏳ À exécuter: {', '.join(todo)}, tts, assemblage")
+        if plan["source_cached"]:
+            print("   ♻️ Audio source en cache")
+    return 0
+
+
+def run(sources, engine, jobs=None, languages=None):
+    """Lance la traduction ; renvoie le code de sortie
+
+    Avec `languages`, chaque vidéo est traduite dans toutes ces langues (fanout.py).
+    """
+    from batch import expand_sources, is_batch_source, run_batch
+
+    translator = importlib.import_module(ENGINES[engine])
+
+    if engine == "async":
+        import asyncio
+
+        failures = []
+        urls = expand_sources(sources, failures)
+        outputs = asyncio.run(translator.run(urls))
+        translated = sum(output is not None for output in outputs)
+        failed = len(outputs) - translated + len(failures)
+        print(f"🎉 {translated} vidéos traduites, {failed} échecs")
+        return 0 if failed == 0 else 1
+
+    translate = translator.main
+    if languages:
+        import fanout
+
+        translate = functools.partial(fanout.main, languages=languages)
+
+    if len(sources) == 1 and not is_batch_source(sources[0]):
+        return 0 if translate(sources[0], preflight=False) else 1
+
+    summary = run_batch(sources, translate, jobs)
+    return 0 if summary["failed"] == 0 else 1
+
+
+def main(argv=None):
+    start = time.perf_counter()
+    args = parse_args(argv)
+
+    if args.dry_run:
+        code = dry_run(args.sources, args.engine, args.languages)
+        print(f"⏱️ {time.perf_counter() - start:.2f}s")
+        return code
+
+    if not args.no_preflight:
+        from preflight import preflight
+
+        if not preflight():
+            return 1
+    return run(args.sources, args.engine, args.jobs, args.languages)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,340 @@
+"""
+Mesures par étape et par appel externe, exportables en JSON et en Prometheus
+Chaque job a son registre (propagé aux threads par contextvars) ; toutes les
+mesures alimentent aussi le registre du processus, exporté pour Prometheus.
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from config import Config
+
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 1800)
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+class Metrics:
+    """Registre de compteurs, histogrammes et plages de temps (spans)"""
+
+    def __init__(self, job=None):
+        self.job = job
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.spans = []
+        self.dropped = []
+        self.running = {}  # Étapes en cours -> nombre d'exécutions
+
+    def inc(self, name, value=1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            hist = self.histograms.setdefault(
+                key, {"count": 0, "sum": 0.0, "buckets": [0] * len(DURATION_BUCKETS)}
+            )
+            hist["count"] += 1
+            hist["sum"] += value
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if value <= bound:
+                    hist["buckets"][i] += 1
+
+    def begin(self, name):
+        """Note le début d'une étape (progression d'un job en cours)"""
+        with self._lock:
+            self.running[name] = self.running.get(name, 0) + 1
+
+    def span(self, name, start, end, **attributes):
+        with self._lock:
+            if self.running.get(name):
+                self.running[name] -= 1
+                if not self.running[name]:
+                    del self.running[name]
+            self.spans.append(
+                {
+                    "name": name,
+                    "start": round(start - self.started, 3),
+                    "end": round(end - self.started, 3),
+                    **attributes,
+                }
+            )
+
+    def progress(self):
+        """Étapes terminées et en cours, appels API et segments par type"""
+        with self._lock:
+            done = list(dict.fromkeys(span["name"] for span in self.spans))
+            calls, segments = {}, {}
+            for (name, labels), value in self.counters.items():
+                labels = dict(labels)
+                if name == "api_calls_total":
+                    service = labels["service"]
+                    calls[service] = calls.get(service, 0) + value
+                elif name == "segments_total":
+                    segments[labels.get("kind", "")] = value
+            return {
+                "running": list(self.running),
+                "done": [name for name in done if name not in self.running],
+                "api_calls": calls,
+                "segments": segments,
+                "dropped": len(self.dropped),
+                "elapsed": round(time.time() - self.started, 1),
+            }
+
+    def to_dict(self):
+        """Rapport JSON du job"""
+        with self._lock:
+            return {
+                "job": self.job,
+                "started_at": self.started,
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+                "histograms": [
+                    {
+                        "name": name,
+                        "labels": dict(labels),
+                        "count": hist["count"],
+                        "sum": round(hist["sum"], 6),
+                    }
+                    for (name, labels), hist in sorted(self.histograms.items())
+                ],
+                "spans": list(self.spans),
+                "dropped": list(self.dropped),
+            }
+
+    def to_prometheus(self, prefix="youtube_translator"):
+        """Export au format texte Prometheus (compteurs et histogrammes)"""
+
+        def fmt(labels, extra=()):
+            items = list(labels) + list(extra)
+            if not items:
+                return ""
+            escaped = (
+                (k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+                for k, v in items
+            )
+            return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+        lines = []
+        with self._lock:
+            seen = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                metric = f"{prefix}_{name}"
+                if metric not in seen:
+                    lines.append(f"# TYPE {metric} counter")
+                    seen.add(metric)
+                lines.append(f"{metric}{fmt(labels)} {value}")
+
+            for (name, labels), hist in sorted(self.histograms.items()):
+                metric = f"{prefix}_{name}"
+                if metric not in seen:
+                    lines.append(f"# TYPE {metric} histogram")
+                    seen.add(metric)
+                for bound, count in zip(DURATION_BUCKETS, hist["buckets"]):
+                    lines.append(
+                        f"{metric}_bucket{fmt(labels, [('le', bound)])} {count}"
+                    )
+                lines.append(
+                    f"{metric}_bucket{fmt(labels, [('le', '+Inf')])} {hist['count']}"
+                )
+                lines.append(f"{metric}_sum{fmt(labels)} {hist['sum']:.6f}")
+                lines.append(f"{metric}_count{fmt(labels)} {hist['count']}")
+        return "\n".join(lines) + "\n"
+
+
+PROCESS = Metrics(job="process")
+_current = contextvars.ContextVar("metrics", default=None)
+_on_start = contextvars.ContextVar("on_start", default=None)
+
+
+def current():
+    """Registre du job en cours (None hors job)"""
+    return _current.get()
+
+
+def start_job(job):
+    """Ouvre le registre d'un job dans le contexte courant"""
+    metrics = Metrics(job)
+    _current.set(metrics)
+    callback = _on_start.get()
+    if callback is not None:
+        callback(metrics)
+    return metrics
+
+
+@contextmanager
+def watch_jobs(callback):
+    """Appelle `callback(registre)` pour chaque job ouvert dans ce contexte
+
+    Permet de suivre un job de l'extérieur (progression côté serveur).
+    """
+    token = _on_start.set(callback)
+    try:
+        yield
+    finally:
+        _on_start.reset(token)
+
+
+def _registries():
+    job = _current.get()
+    return (PROCESS, job) if job is not None else (PROCESS,)
+
+
+def inc(name, value=1, **labels):
+    """Incrémente un compteur (job et processus)"""
+    for registry in _registries():
+        registry.inc(name, value, **labels)
+
+
+def observe(name, value, **labels):
+    """Ajoute une observation à un histogramme (job et processus)"""
+    for registry in _registries():
+        registry.observe(name, value, **labels)
+
+
+def propagate(func):
+    """Enveloppe `func` pour qu'elle s'exécute dans le contexte courant (threads)"""
+    return functools.partial(contextvars.copy_context().run, func)
+
+
+@contextmanager
+def stage(name):
+    """Mesure la durée d'une étape du pipeline"""
+    start = time.time()
+    job = _current.get()
+    if job is not None:
+        job.begin(name)
+    try:
+        yield
+    except BaseException:
+        inc("stage_failures_total", stage=name)
+        raise
+    finally:
+        end = time.time()
+        observe("stage_duration_seconds", end - start, stage=name)
+        if job is not None:
+            job.span(name, start, end)
+
+
+def timed_stage(name):
+    """Décorateur : mesure une étape (fonction ou générateur)"""
+
+    def decorator(func):
+        if inspect.isgeneratorfunction(func):
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with stage(name):
+                    yield from func(*args, **kwargs)
+
+        else:
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with stage(name):
+                    return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class _Call:
+    def __init__(self, service, method):
+        self.service = service
+        self.method = method
+
+    def sent(self, nbytes=0, chars=0):
+        """Octets envoyés et caractères facturés"""
+        if nbytes:
+            inc("bytes_uploaded_total", nbytes, service=self.service)
+        if chars:
+            inc("characters_sent_total", chars, service=self.service)
+
+    def received(self, nbytes):
+        """Octets reçus"""
+        inc("bytes_downloaded_total", nbytes, service=self.service)
+
+
+@contextmanager
+def api_call(service, method):
+    """Mesure un appel externe (API Google, yt-dlp, ffmpeg)"""
+    call = _Call(service, method)
+    start = time.time()
+    status = "ok"
+    try:
+        yield call
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        labels = {"service": service, "method": method}
+        inc("api_calls_total", status=status, **labels)
+        observe("api_call_duration_seconds", time.time() - start, **labels)
+
+
+def retry(service):
+    """Compte une nouvelle tentative d'appel"""
+    inc("retries_total", service=service)
+
+
+def drop(stage, index, error, **details):
+    """Signale un segment abandonné (après épuisement des tentatives)"""
+    attempts = getattr(error, "attempts", 1)
+    print(
+        f"❌ Segment {index + 1} abandonné ({stage}, {attempts} tentative(s)): {error}"
+    )
+    entry = {
+        "stage": stage,
+        "index": index,
+        "attempts": attempts,
+        "error": str(error),
+        **details,
+    }
+    for registry in _registries():
+        registry.inc("segments_dropped_total", stage=stage)
+        if registry is not PROCESS:
+            with registry._lock:
+                registry.dropped.append(entry)
+
+
+def write_reports(metrics, directory=None):
+    """Écrit le rapport JSON du job et l'export Prometheus du processus"""
+    directory = Path(directory or Config.METRICS_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    report = directory / f"{metrics.job}.json"
+    report.write_text(json.dumps(metrics.to_dict(), indent=2, ensure_ascii=False))
+    # Fichier commun aux jobs simultanés : remplacé d'un bloc, jamais lu tronqué
+    _replace_text(directory / "youtube_translator.prom", PROCESS.to_prometheus())
+    print(f"📈 Mesures: {report}")
+    return report
+
+
+def _replace_text(path, text):
+    """Écrit `text` dans un fichier temporaire propre, puis le renomme en `path`"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+        os.chmod(tmp, 0o644)  # mkstemp crée en 0600 : l'export reste lisible
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
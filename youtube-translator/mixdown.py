@@ -0,0 +1,244 @@
+"""
+Mixage final en une seule passe ffmpeg
+Clips PCM (LINEAR16) : la timeline en mémoire est encodée une seule fois, via
+l'entrée standard. Clips MP3 : chaque clip TTS est placé à son horodatage, les
+métadonnées sont écrites pendant l'encodage. La liste des entrées passe par le
+démultiplexeur concat : pas de limite de longueur d'arguments ni de fichiers
+ouverts simultanément.
+"""
+
+import subprocess
+from pathlib import Path
+
+from config import Config
+from limits import limit
+from metrics import api_call, timed_stage
+
+# (version MPEG, index fréquence) par fréquence d'échantillonnage
+_SAMPLE_RATES = {
+    44100: (1, 0),
+    48000: (1, 1),
+    32000: (1, 2),
+    22050: (2, 0),
+    24000: (2, 1),
+    16000: (2, 2),
+}
+_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+
+
+def silent_mp3_frame(sample_rate):
+    """Trame MP3 (couche III, mono, 32 kb/s) dont le décodage donne du silence
+
+    Les informations annexes et les données principales sont nulles : aucune
+    valeur spectrale, donc des échantillons à zéro.
+    """
+    version, rate_index = _SAMPLE_RATES[sample_rate]
+    bitrate_index = _BITRATES[version].index(32)
+    version_bits = 0b11 if version == 1 else 0b10
+    header = bytes(
+        [
+            0xFF,
+            0xE0 | version_bits << 3 | 0b01 << 1 | 1,  # couche III, sans CRC
+            bitrate_index << 4 | rate_index << 2,
+            0b11 << 6,  # mono
+        ]
+    )
+    coefficient = 144 if version == 1 else 72
+    size = coefficient * 32000 // sample_rate
+    return header + bytes(size - len(header))
+
+
+def frame_info(data, pos):
+    """(taille, échantillons, fréquence) de la trame MP3 à `pos`, ou None"""
+    if pos + 4 > len(data) or data[pos] != 0xFF or data[pos + 1] & 0xE0 != 0xE0:
+        return None
+    version_bits = data[pos + 1] >> 3 & 0b11
+    layer_bits = data[pos + 1] >> 1 & 0b11
+    if version_bits == 0b01 or layer_bits != 0b01:
+        return None
+    version = 1 if version_bits == 0b11 else 2
+    bitrate_index = data[pos + 2] >> 4
+    rate_index = data[pos + 2] >> 2 & 0b11
+    if bitrate_index in (0, 15) or rate_index == 3:
+        return None
+
+    sample_rate = {1: (44100, 48000, 32000), 2: (22050, 24000, 16000)}[version][
+        rate_index
+    ]
+    if version_bits == 0b00:  # MPEG 2.5
+        sample_rate //= 2
+    padding = data[pos + 2] >> 1 & 1
+    bitrate = _BITRATES[version][bitrate_index] * 1000
+    coefficient = 144 if version == 1 else 72
+    size = coefficient * bitrate // sample_rate + padding
+    samples = 1152 if version == 1 else 576
+    return size, samples, sample_rate
+
+
+def mp3_duration(data):
+    """Durée (secondes) d'un MP3 en comptant ses trames"""
+    pos = 0
+    if data[:3] == b"ID3" and len(data) >= 10:
+        tag_size = 0
+        for b in data[6:10]:
+            tag_size = tag_size << 7 | b & 0x7F
+        pos = 10 + tag_size
+
+    duration = 0.0
+    while pos < len(data):
+        info = frame_info(data, pos)
+        if info is None:
+            pos += 1  # Resynchronisation
+            continue
+        size, samples, sample_rate = info
+        duration += samples / sample_rate
+        pos += size
+    return duration
+
+
+def write_silence(path, seconds, sample_rate=None):
+    """Écrit un MP3 silencieux d'au moins `seconds` secondes"""
+    sample_rate = sample_rate or Config.TTS_SAMPLE_RATE
+    frame = silent_mp3_frame(sample_rate)
+    samples = 1152 if _SAMPLE_RATES[sample_rate][0] == 1 else 576
+    count = int(seconds * sample_rate / samples) + 1
+    Path(path).write_bytes(frame * count)
+    return path
+
+
+def _concat_entry(path):
+    """Ligne `file` du démultiplexeur concat (apostrophes échappées)"""
+    escaped = str(Path(path).resolve()).replace("'", "'\\''")
+    return f"file '{escaped}'"
+
+
+def build_concat_list(tts_files, silence_file):
+    """Construit la liste concat : silences ajustés puis clips à leur horodatage
+
+    Renvoie (lignes, durée de silence maximale nécessaire).
+    """
+    lines = ["ffconcat version 1.0"]
+    cursor = 0.0
+    longest_gap = 0.0
+    for tts_file, start_time in tts_files:
+        gap = start_time - cursor
+        if gap * 1000 > Config.MIN_SILENCE_MS:
+            lines += [_concat_entry(silence_file), f"outpoint {gap:.3f}"]
+            longest_gap = max(longest_gap, gap)
+            cursor += gap
+        lines.append(_concat_entry(tts_file))
+        cursor += mp3_duration(Path(tts_file).read_bytes())
+    return lines, longest_gap
+
+
+def metadata_args(metadata):
+    """Arguments ffmpeg des métadonnées ID3"""
+    title = metadata["title"].replace("'", "\\'")[:100]
+    artist = metadata["uploader"].replace("'", "\\'")[:100]
+    return [
+        "-metadata",
+        f"title={title} (Traduit)",
+        "-metadata",
+        f"artist={artist}",
+        "-metadata",
+        "album=Traduction automatique YouTube",
+        "-metadata",
+        f"comment=Traduit automatiquement anglais→français. Durée originale: {metadata['duration']}s. Voix premium Google Wavenet.",
+        "-metadata",
+        "genre=Speech",
+    ]
+
+
+def encode_pcm(timeline, output_file, metadata_arguments):
+    """Encode une timeline PCM en MP3 final : le seul encodage de la chaîne
+
+    Le PCM passe par l'entrée standard de ffmpeg, sans fichier intermédiaire.
+    """
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-f",
+        "s16le",
+        "-ar",
+        str(timeline.sample_rate),
+        "-ac",
+        str(timeline.channels),
+        "-i",
+        "pipe:0",
+        *metadata_arguments,
+        "-ar",
+        str(Config.SAMPLE_RATE),
+        "-codec:a",
+        "libmp3lame",
+        output_file,
+    ]
+
+    try:
+        with limit("ffmpeg"), api_call("ffmpeg", "encode"):
+            result = subprocess.run(cmd, input=timeline.pcm(), capture_output=True)
+        if result.returncode != 0:
+            print(f"⚠️ Erreur ffmpeg encodage: {result.stderr.decode(errors='replace')}")
+            return False
+
+        print(f"✅ Audio final: {output_file}")
+        return True
+
+    except Exception as e:
+        print(f"❌ Erreur encodage: {e}")
+        return False
+
+
+@timed_stage("assembly")
+def mixdown_timeline(timeline, output_file, metadata):
+    """Encode la timeline des clips PCM en MP3 tagué, puis libère la timeline"""
+    try:
+        return encode_pcm(timeline, output_file, metadata_args(metadata))
+    finally:
+        timeline.close()
+
+
+@timed_stage("assembly")
+def mixdown(tts_files, output_file, metadata, work_dir="temp_tts_segments"):
+    """Place les clips à leur horodatage et encode le MP3 final tagué en une passe"""
+    silence_file = Path(work_dir) / "silence.mp3"
+    list_file = Path(work_dir) / "mixdown.ffconcat"
+
+    try:
+        lines, longest_gap = build_concat_list(tts_files, silence_file)
+        write_silence(silence_file, longest_gap)
+        list_file.write_text("\n".join(lines) + "\n")
+
+        cmd = [
+            "ffmpeg",
+            "-y",
+            "-f",
+            "concat",
+            "-safe",
+            "0",
+            "-i",
+            str(list_file),
+            *metadata_args(metadata),
+            "-ac",
+            "1",
+            "-ar",
+            str(Config.SAMPLE_RATE),
+            "-codec:a",
+            "libmp3lame",
+            output_file,
+        ]
+
+        with limit("ffmpeg"), api_call("ffmpeg", "mixdown"):
+            result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"⚠️ Erreur ffmpeg mixage: {result.stderr}")
+            return False
+
+        print(f"✅ Audio final: {output_file}")
+        return True
+
+    except Exception as e:
+        print(f"❌ Erreur mixage: {e}")
+        return False
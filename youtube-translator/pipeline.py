@@ -0,0 +1,165 @@
+"""
+Pipeline en flux : les étapes s'enchaînent par files bornées
+La traduction et la synthèse démarrent dès qu'un morceau de transcription est prêt
+"""
+
+import queue
+import threading
+
+from config import Config
+from metrics import inc, propagate, timed_stage
+from chunked_transcription import iter_chunk_words
+from streaming_transcription import iter_stream_words
+from translation_batch import apply_translations
+from translation_memory import translate_with_memory, get_translation_memory
+from word_timeline import WordTimeline
+
+_DONE = object()
+
+
+def background(iterable, maxsize=None):
+    """Consomme `iterable` dans un thread et restitue ses éléments via une file bornée
+
+    La file pleine bloque le producteur (contre-pression) ; une exception du
+    producteur est relancée côté consommateur.
+    """
+    q = queue.Queue(maxsize=maxsize or Config.PIPELINE_QUEUE_SIZE)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(e)
+
+    thread = threading.Thread(target=propagate(produce), daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = q.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def iter_speaker_turns(chunks, group):
+    """Regroupe les mots par locuteur au fil des morceaux
+
+    Le dernier tour de parole d'un morceau reste ouvert jusqu'au suivant, pour ne
+    pas couper une réplique à la frontière. Rend une liste de segments par morceau.
+    Chaque appel de `group` mesure lui-même l'étape "grouping".
+    """
+    pending = WordTimeline()
+    for words in chunks:
+        pending.extend(words)
+        if not pending:
+            continue
+        split = pending.speaker_boundaries()[-1]
+        if split == 0:
+            continue
+        ready = group(pending[:split])
+        ready[-1]["end_time"] = pending.starts[split] - 0.1
+        pending = pending[split:]
+        inc("segments_total", len(ready), kind="grouped")
+        yield ready
+    if pending:
+        ready = group(pending)
+        inc("segments_total", len(ready), kind="grouped")
+        yield ready
+
+
+@timed_stage("translation")
+def iter_translated(batches, translate_client, source_language="en", target_language="fr"):
+    """Traduit chaque lot de segments et rend les segments un par un"""
+    memory = get_translation_memory()
+    index = 0
+    for segments in batches:
+        results = translate_with_memory(
+            translate_client,
+            [segment["text"] for segment in segments],
+            source_language,
+            target_language,
+            memory=memory,
+        )
+        yield from apply_translations(segments, results, first_index=index)
+        index += len(segments)
+
+
+def record_into(items, name, on_done, flatten=False):
+    """Recopie au passage les éléments d'un flux ; `on_done(name, éléments)`
+    est appelé dès que le flux est épuisé"""
+    recorded = []
+    for item in items:
+        if flatten:
+            recorded.extend(item)
+        else:
+            recorded.append(item)
+        yield item
+    on_done(name, recorded)
+
+
+@timed_stage("transcription")
+def _transcription(chunk_words):
+    yield from chunk_words
+
+
+def use_streaming_pipeline(streamed=False):
+    """Vrai si PIPELINE_MODE=streaming s'applique
+
+    TRANSCRIBE_MODE=inline (reconnaissance en un seul bloc) ne produit pas de
+    mots au fil de l'eau : le WAV passe alors par le mode séquentiel. L'audio
+    téléchargé en flux (`streamed`) fournit ses propres mots.
+    """
+    return Config.PIPELINE_MODE == "streaming" and (
+        streamed or Config.TRANSCRIBE_MODE != "inline"
+    )
+
+
+def stream_translated_segments(
+    wav_file, speech_client, translate_client, group, on_done=None, chunk_words=None
+):
+    """Chaîne transcription → regroupement → traduction en flux
+
+    Rend les segments traduits dans l'ordre, dès qu'ils sont disponibles. Avec
+    `on_done(name, données)`, les mots, segments et traductions (noms "words",
+    "grouped", "translated") sont remis dès que leur étape est terminée, pour
+    les points de reprise : une erreur en aval ne les perd pas.
+    `chunk_words` remplace la transcription du WAV par un flux de mots déjà
+    constitué (téléchargement en flux, voir audio_stream.py) ; sinon le WAV
+    est transcrit par morceaux, ou en flux avec TRANSCRIBE_MODE=streaming.
+    """
+    if chunk_words is None and Config.TRANSCRIBE_MODE == "inline":
+        raise ValueError(
+            "TRANSCRIBE_MODE=inline incompatible avec le pipeline en flux"
+            " (PIPELINE_MODE=sequential)"
+        )
+    if chunk_words is None and Config.TRANSCRIBE_MODE == "streaming":
+        chunk_words = iter_stream_words(wav_file, speech_client)
+    elif chunk_words is None:
+        chunk_words = iter_chunk_words(wav_file, speech_client)
+    chunks = background(_transcription(chunk_words))
+    if on_done is not None:
+        chunks = record_into(chunks, "words", on_done, flatten=True)
+    turns = background(iter_speaker_turns(chunks, group))
+    if on_done is not None:
+        turns = record_into(turns, "grouped", on_done, flatten=True)
+    translated = background(iter_translated(turns, translate_client))
+    if on_done is not None:
+        translated = record_into(translated, "translated", on_done)
+    return translated
@@ -0,0 +1,48 @@
+"""
+Vérification préalable rapide, dans le processus de traduction
+Ni client ni connexion réseau : on vérifie que les identifiants Google Cloud
+se résolvent et que les outils nécessaires sont installés.
+"""
+
+import importlib.util
+import shutil
+
+from config import Config
+
+
+def check_credentials():
+    """Identifiants par défaut de l'application (fichier de clé, gcloud, métadonnées)
+
+    Renvoie None si tout va bien, sinon le message d'erreur.
+    """
+    try:
+        import google.auth
+
+        google.auth.default()
+    except Exception as e:
+        return f"identifiants Google Cloud introuvables: {e}"
+    return None
+
+
+def preflight(need_ffmpeg=True):
+    """Vérifie l'environnement avant de lancer un job ; renvoie True si tout est prêt"""
+    problems = []
+    error = check_credentials()
+    if error:
+        problems.append(error)
+    if importlib.util.find_spec("yt_dlp") is None:
+        problems.append("yt-dlp n'est pas installé")
+    if need_ffmpeg and shutil.which("ffmpeg") is None:
+        problems.append("ffmpeg est introuvable dans le PATH")
+
+    if problems:
+        for problem in problems:
+            print(f"❌ {problem}")
+        print(
+            "Vérifiez vos variables d'environnement GOOGLE_APPLICATION_CREDENTIALS et GOOGLE_CLOUD_PROJECT"
+        )
+        return False
+
+    project = f" (projet {Config.GOOGLE_PROJECT})" if Config.GOOGLE_PROJECT else ""
+    print(f"✅ Environnement prêt{project}")
+    return True
@@ -0,0 +1,146 @@
+"""
+Découpage des tours de parole sous les limites des API
+Un long monologue est coupé aux fins de phrase, à défaut à la ponctuation, à
+défaut entre deux mots ; chaque morceau garde ses timings. Les morceaux sont
+remplis au plus près de la limite pour minimiser le nombre de requêtes.
+"""
+
+from config import Config
+from word_timeline import WordTimeline
+
+SENTENCE_END = tuple(".!?…。！？")
+CLAUSE_END = tuple(",;:—，；：")
+CLOSING = "\"')]»”’"
+
+
+def utf8_len(text):
+    return len(text.encode("utf-8"))
+
+
+def boundary_rank(word):
+    """Qualité d'une coupure après `word` : 2 fin de phrase, 1 ponctuation, 0 sinon"""
+    word = word.rstrip(CLOSING)
+    if word.endswith(SENTENCE_END):
+        return 2
+    if word.endswith(CLAUSE_END):
+        return 1
+    return 0
+
+
+def _best_cut(words, start, stop):
+    """Meilleure coupure dans words[start:stop] (indice du premier mot suivant)
+
+    On cherche la dernière fin de phrase, puis la dernière ponctuation, dans la
+    seconde moitié du morceau : une coupure trop tôt multiplierait les requêtes.
+    """
+    middle = start + (stop - start + 1) // 2
+    for rank in (2, 1):
+        for cut in range(stop, max(middle, start + 1) - 1, -1):
+            if boundary_rank(words[cut - 1]) == rank:
+                return cut
+    return stop
+
+
+def split_points(words, max_bytes):
+    """Indices où commence chaque nouveau morceau de `words` (mots joints par
+    une espace), chaque morceau faisant au plus `max_bytes` octets UTF-8
+
+    Un mot seul plus long que la limite forme son propre morceau.
+    """
+    sizes = [utf8_len(w) for w in words]
+    points = []
+    start = 0
+    size = 0  # Octets de " ".join(words[start:i])
+    i = 0
+    while i < len(words):
+        added = sizes[i] + (1 if i > start else 0)
+        if i > start and size + added > max_bytes:
+            start = _best_cut(words, start, i)
+            points.append(start)
+            size = sum(sizes[start:i]) + max(0, i - start - 1)
+            continue
+        size += added
+        i += 1
+    return points
+
+
+def _hard_split(token, max_bytes):
+    """Coupe un mot trop long (texte sans espaces) aux frontières de caractères"""
+    pieces, current, size = [], [], 0
+    for char in token:
+        char_size = utf8_len(char)
+        if current and size + char_size > max_bytes:
+            pieces.append("".join(current))
+            current, size = [], 0
+        current.append(char)
+        size += char_size
+    if current:
+        pieces.append("".join(current))
+    return pieces
+
+
+def split_text(text, max_bytes):
+    """Découpe un texte en morceaux d'au plus `max_bytes` octets UTF-8"""
+    if utf8_len(text) <= max_bytes:
+        return [text]
+    tokens = []
+    for token in text.split():
+        tokens.extend(_hard_split(token, max_bytes))
+    points = [0, *split_points(tokens, max_bytes), len(tokens)]
+    return [" ".join(tokens[a:b]) for a, b in zip(points, points[1:])]
+
+
+def segment_turns(words, max_bytes=None):
+    """Tours de parole de `words` (timeline ou dicts), longs tours découpés
+
+    Un morceau se termine 0,1 s avant le premier mot du suivant, comme les tours ;
+    le dernier morceau d'un tour garde la fin du tour.
+    """
+    max_bytes = max_bytes or Config.SEGMENT_MAX_BYTES
+    timeline = WordTimeline.from_words(words)
+    firsts = timeline.speaker_boundaries()
+    stops = firsts[1:] + [len(timeline)]
+
+    segments = []
+    for turn, first, stop in zip(timeline.speaker_turns(), firsts, stops):
+        if utf8_len(turn["text"]) <= max_bytes:
+            segments.append(turn)
+            continue
+        turn_words = timeline.words[first:stop]
+        cuts = [0, *split_points(turn_words, max_bytes), len(turn_words)]
+        for a, b in zip(cuts, cuts[1:]):
+            segments.append(
+                {
+                    "speaker": turn["speaker"],
+                    "text": " ".join(turn_words[a:b]),
+                    "start_time": timeline.starts[first + a],
+                    "end_time": (
+                        timeline.starts[first + b] - 0.1
+                        if b < len(turn_words)
+                        else turn["end_time"]
+                    ),
+                }
+            )
+    return segments
+
+
+def fit_tts_limit(segment, max_bytes=None, key="text_fr"):
+    """Découpe un segment traduit dont le texte dépasse la limite Text-to-Speech
+
+    La traduction peut être plus longue que l'original : les morceaux se
+    partagent la durée du segment au prorata de leur longueur.
+    """
+    max_bytes = max_bytes or Config.TTS_MAX_BYTES
+    pieces = split_text(segment[key], max_bytes)
+    if len(pieces) == 1:
+        return [segment]
+
+    duration = segment["end_time"] - segment["start_time"]
+    total = sum(len(piece) for piece in pieces)
+    start = segment["start_time"]
+    parts = []
+    for piece in pieces:
+        end = start + duration * len(piece) / total
+        parts.append({**segment, key: piece, "start_time": start, "end_time": end})
+        start = end
+    return parts
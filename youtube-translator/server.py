@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Mode serveur : démon de traduction avec API HTTP locale
+Modules, identifiants et canaux gRPC sont chargés une fois au démarrage et
+restent ouverts : un job ne paie plus le démarrage à froid. Les jobs sont mis
+en file et traités par un pool de workers (même gestion d'erreurs qu'un batch).
+
+    POST /jobs        {"url": "...", "engine": "simple|complete"} → 202 job
+    GET  /jobs        jobs en file, en cours et récents
+    GET  /jobs/<id>   statut, progression (étapes, appels API), résultat
+    GET  /health      état du serveur
+    GET  /metrics     mesures du processus (format Prometheus)
+
+Utilisation: uv run python server.py [--host H] [--port P] [--workers N] [--no-warm]
+"""
+
+import argparse
+import contextvars
+import importlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import Config
+import metrics
+from batch import run_job
+from jobs import video_id_from_url
+from lazy import shared_client
+
+ENGINES = {
+    "simple": "translate_youtube",
+    "complete": "translate_youtube_complete",
+}
+
+
+def warm_up(engine):
+    """Charge le moteur, yt-dlp et les clients partagés avant le premier job"""
+    module = importlib.import_module(ENGINES[engine])
+    module.yt_dlp.YoutubeDL  # Import de yt-dlp et de ses extracteurs
+    factories = {
+        "speech": lambda: module.speech.SpeechClient(),
+        "translate": lambda: module.translate_v2.Client(),
+        "tts": lambda: module.texttospeech.TextToSpeechClient(),
+    }
+    for name, factory in factories.items():
+        shared_client(name, factory).warm()
+    print(f"🔥 Moteur {engine} et clients prêts")
+
+
+class JobQueue:
+    """File de jobs de traduction traitée par un pool de workers"""
+
+    def __init__(self, workers=None, history=None):
+        self.history = history or Config.SERVER_HISTORY
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers or Config.SERVER_WORKERS, thread_name_prefix="job"
+        )
+        self._lock = threading.Lock()
+        self._jobs = OrderedDict()  # id -> enregistrement
+        self._registries = {}  # id -> registre de mesures du job
+        self._videos = {}  # identifiant vidéo -> verrou (un job à la fois)
+
+    def submit(self, url, engine="simple"):
+        """Met un job en file ; un job de la même vidéo et du même moteur pas
+        encore terminé est réutilisé (quelle que soit la forme de l'URL)
+
+        Renvoie (enregistrement, créé ?). Deux jobs d'une même vidéo partagent
+        son répertoire de reprise : ils s'exécutent l'un après l'autre.
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"moteur inconnu: {engine}")
+        video_id = video_id_from_url(url)
+        with self._lock:
+            for job in self._jobs.values():
+                if (
+                    job["video_id"] == video_id
+                    and job["engine"] == engine
+                    and job["status"] in ("queued", "running")
+                ):
+                    return dict(job), False
+
+            job = {
+                "id": uuid.uuid4().hex[:12],
+                "url": url,
+                "video_id": video_id,
+                "engine": engine,
+                "status": "queued",
+                "submitted_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "output": None,
+                "error": None,
+            }
+            self._jobs[job["id"]] = job
+            self._forget_old()
+            snapshot = dict(job)
+        # Contexte vierge : le registre de mesures d'un job ne fuit pas vers le
+        # suivant exécuté par le même thread
+        self._executor.submit(contextvars.Context().run, self._run, job)
+        return snapshot, True
+
+    def _forget_old(self):
+        finished = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job["status"] in ("ok", "failed")
+        ]
+        for job_id in finished[: max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+            self._registries.pop(job_id, None)
+
+    def _run(self, job):
+        module = importlib.import_module(ENGINES[job["engine"]])
+        with self._lock:
+            video = self._videos.setdefault(job["video_id"], threading.Lock())
+        with video:
+            self._run_locked(job, module)
+        with self._lock:
+            if not any(
+                other["video_id"] == job["video_id"]
+                and other["status"] in ("queued", "running")
+                for other in self._jobs.values()
+            ):
+                self._videos.pop(job["video_id"], None)
+
+    def _run_locked(self, job, module):
+        with self._lock:
+            job["status"] = "running"
+            job["started_at"] = time.time()
+
+        def attach(registry):
+            with self._lock:
+                self._registries[job["id"]] = registry
+
+        with metrics.watch_jobs(attach):
+            result = run_job(job["url"], module.main)
+
+        with self._lock:
+            job["status"] = result["status"]
+            job["output"] = result["output"]
+            job["error"] = result["error"]
+            job["finished_at"] = time.time()
+
+    def get(self, job_id):
+        """Copie de l'enregistrement avec sa progression, ou None"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            job = dict(job)
+            registry = self._registries.get(job_id)
+        job["progress"] = registry.progress() if registry else None
+        return job
+
+    def list(self):
+        with self._lock:
+            return [dict(job) for job in self._jobs.values()]
+
+    def counts(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+            return counts
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+def make_handler(queue, started):
+    """Classe de gestionnaire HTTP liée à une file de jobs"""
+
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "youtube-translator"
+
+        def _send(self, status, body, content_type="application/json"):
+            if content_type == "application/json":
+                body = json.dumps(body, ensure_ascii=False, indent=2)
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            path = self.path.rstrip("/")
+            if path == "/health":
+                self._send(
+                    200,
+                    {
+                        "status": "ok",
+                        "uptime": round(time.time() - started, 1),
+                        "jobs": queue.counts(),
+                    },
+                )
+            elif path == "/metrics":
+                self._send(200, metrics.PROCESS.to_prometheus(), "text/plain")
+            elif path == "/jobs":
+                self._send(200, queue.list())
+            elif path.startswith("/jobs/"):
+                job = queue.get(path[len("/jobs/") :])
+                if job is None:
+                    self._send(404, {"error": "job inconnu"})
+                else:
+                    self._send(200, job)
+            else:
+                self._send(404, {"error": "chemin inconnu"})
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/jobs":
+                self._send(404, {"error": "chemin inconnu"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length) or b"{}")
+                url = request["url"]
+                job, created = queue.submit(url, request.get("engine", "simple"))
+            except (ValueError, KeyError, TypeError) as e:
+                self._send(400, {"error": f"requête invalide: {e}"})
+                return
+            self._send(202 if created else 200, job)
+
+        def log_message(self, format, *args):
+            pass  # Les jobs impriment déjà leur propre suivi
+
+    return Handler
+
+
+def serve(host=None, port=None, workers=None, warm=True):
+    """Lance le serveur (bloquant) ; renvoie à l'arrêt par Ctrl+C"""
+    started = time.time()
+    if warm:
+        try:
+            warm_up("simple")
+            importlib.import_module(ENGINES["complete"])
+        except Exception as e:
+            print(f"⚠️ Préchauffage incomplet, clients créés au premier job: {e}")
+
+    queue = JobQueue(workers)
+    server = ThreadingHTTPServer(
+        (host or Config.SERVER_HOST, port or Config.SERVER_PORT),
+        make_handler(queue, started),
+    )
+    host, port = server.server_address[:2]
+    print(f"🚀 Serveur de traduction: http://{host}:{port} ({time.time() - started:.1f}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️ Arrêt du serveur, jobs en cours terminés d'abord")
+    finally:
+        server.server_close()
+        queue.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serveur de traduction YouTube")
+    parser.add_argument("--host", help=f"adresse d'écoute (défaut: {Config.SERVER_HOST})")
+    parser.add_argument("--port", type=int, help=f"port (défaut: {Config.SERVER_PORT})")
+    parser.add_argument("--workers", type=int, help="jobs traités simultanément")
+    parser.add_argument(
+        "--no-warm", action="store_true", help="clients créés au premier job"
+    )
+    args = parser.parse_args()
+    serve(args.host, args.port, args.workers, warm=not args.no_warm)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Cache disque des audios sources YouTube
+Clé = (identifiant vidéo, format demandé) ; éviction LRU sous plafond de taille.
+Les fichiers sont liés (hardlink) vers le répertoire du job : une éviction ne
+retire jamais un fichier en cours d'utilisation.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from config import Config
+
+# Champs de l'info yt-dlp conservés avec l'audio
+INFO_FIELDS = ("id", "title", "uploader", "duration", "description", "ext")
+
+
+def _link_or_copy(source, target):
+    target = Path(target)
+    target.unlink(missing_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+class SourceCache:
+    """Audios sources téléchargés, réutilisés d'un job à l'autre"""
+
+    def __init__(self, directory=None, max_bytes=None):
+        # Chemin absolu : le cache du processus survit à un changement de répertoire
+        self.directory = Path(directory or Config.SOURCE_CACHE_DIR).resolve()
+        self.max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else Config.SOURCE_CACHE_MAX_MB * 1024 * 1024
+        )
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # clé -> (fichier audio, taille)
+        self._total_bytes = 0
+
+        infos = sorted(self.directory.glob("*.json"), key=lambda f: f.stat().st_mtime)
+        for info_file in infos:
+            try:
+                ext = json.loads(info_file.read_text())["ext"]
+            except (json.JSONDecodeError, KeyError):
+                continue
+            audio = info_file.with_suffix(f".{ext}")
+            if audio.exists():
+                size = audio.stat().st_size
+                self._entries[info_file.stem] = (audio, size)
+                self._total_bytes += size
+
+    @staticmethod
+    def key(video_id, audio_format):
+        digest = hashlib.sha256(audio_format.encode("utf-8")).hexdigest()[:12]
+        return f"{video_id}-{digest}"
+
+    def lookup(self, video_id, audio_format, output_base):
+        """Lie l'audio en cache vers `output_base.<ext>`
+
+        Renvoie (fichier, info) ou None si absent.
+        """
+        key = self.key(video_id, audio_format)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+        audio, _ = entry
+        info_file = self.directory / f"{key}.json"
+        try:
+            info = json.loads(info_file.read_text())
+            target = f"{output_base}.{info['ext']}"
+            _link_or_copy(audio, target)
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            with self._lock:
+                if self._entries.pop(key, None) is not None:
+                    self._total_bytes -= entry[1]
+            return None
+        os.utime(info_file)
+        return target, info
+
+    def path(self, video_id, audio_format):
+        """Chemin de l'audio en cache (lecture directe), ou None"""
+        with self._lock:
+            entry = self._entries.get(self.key(video_id, audio_format))
+        return entry[0] if entry and entry[0].exists() else None
+
+    def store(self, video_id, audio_format, audio_file, info):
+        """Ajoute un audio téléchargé puis évince les entrées les plus anciennes
+
+        Un échec d'écriture n'est qu'un avertissement : le téléchargement a réussi.
+        """
+        key = self.key(video_id, audio_format)
+        info = {field: info.get(field) for field in INFO_FIELDS}
+        audio = self.directory / f"{key}.{info['ext']}"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(audio_file, audio)
+            info_file = self.directory / f"{key}.json"
+            tmp = info_file.with_suffix(f".tmp{threading.get_ident()}")
+            tmp.write_text(json.dumps(info, ensure_ascii=False))
+            os.replace(tmp, info_file)
+            size = audio.stat().st_size
+        except OSError as e:
+            print(f"⚠️ Cache des sources non mis à jour: {e}")
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[1]
+            self._entries[key] = (audio, size)
+            self._total_bytes += size
+            self._evict()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            old_key, (audio, size) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            audio.unlink(missing_ok=True)
+            (self.directory / f"{old_key}.json").unlink(missing_ok=True)
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._total_bytes}
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_source_cache():
+    """Cache des audios sources partagé par le processus (None si désactivé)"""
+    global _default_cache
+    if not Config.SOURCE_CACHE_ENABLED:
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = SourceCache()
+        return _default_cache
@@ -0,0 +1,145 @@
+"""
+Transcription en flux (API de reconnaissance en streaming)
+Le WAV 16 kHz mono est lu par trames de taille fixe et envoyé au fil de l'eau :
+la mémoire ne dépend pas de la durée de la vidéo. Un flux est limité par le
+service à environ 5 minutes d'audio ; on en ouvre un nouveau à chaque limite
+(coupe dans un silence, avec recouvrement pour aligner les locuteurs). Les
+mots de chaque résultat définitif sont rendus dès leur arrivée.
+"""
+
+import time
+
+from config import Config
+from lazy import shared_client, speech
+from governance import backoff_delay, is_retryable
+from metrics import api_call, inc, retry
+from chunked_transcription import plan_chunks, recognition_config, speaker_mapping
+from word_timeline import WordTimeline
+from wav_reader import MappedWav
+
+
+def iter_frames(wav_path, start, end, frame_ms=None):
+    """Générateur : trames PCM brutes de `frame_ms` entre deux instants
+
+    Le WAV est mappé en mémoire : seule la trame envoyée est copiée.
+    """
+    frame_ms = frame_ms or Config.STREAM_FRAME_MS
+    with MappedWav(wav_path) as wav:
+        frame_bytes = wav.rate * frame_ms // 1000 * 2 * wav.channels
+        with wav.pcm(start, end) as pcm:
+            for offset in range(0, len(pcm), frame_bytes):
+                yield bytes(pcm[offset : offset + frame_bytes])
+
+
+def streaming_config():
+    """Configuration du flux : celle des morceaux, avec résultats provisoires"""
+    return speech.StreamingRecognitionConfig(
+        config=recognition_config(), interim_results=True
+    )
+
+
+def final_words(result, offset):
+    """Mots horodatés d'un résultat définitif, en temps global"""
+    words = result.alternatives[0].words
+    return WordTimeline(
+        [w.word for w in words],
+        [w.start_time.total_seconds() + offset for w in words],
+        [w.end_time.total_seconds() + offset for w in words],
+        [w.speaker_tag for w in words],
+    )
+
+
+def recognize_stream(client, wav_path, start, end, on_interim=None):
+    """Générateur : mots des résultats définitifs d'un flux, en temps global
+
+    Les transcriptions provisoires sont passées à `on_interim`. Sur erreur
+    temporaire, le flux est rouvert après le dernier mot reçu.
+    """
+    resume = last_end = start
+    attempt = 0
+    while True:
+        try:
+            with api_call("speech", "streaming_recognize") as call:
+
+                def requests():
+                    for frame in iter_frames(wav_path, resume, end):
+                        call.sent(len(frame))
+                        yield speech.StreamingRecognizeRequest(audio_content=frame)
+
+                responses = client.streaming_recognize(streaming_config(), requests())
+                for response in responses:
+                    for result in response.results:
+                        if not result.alternatives:
+                            continue
+                        if not result.is_final:
+                            if on_interim:
+                                on_interim(result.alternatives[0].transcript)
+                            continue
+                        # Avec la diarization, un résultat peut reprendre les
+                        # mots déjà rendus : on ne garde que les nouveaux
+                        words = final_words(result, resume).since(last_end)
+                        attempt = 0
+                        if words:
+                            last_end = words.ends[-1]
+                            yield words
+            return
+        except Exception as e:
+            if not is_retryable(e) or attempt + 1 >= Config.RETRY_MAX_ATTEMPTS:
+                raise
+            retry("stt")
+            time.sleep(backoff_delay(attempt))
+            attempt += 1
+            resume = last_end
+
+
+def iter_stream_words(wav_path, client=None, on_interim=None):
+    """Générateur : mots alignés des résultats définitifs, dans l'ordre
+
+    Un flux par tranche de `STREAM_LIMIT_SECONDS` ; chaque flux reprend les
+    dernières secondes du précédent. Ses locuteurs sont ramenés à ceux du
+    précédent dès que le recouvrement est reconnu, puis ses mots passent sans
+    attente.
+    """
+    client = client or shared_client("speech", lambda: speech.SpeechClient())
+    overlap = Config.TRANSCRIBE_OVERLAP_SECONDS
+    streams = plan_chunks(wav_path, Config.STREAM_LIMIT_SECONDS - overlap)
+    print(f"⏳ Transcription en flux ({len(streams)} flux)...")
+
+    previous = WordTimeline()
+    known_tags = set()
+    for k, (boundary, end) in enumerate(streams):
+        start = max(0.0, boundary - overlap) if k else 0.0
+        mapping = {} if k == 0 else None
+        pending = WordTimeline()  # Mots reçus avant que l'alignement soit possible
+        current = WordTimeline()
+
+        def aligned(words):
+            words = words.since(boundary).remap_speakers(mapping)
+            known_tags.update(words.speakers)
+            current.extend(words)
+            inc("segments_total", len(words), kind="words")
+            return words
+
+        for words in recognize_stream(client, wav_path, start, end, on_interim):
+            if mapping is None:
+                pending.extend(words)
+                if pending.ends[-1] < boundary:
+                    continue
+                mapping = speaker_mapping(previous, pending, boundary, known_tags)
+                words = pending
+            words = aligned(words)
+            if words:
+                yield words
+
+        if mapping is None and pending:
+            mapping = speaker_mapping(previous, pending, boundary, known_tags)
+            words = aligned(pending)
+            if words:
+                yield words
+        # Seule la fin du flux sert à aligner le suivant
+        previous = current.since(end - overlap - 5.0)
+
+
+def transcribe_streaming(wav_path, client=None, on_interim=None):
+    """Transcrit un WAV 16 kHz mono de longueur quelconque, en flux"""
+    return WordTimeline.concat(iter_stream_words(wav_path, client, on_interim))
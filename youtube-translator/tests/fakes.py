@@ -0,0 +1,421 @@
+"""
+Backends Google Cloud et yt-dlp factices, en mémoire
+Latence, taux d'erreur et audio synthétique configurables ; chaque appel est
+compté pour les benchmarks et les tests hors-ligne.
+"""
+
+import asyncio
+import enum
+import importlib
+import os
+import random
+import sys
+import threading
+import time
+import wave
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import Config
+from lazy import reset_clients
+from mixdown import silent_mp3_frame
+import source_cache
+
+WORDS = "so what do you think about the interview question today".split()
+
+
+class FakeApiError(Exception):
+    """Erreur d'API simulée (code gRPC dans `code`)"""
+
+    def __init__(self, message, code="UNAVAILABLE"):
+        super().__init__(message)
+        self.code = code
+
+
+class FakeBackend:
+    """État partagé des clients factices : réglages et compteurs"""
+
+    def __init__(
+        self,
+        latency=0.0,
+        jitter=0.0,
+        error_rate=0.0,
+        turn_seconds=12.0,
+        words_per_second=2.5,
+        tts_seconds_per_char=0.06,
+        seed=0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.turn_seconds = turn_seconds
+        self.words_per_second = words_per_second
+        self.tts_seconds_per_char = tts_seconds_per_char
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = {}
+        self.bytes_in = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.stream_seconds = []  # Audio reçu par chaque flux de reconnaissance
+        self.max_frame_bytes = 0
+        self.stream_failures = 0  # Flux à interrompre par une erreur temporaire
+
+    def _draw(self, api, payload_bytes):
+        """Compte l'appel, tire la latence et l'erreur éventuelle"""
+        with self._lock:
+            self.calls[api] = self.calls.get(api, 0) + 1
+            self.bytes_in[api] = self.bytes_in.get(api, 0) + payload_bytes
+            fail = self._random.random() < self.error_rate
+            delay = self.latency + self._random.uniform(0, self.jitter)
+        return fail, delay
+
+    def call(self, api, payload_bytes=0):
+        """Compte l'appel, simule la latence et les erreurs"""
+        fail, delay = self._draw(api, payload_bytes)
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise FakeApiError(f"{api}: erreur simulée")
+
+    async def acall(self, api, payload_bytes=0):
+        """Version asyncio de `call` (compte aussi les appels simultanés)"""
+        fail, delay = self._draw(api, payload_bytes)
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+        if fail:
+            raise FakeApiError(f"{api}: erreur simulée")
+
+    # Modules factices, mêmes noms que les modules réels
+    def speech_module(self):
+        backend = self
+
+        class RecognitionConfig(SimpleNamespace):
+            class AudioEncoding(enum.Enum):
+                ENCODING_UNSPECIFIED = 0
+                LINEAR16 = 1
+
+        class SpeechClient:
+            def long_running_recognize(self, config, audio):
+                backend.call("speech.long_running_recognize", len(audio.content))
+                response = backend.recognize_pcm(audio.content)
+                return SimpleNamespace(result=lambda timeout=None: response)
+
+            def recognize(self, config, audio):
+                backend.call("speech.recognize", len(audio.content))
+                return backend.recognize_pcm(audio.content)
+
+            def streaming_recognize(self, config, requests):
+                return backend.stream_responses(requests)
+
+        class SpeechAsyncClient:
+            async def long_running_recognize(self, config, audio):
+                await backend.acall(
+                    "speech.long_running_recognize", len(audio.content)
+                )
+                response = backend.recognize_pcm(audio.content)
+
+                async def result(timeout=None):
+                    return response
+
+                return SimpleNamespace(result=result)
+
+        return SimpleNamespace(
+            SpeechClient=SpeechClient,
+            SpeechAsyncClient=SpeechAsyncClient,
+            RecognitionConfig=RecognitionConfig,
+            RecognitionAudio=SimpleNamespace,
+            StreamingRecognitionConfig=SimpleNamespace,
+            StreamingRecognizeRequest=SimpleNamespace,
+        )
+
+    def translate_module(self):
+        backend = self
+
+        class Client:
+            def translate(self, values, source_language=None, target_language=None):
+                single = isinstance(values, str)
+                items = [values] if single else list(values)
+                backend.call("translate.translate", sum(len(v) for v in items))
+                results = [
+                    {"translatedText": f"[{target_language}] {v}", "input": v}
+                    for v in items
+                ]
+                return results[0] if single else results
+
+        return SimpleNamespace(Client=Client)
+
+    def translate_v3_module(self):
+        backend = self
+
+        class TranslationServiceAsyncClient:
+            async def translate_text(self, request):
+                contents = request["contents"]
+                await backend.acall(
+                    "translate.translate", sum(len(v) for v in contents)
+                )
+                target = request["target_language_code"]
+                return SimpleNamespace(
+                    translations=[
+                        SimpleNamespace(translated_text=f"[{target}] {v}")
+                        for v in contents
+                    ]
+                )
+
+        return SimpleNamespace(
+            TranslationServiceAsyncClient=TranslationServiceAsyncClient
+        )
+
+    def texttospeech_module(self):
+        backend = self
+
+        class AudioEncoding(enum.Enum):
+            AUDIO_ENCODING_UNSPECIFIED = 0
+            LINEAR16 = 1
+            MP3 = 2
+
+        class TextToSpeechClient:
+            def synthesize_speech(self, input, voice, audio_config):
+                backend.call("tts.synthesize_speech", len(input.text.encode("utf-8")))
+                seconds = len(input.text) * backend.tts_seconds_per_char
+                rate = getattr(audio_config, "sample_rate_hertz", None) or 24000
+                if audio_config.audio_encoding == AudioEncoding.LINEAR16:
+                    audio = synthetic_wav_bytes(seconds, rate)
+                else:
+                    audio = synthetic_mp3_bytes(seconds, rate)
+                return SimpleNamespace(audio_content=audio)
+
+        class TextToSpeechAsyncClient:
+            async def synthesize_speech(self, input, voice, audio_config):
+                await backend.acall(
+                    "tts.synthesize_speech", len(input.text.encode("utf-8"))
+                )
+                seconds = len(input.text) * backend.tts_seconds_per_char
+                rate = getattr(audio_config, "sample_rate_hertz", None) or 24000
+                if audio_config.audio_encoding == AudioEncoding.LINEAR16:
+                    audio = synthetic_wav_bytes(seconds, rate)
+                else:
+                    audio = synthetic_mp3_bytes(seconds, rate)
+                return SimpleNamespace(audio_content=audio)
+
+        return SimpleNamespace(
+            TextToSpeechClient=TextToSpeechClient,
+            TextToSpeechAsyncClient=TextToSpeechAsyncClient,
+            SynthesisInput=SimpleNamespace,
+            VoiceSelectionParams=SimpleNamespace,
+            AudioConfig=SimpleNamespace,
+            AudioEncoding=AudioEncoding,
+        )
+
+    def yt_dlp_module(self, minutes):
+        backend = self
+
+        class YoutubeDL:
+            def __init__(self, opts=None):
+                self.opts = opts or {}
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def extract_info(self, url, download=True):
+                backend.call("yt_dlp.extract_info")
+                info = {
+                    "id": url[-11:],
+                    "title": f"Synthetic {minutes} min",
+                    "uploader": "Fake Channel",
+                    "duration": int(minutes * 60),
+                    "description": "",
+                    "ext": "wav",
+                }
+                if download:
+                    template = self.opts.get("outtmpl", "%(id)s.%(ext)s")
+                    write_synthetic_wav(template % info, minutes * 60)
+                return info
+
+        return SimpleNamespace(YoutubeDL=YoutubeDL)
+
+    def recognize_pcm(self, pcm):
+        """Réponse Speech-to-Text synthétique pour un morceau PCM 16 kHz mono
+
+        Les horodatages sont relatifs au morceau ; les locuteurs alternent
+        toutes les `turn_seconds` secondes.
+        """
+        duration = len(pcm) / 32000
+        step = 1 / self.words_per_second
+        count = int(duration / step)
+        with self._lock:
+            vocabulary = [self._random.choice(WORDS) for _ in range(count)]
+
+        words = []
+        t = 0.0
+        for i in range(count):
+            words.append(
+                SimpleNamespace(
+                    word=vocabulary[i],
+                    start_time=timedelta(seconds=t),
+                    end_time=timedelta(seconds=t + step * 0.8),
+                    speaker_tag=1 + int(t // self.turn_seconds) % 2,
+                )
+            )
+            t += step
+        alternative = SimpleNamespace(
+            transcript=" ".join(w.word for w in words), words=words
+        )
+        return SimpleNamespace(results=[SimpleNamespace(alternatives=[alternative])])
+
+    def stream_responses(self, requests, result_seconds=5.0):
+        """Réponses d'un flux de reconnaissance : pour chaque tranche de
+        `result_seconds` secondes, un résultat provisoire puis un définitif"""
+        pcm = bytearray()
+        for request in requests:
+            with self._lock:
+                self.max_frame_bytes = max(
+                    self.max_frame_bytes, len(request.audio_content)
+                )
+            pcm += request.audio_content
+        self.call("speech.streaming_recognize", len(pcm))
+        with self._lock:
+            self.stream_seconds.append(len(pcm) / 32000)
+            fail = self.stream_failures > 0
+            self.stream_failures -= fail
+
+        words = self.recognize_pcm(bytes(pcm)).results[0].alternatives[0].words
+        batches = {}
+        for word in words:
+            index = int(word.start_time.total_seconds() // result_seconds)
+            batches.setdefault(index, []).append(word)
+        for i, batch in enumerate(batches.values()):
+            if fail and i == len(batches) // 2:
+                raise FakeApiError("speech.streaming_recognize: flux interrompu")
+            transcript = " ".join(w.word for w in batch)
+            for is_final in (False, True):
+                alternative = SimpleNamespace(
+                    transcript=transcript, words=batch if is_final else []
+                )
+                yield SimpleNamespace(
+                    results=[
+                        SimpleNamespace(alternatives=[alternative], is_final=is_final)
+                    ]
+                )
+
+
+def synthetic_mp3_bytes(seconds, sample_rate=24000):
+    """MP3 silencieux de la durée voulue"""
+    samples = 1152 if sample_rate >= 32000 else 576
+    return silent_mp3_frame(sample_rate) * max(1, int(seconds * sample_rate / samples))
+
+
+def synthetic_wav_bytes(seconds, sample_rate=24000):
+    """WAV 16 bits mono (tonalité faible) de la durée voulue"""
+    import io
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(b"\x10\x00\xf0\xff" * int(seconds * sample_rate / 2))
+    return buffer.getvalue()
+
+
+def write_synthetic_wav(path, seconds, sample_rate=16000):
+    """WAV 16 kHz mono : 4 s de « parole » puis 0,6 s de silence, en boucle"""
+    speech = b"\x00\x20\x00\xe0" * (sample_rate * 4 // 2)
+    silence = bytes(int(sample_rate * 0.6) * 2)
+    block = speech + silence
+    block_seconds = len(block) / (2 * sample_rate)
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        for _ in range(int(seconds / block_seconds)):
+            wav.writeframes(block)
+    return path
+
+
+PATCHED_MODULES = (
+    "translate_youtube",
+    "translate_youtube_complete",
+    "chunked_transcription",
+    "streaming_transcription",
+    "batch",
+    "async_pipeline",
+    "audio_stream",
+)
+
+
+def install(backend, minutes=5):
+    """Remplace les clients réels par les factices dans les modules du projet
+
+    Renvoie une fonction qui restaure les modules d'origine.
+    """
+    fakes = {
+        "speech": backend.speech_module(),
+        "translate_v2": backend.translate_module(),
+        "translate_v3": backend.translate_v3_module(),
+        "texttospeech": backend.texttospeech_module(),
+        "yt_dlp": backend.yt_dlp_module(minutes),
+    }
+    # Clients partagés du processus : reconstruits à partir des factices
+    reset_clients()
+    saved = []
+    for name in PATCHED_MODULES:
+        # Importés ici : les moteurs chargés plus tard (serveur) sont aussi patchés
+        module = importlib.import_module(name)
+        for attr, fake in fakes.items():
+            if hasattr(module, attr):
+                saved.append((module, attr, getattr(module, attr)))
+                setattr(module, attr, fake)
+
+    def restore():
+        for module, attr, original in saved:
+            setattr(module, attr, original)
+        reset_clients()
+
+    return restore
+
+
+@contextmanager
+def offline_env(tmp, **overrides):
+    """Répertoire courant et chemins du Config (jobs, caches, mémoire de
+    traduction, sources, mesures) placés dans `tmp`
+
+    `overrides` : autres attributs du Config à modifier. Tout est restauré à
+    la sortie, cache des sources compris.
+    """
+    tmp = Path(tmp)
+    settings = {
+        "JOBS_DIR": str(tmp / "jobs"),
+        "TTS_CACHE_DIR": str(tmp / "tts"),
+        "TRANSLATION_MEMORY_PATH": str(tmp / "tm.sqlite"),
+        "SOURCE_CACHE_DIR": str(tmp / "source"),
+        "METRICS_DIR": str(tmp / "metrics"),
+        **overrides,
+    }
+    cwd = os.getcwd()
+    saved = {name: getattr(Config, name) for name in settings}
+    os.chdir(tmp)
+    try:
+        (tmp / "output").mkdir(exist_ok=True)
+        for name, value in settings.items():
+            setattr(Config, name, value)
+        source_cache._default_cache = None
+        yield tmp
+    finally:
+        os.chdir(cwd)
+        for name, value in saved.items():
+            setattr(Config, name, value)
+        source_cache._default_cache = None
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests du pipeline asyncio sur backends factices
+"""
+
+import asyncio
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import Config
+from fakes import FakeBackend, install, offline_env
+import async_pipeline
+
+
+def test_async_pipeline_offline():
+    """Deux vidéos traitées dans la même boucle, sémaphores respectés"""
+    backend = FakeBackend(latency=0.01)
+    limits = {"stt": 4, "translate": 2, "tts": 5}
+    with tempfile.TemporaryDirectory() as tmp, offline_env(
+        tmp, GOOGLE_PROJECT="offline", ASYNC_LIMITS=limits, JOBS_ENABLED=True
+    ):
+        restore = install(backend, minutes=3)
+        try:
+            outputs = asyncio.run(
+                async_pipeline.run(
+                    ["https://youtu.be/asyncvid001", "https://youtu.be/asyncvid002"]
+                )
+            )
+            if shutil.which("ffmpeg"):
+                assert all(output and Path(output).exists() for output in outputs)
+
+            # Traduction à refaire : segments repris par leur clé, pas regroupés
+            job_dir = Path(Config.JOBS_DIR) / "asyncvid001"
+            (job_dir / "translated.json").unlink()
+            grouped = (job_dir / "grouped.json").stat().st_mtime_ns
+            asyncio.run(async_pipeline.run(["https://youtu.be/asyncvid001"]))
+            assert (job_dir / "grouped.json").stat().st_mtime_ns == grouped
+            assert (job_dir / "translated.json").exists()
+
+            # Sans points de reprise : aucun répertoire de job
+            Config.JOBS_ENABLED = False
+            asyncio.run(async_pipeline.run(["https://youtu.be/asyncvid003"]))
+            assert not (Path(Config.JOBS_DIR) / "asyncvid003").exists()
+        finally:
+            restore()
+
+    assert backend.calls["yt_dlp.extract_info"] == 3  # asyncvid001 repris
+    assert backend.calls["speech.long_running_recognize"] == 3
+    assert backend.calls["tts.synthesize_speech"] >= 10
+    # Au plus 4 + 2 + 5 appels simultanés, et effectivement concurrents
+    assert 1 < backend.max_in_flight <= 11
+    print("✅ Pipeline asyncio hors-ligne")
+
+
+if __name__ == "__main__":
+    test_async_pipeline_offline()
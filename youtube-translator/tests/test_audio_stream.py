@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests hors-ligne du découpage en flux du PCM (téléchargement sans fichier)
+"""
+
+import io
+import subprocess
+import sys
+import tempfile
+import threading
+import wave
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from audio_stream import iter_pcm_chunks
+from chunked_transcription import iter_pcm_chunk_words, plan_chunks
+from config import Config
+from limits import limit, popen_limited
+from fakes import FakeBackend, install, write_synthetic_wav
+
+
+def _synthetic(seconds):
+    """Chemin et PCM brut d'un WAV synthétique (parole et silences alternés)"""
+    tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+    tmp.close()
+    write_synthetic_wav(tmp.name, seconds)
+    with wave.open(tmp.name, "rb") as wav:
+        pcm = wav.readframes(wav.getnframes())
+    return tmp.name, pcm
+
+
+def test_stream_chunks_match_file_plan():
+    """Mêmes coupes que le découpage du fichier, PCM reconstitué à l'identique"""
+    saved = Config.TRANSCRIBE_CHUNK_SECONDS
+    Config.TRANSCRIBE_CHUNK_SECONDS = 30
+    try:
+        path, pcm = _synthetic(100)
+        planned = plan_chunks(path)
+        chunks = list(iter_pcm_chunks(io.BytesIO(pcm), overlap=2))
+    finally:
+        Config.TRANSCRIBE_CHUNK_SECONDS = saved
+        Path(path).unlink()
+
+    assert [round(start, 3) for start, _, _ in chunks] == [
+        round(start, 3) for start, _ in planned
+    ]
+    rebuilt = b""
+    for start, data_start, data in chunks:
+        assert start - data_start <= 2.0 + 1e-9
+        skip = int((start - data_start) * 16000) * 2
+        rebuilt += data[skip:]
+    assert rebuilt == pcm
+    print(f"✅ Découpage en flux: {len(chunks)} morceaux identiques au fichier")
+
+
+def test_stream_words_in_order():
+    """Les mots arrivent dans l'ordre, recalés en temps global"""
+    backend = FakeBackend()
+    client = backend.speech_module().SpeechClient()
+    saved = Config.TRANSCRIBE_CHUNK_SECONDS
+    Config.TRANSCRIBE_CHUNK_SECONDS = 30
+    restore = install(backend)
+    try:
+        path, pcm = _synthetic(100)
+        Path(path).unlink()
+        words = [
+            w
+            for chunk in iter_pcm_chunk_words(
+                iter_pcm_chunks(io.BytesIO(pcm)), client, max_workers=2
+            )
+            for w in chunk
+        ]
+    finally:
+        restore()
+        Config.TRANSCRIBE_CHUNK_SECONDS = saved
+
+    starts = [w["start_time"] for w in words]
+    assert starts == sorted(starts)
+    assert starts[-1] > 90
+    assert backend.calls["speech.long_running_recognize"] == 4
+    print(f"✅ Transcription en flux: {len(words)} mots ordonnés")
+
+
+def test_download_slot_released_when_process_ends():
+    """La place de yt-dlp est rendue à sa fin, avant la fin de la lecture"""
+    Config.RESOURCE_LIMITS["test_download"] = 1
+    acquired = threading.Event()
+
+    def take():
+        with limit("test_download"):
+            acquired.set()
+
+    try:
+        process = popen_limited(
+            "test_download", [sys.executable, "-c", "pass"], stdout=subprocess.PIPE
+        )
+        process.wait()
+        threading.Thread(target=take, daemon=True).start()
+        assert acquired.wait(5)
+        process.stdout.close()  # Lecture encore ouverte : la place est libre
+    finally:
+        del Config.RESOURCE_LIMITS["test_download"]
+    print("✅ Place de téléchargement rendue à la fin de yt-dlp")
+
+
+if __name__ == "__main__":
+    test_stream_chunks_match_file_plan()
+    test_stream_words_in_order()
+    test_download_slot_released_when_process_ends()
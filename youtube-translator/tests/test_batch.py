@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests hors-ligne du mode batch
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import Config
+import batch
+from batch import expand_source, expand_sources, is_batch_source, run_batch
+
+
+def fake_main(url, preflight=True):
+    """Traducteur factice : échoue comme les scripts (sys.exit) sur une URL"""
+    if "bad" in url:
+        sys.exit(1)
+    return f"output/{url[-11:]}_traduit.mp3"
+
+
+def test_url_file_expanded():
+    """Un fichier d'URL ignore lignes vides et commentaires"""
+    with tempfile.TemporaryDirectory() as tmp:
+        urls = Path(tmp) / "urls.txt"
+        urls.write_text(
+            "# podcast\nhttps://youtu.be/aaaaaaaaaaa\n\nhttps://youtu.be/bbbbbbbbbbb\n"
+        )
+        assert expand_source(str(urls)) == [
+            "https://youtu.be/aaaaaaaaaaa",
+            "https://youtu.be/bbbbbbbbbbb",
+        ]
+    print("✅ Fichier d'URL développé")
+
+
+def test_duplicate_videos_removed():
+    """Deux URL d'une même vidéo ne donnent qu'un job"""
+    urls = expand_sources(
+        [
+            "https://youtu.be/aaaaaaaaaaa",
+            "https://www.youtube.com/watch?v=aaaaaaaaaaa&t=30",
+            "https://youtu.be/bbbbbbbbbbb",
+        ]
+    )
+    assert urls == ["https://youtu.be/aaaaaaaaaaa", "https://youtu.be/bbbbbbbbbbb"]
+    print("✅ Doublons retirés par identifiant vidéo")
+
+
+def test_failing_video_does_not_abort_batch():
+    """Une vidéo en échec est reportée, les autres aboutissent"""
+    summary_dir = Config.BATCH_SUMMARY_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        Config.BATCH_SUMMARY_DIR = tmp
+        try:
+            summary = run_batch(
+                ["https://youtu.be/aaaaaaaaaaa", "https://youtu.be/bad00000000"],
+                fake_main,
+                max_jobs=2,
+            )
+        finally:
+            Config.BATCH_SUMMARY_DIR = summary_dir
+        assert summary["succeeded"] == 1 and summary["failed"] == 1
+        assert summary["jobs"][1]["error"] == "sortie anticipée (code 1)"
+        assert list(Path(tmp).glob("batch_*.json"))
+    print("✅ Échec isolé dans le batch")
+
+
+def test_unreadable_playlist_reported():
+    """Une playlist illisible est reportée au bilan, le batch continue"""
+
+    class FailingYoutubeDL:
+        def __init__(self, options):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def extract_info(self, url, download=True):
+            raise RuntimeError("playlist privée")
+
+    playlist = "https://www.youtube.com/playlist?list=PLprivate"
+    assert is_batch_source(playlist)
+    assert not is_batch_source("https://www.youtube.com/watch?v=aaaaaaaaaaa&list=PLx")
+
+    summary_dir, yt_dlp = Config.BATCH_SUMMARY_DIR, batch.yt_dlp
+    with tempfile.TemporaryDirectory() as tmp:
+        Config.BATCH_SUMMARY_DIR = tmp
+        batch.yt_dlp = SimpleNamespace(YoutubeDL=FailingYoutubeDL)
+        try:
+            summary = run_batch([playlist, "https://youtu.be/aaaaaaaaaaa"], fake_main)
+        finally:
+            Config.BATCH_SUMMARY_DIR, batch.yt_dlp = summary_dir, yt_dlp
+    assert summary["succeeded"] == 1 and summary["failed"] == 1
+    assert summary["jobs"][-1]["url"] == playlist
+    assert summary["jobs"][-1]["error"] == "playlist privée"
+    print("✅ Playlist illisible reportée au bilan")
+
+
+if __name__ == "__main__":
+    test_url_file_expanded()
+    test_duplicate_videos_removed()
+    test_failing_video_does_not_abort_batch()
+    test_unreadable_playlist_reported()
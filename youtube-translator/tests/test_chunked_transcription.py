@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests hors-ligne du découpage et de la fusion des morceaux de transcription
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from chunked_transcription import find_split_points, merge_chunks
+
+
+def test_split_at_silence():
+    """La coupe tombe au milieu du silence, pas à la limite brute"""
+    # 20 ms par trame : 10 s de parole, 1 s de silence, 10 s de parole
+    levels = [5000] * 500 + [0] * 50 + [5000] * 500
+    splits = find_split_points(
+        levels, max_seconds=15, silence_threshold=100, min_silence_ms=200
+    )
+    assert splits == [10.5]
+
+    # Sans silence : coupe brute à la durée maximale
+    splits = find_split_points([5000] * 1000, max_seconds=8, silence_threshold=100)
+    assert splits == [8.0, 16.0]
+    print("✅ Points de coupe aux silences")
+
+
+def test_speakers_aligned_across_chunks():
+    """Les étiquettes du second morceau sont ramenées à celles du premier"""
+    first = [
+        {"word": "hello", "start_time": 8.0, "end_time": 8.4, "speaker": 1},
+        {"word": "there", "start_time": 9.0, "end_time": 9.4, "speaker": 2},
+    ]
+    # Le second morceau commence 5 s avant la frontière (10 s) avec des étiquettes inversées
+    second = [
+        {"word": "hello", "start_time": 8.05, "end_time": 8.4, "speaker": 2},
+        {"word": "there", "start_time": 9.05, "end_time": 9.4, "speaker": 1},
+        {"word": "after", "start_time": 10.5, "end_time": 11.0, "speaker": 1},
+        {"word": "again", "start_time": 11.5, "end_time": 12.0, "speaker": 2},
+    ]
+    merged = merge_chunks([first, second], [0.0, 10.0])
+
+    assert [w["word"] for w in merged] == ["hello", "there", "after", "again"]
+    assert [w["speaker"] for w in merged] == [1, 2, 2, 1]
+    print("✅ Locuteurs harmonisés entre morceaux")
+
+
+if __name__ == "__main__":
+    test_split_at_silence()
+    test_speakers_aligned_across_chunks()
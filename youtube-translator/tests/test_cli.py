@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests de la ligne de commande unique : imports différés et simulation
+"""
+
+import subprocess
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import main as cli
+from config import Config
+from jobs import JobStore, stage_inputs
+
+HEAVY = ("google.cloud.speech", "google.cloud.texttospeech", "yt_dlp", "grpc")
+
+
+def test_engines_import_nothing_heavy():
+    """Importer les moteurs ne charge ni Google Cloud ni yt-dlp"""
+    code = (
+        "import sys, main, translate_youtube, translate_youtube_complete, async_pipeline; "
+        f"print(*[m for m in {HEAVY!r} if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+    print("✅ Imports différés")
+
+
+def test_dry_run_reports_cached_stages():
+    """La simulation lit les clés des étapes sans rien créer ni appeler"""
+    url = "https://youtu.be/drydrydry01"
+    saved = Config.JOBS_DIR, Config.SOURCE_CACHE_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        Config.JOBS_DIR = str(Path(tmp) / "jobs")
+        Config.SOURCE_CACHE_DIR = str(Path(tmp) / "source")
+        try:
+            assert cli.plan_video(url)["stages"] == dict.fromkeys(
+                ("download", "words", "grouped", "translated"), False
+            )
+            assert not Path(Config.JOBS_DIR).exists()
+
+            job = JobStore.for_url(url)
+            job.stage("download", cli.download_inputs(url), lambda: ["a.wav", {}])
+            keys = stage_inputs(job)
+            job.save("words", keys["words"], [{"word": "hi"}])
+
+            plan = cli.plan_video(url)
+            assert plan["stages"] == {
+                "download": True,
+                "words": True,
+                "grouped": False,
+                "translated": False,
+            }
+
+            out = StringIO()
+            with redirect_stdout(out):
+                assert cli.main(["--dry-run", url]) == 0
+            assert "Reprises: download, words" in out.getvalue()
+        finally:
+            Config.JOBS_DIR, Config.SOURCE_CACHE_DIR = saved
+    print("✅ Simulation sans appel")
+
+
+def test_has_matches_load():
+    """`has` reconnaît la clé sans lire les données"""
+    with tempfile.TemporaryDirectory() as tmp:
+        job = JobStore("abc", root=tmp)
+        job.save("grouped", "k1", [{"text": "é" * 1000}])
+        assert job.has("grouped", "k1")
+        assert not job.has("grouped", "k2")
+        assert not job.has("words", "k1")
+    print("✅ Présence d'une étape")
+
+
+if __name__ == "__main__":
+    test_engines_import_nothing_heavy()
+    test_dry_run_reports_cached_stages()
+    test_has_matches_load()
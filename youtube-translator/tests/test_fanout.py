@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test hors-ligne de la traduction multilingue (un téléchargement, une transcription)
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import Config
+from fakes import FakeBackend, install, offline_env
+import fanout
+import main as cli
+
+
+def test_parse_languages():
+    assert fanout.parse_languages("fr, de,fr,es") == ["fr", "de", "es"]
+    for value in ("fr,xx", " , "):
+        try:
+            fanout.parse_languages(value)
+        except ValueError:
+            continue
+        raise AssertionError(value)
+    print("✅ Langues cibles")
+
+
+def test_fanout_offline():
+    """Trois langues à partir d'un seul téléchargement et d'une seule transcription"""
+    backend = FakeBackend()
+    with tempfile.TemporaryDirectory() as tmp, offline_env(tmp):
+        restore = install(backend, minutes=1)
+        try:
+            outputs = fanout.main(
+                "https://youtu.be/fanout00001", ["fr", "de", "es"], preflight=False
+            )
+            if shutil.which("ffmpeg"):
+                assert len(outputs) == 3
+                assert all(Path(output).exists() for output in outputs)
+
+            job_dir = Path(Config.JOBS_DIR) / "fanout00001"
+            for language, stage in (("fr", "translated"), ("de", "translated_de")):
+                segments = json.loads((job_dir / f"{stage}.json").read_text())["data"]
+                assert segments[0][f"text_{language}"].startswith(f"[{language}] ")
+
+            # --dry-run voit les mêmes clés que la traduction multilingue
+            plan = cli.plan_video("https://youtu.be/fanout00001", ["fr", "de", "es"])
+            assert all(plan["stages"].values()), plan
+
+            (report,) = Path(Config.METRICS_DIR).glob("*_languages.json")
+            report = json.loads(report.read_text())
+            assert set(report["shared"]) == {"download", "transcription", "grouping"}
+            assert set(report["languages"]) == {"fr", "de", "es"}
+            for result in report["languages"].values():
+                assert "translation" in result["seconds"]
+        finally:
+            restore()
+
+    assert backend.calls["yt_dlp.extract_info"] == 1
+    transcriptions = sum(
+        count for api, count in backend.calls.items() if api.startswith("speech.")
+    )
+    assert transcriptions == 1  # Vidéo d'une minute : un seul morceau
+    assert backend.calls["translate.translate"] == 3  # Un lot par langue
+    print("✅ Traduction multilingue hors-ligne")
+
+
+if __name__ == "__main__":
+    test_parse_languages()
+    test_fanout_offline()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Tests de la gouvernance des appels API (débit, tentatives, AIMD)
+"""
+
+import asyncio
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import Config
+from fakes import FakeApiError
+from governance import AIMDLimiter, Governor, TokenBucket, error_code
+
+
+class Flaky:
+    """Échoue `failures` fois avec `code`, puis réussit"""
+
+    def __init__(self, failures, code="UNAVAILABLE"):
+        self.failures = failures
+        self.code = code
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise FakeApiError("refus", code=self.code)
+        return "ok"
+
+
+@contextmanager
+def _fast_retries():
+    saved = Config.RETRY_BASE_DELAY
+    Config.RETRY_BASE_DELAY = 0.001
+    try:
+        yield Governor("tts", max_concurrency=4)
+    finally:
+        Config.RETRY_BASE_DELAY = saved
+
+
+def test_error_codes():
+    """Codes gRPC, HTTP et factices reconnus"""
+
+    class HttpError(Exception):
+        code = 429
+
+    assert error_code(HttpError()) == "RESOURCE_EXHAUSTED"
+    assert error_code(FakeApiError("x", code="UNAVAILABLE")) == "UNAVAILABLE"
+    assert error_code(ValueError()) is None
+    print("✅ Codes d'erreur")
+
+
+def test_token_bucket():
+    """Au-delà de la réserve, chaque jeton coûte 1/rate secondes d'attente"""
+    bucket = TokenBucket(rate=10, capacity=2)
+    waits = [bucket.reserve() for _ in range(4)]
+    assert waits[0] == waits[1] == 0
+    assert 0.09 < waits[2] < 0.11
+    assert 0.19 < waits[3] < 0.21
+    print("✅ Seau à jetons")
+
+
+def test_retry_then_success():
+    """Une erreur temporaire est retentée jusqu'au succès"""
+    flaky = Flaky(failures=2)
+    with _fast_retries() as governor:
+        assert governor.call(flaky) == "ok"
+    assert flaky.calls == 3
+    print("✅ Nouvelles tentatives")
+
+
+def test_non_retryable_and_exhausted():
+    """Erreur définitive : pas de nouvelle tentative ; sinon arrêt après le maximum"""
+    with _fast_retries() as governor:
+        flaky = Flaky(failures=10, code="INVALID_ARGUMENT")
+        try:
+            governor.call(flaky)
+            assert False
+        except FakeApiError as e:
+            assert e.attempts == 1 and flaky.calls == 1
+
+        flaky = Flaky(failures=10)
+        try:
+            governor.call(flaky)
+            assert False
+        except FakeApiError as e:
+            assert e.attempts == Config.RETRY_MAX_ATTEMPTS
+            assert flaky.calls == Config.RETRY_MAX_ATTEMPTS
+    print("✅ Erreurs définitives et tentatives épuisées")
+
+
+def test_aimd():
+    """Division par deux sur refus de quota, augmentation si latence saine"""
+    limiter = AIMDLimiter(maximum=16, initial=8, target_latency=1.0, cooldown=0)
+    limiter.on_throttle()
+    assert limiter.limit == 4
+    limiter.on_success(5.0)  # Trop lent : pas d'augmentation
+    assert limiter.limit == 4
+    for _ in range(4):
+        limiter.on_success(0.1)
+    assert 4.9 < limiter.limit < 5.1
+    for _ in range(5):
+        limiter.on_throttle()
+    assert limiter.limit == 1  # Jamais sous le minimum
+    print("✅ Concurrence AIMD")
+
+
+def test_async_concurrency_bound():
+    """En asyncio, jamais plus d'appels simultanés que la limite courante"""
+    governor = Governor("tts", max_concurrency=4)
+    governor.limiter.limit = 3
+    state = {"now": 0, "max": 0}
+
+    async def call():
+        state["now"] += 1
+        state["max"] = max(state["max"], state["now"])
+        await asyncio.sleep(0.01)
+        state["now"] -= 1
+
+    async def run():
+        await asyncio.gather(*(governor.acall(call) for _ in range(20)))
+
+    start = time.monotonic()
+    asyncio.run(run())
+    assert state["max"] <= 4  # +1 possible après une augmentation additive
+    assert time.monotonic() - start < 5
+    print("✅ Borne de concurrence asyncio")
+
+
+def test_cancelled_async_waiter():
+    """Une attente asyncio annulée, ou dont la boucle est fermée, ne casse pas
+    la libération par un thread"""
+    limiter = AIMDLimiter(maximum=1, initial=1)
+    limiter.acquire()
+
+    async def wait_briefly():
+        try:
+            await asyncio.wait_for(limiter.acquire_async(), timeout=0.05)
+        except asyncio.TimeoutError:
+            pass
+
+    asyncio.run(wait_briefly())
+    assert not limiter._async_waiters  # Attente annulée retirée
+
+    loop = asyncio.new_event_loop()
+    limiter._async_waiters.append((loop, loop.create_future()))
+    loop.close()
+    limiter.release()  # Boucle fermée : ignorée
+    assert limiter.in_flight == 0 and not limiter._async_waiters
+    print("✅ Attentes asyncio annulées ignorées")
+
+
+if __name__ == "__main__":
+    test_error_codes()
+    test_token_bucket()
+    test_retry_then_success()
+    test_non_retryable_and_exhausted()
+    test_aimd()
+    test_async_concurrency_bound()
+    test_cancelled_async_waiter()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests hors-ligne des points de reprise
+"""
+
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import Config
+from jobs import JobStore, stage_inputs, video_id_from_url
+
+
+def test_video_id_from_url():
+    """L'identifiant est extrait des formes d'URL courantes"""
+    assert video_id_from_url("https://youtu.be/dQw4w9WgXcQ") == "dQw4w9WgXcQ"
+    url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=3"
+    assert video_id_from_url(url) == "dQw4w9WgXcQ"
+    assert len(video_id_from_url("https://example.com/video")) == 16
+    print("✅ Identifiant vidéo")
+
+
+def test_stage_skipped_until_inputs_change():
+    """Une étape n'est recalculée que si ses entrées changent"""
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"segments": len(calls)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        job = JobStore("abc", root=tmp)
+        assert job.stage("words", ["k1"], compute) == {"segments": 1}
+
+        job = JobStore("abc", root=tmp)  # Relance
+        assert job.stage("words", ["k1"], compute) == {"segments": 1}
+        assert len(calls) == 1
+
+        assert job.stage("words", ["k2"], compute) == {"segments": 2}
+        assert job.stage("words", ["k2"], compute, valid=lambda d: False) == {
+            "segments": 3
+        }
+    print("✅ Étapes reprises tant que les entrées sont identiques")
+
+
+def test_segmentation_limits_change_keys():
+    """Segments et traductions sont refaits si les limites de découpage changent"""
+    saved = Config.SEGMENT_MAX_BYTES, Config.TTS_MAX_BYTES
+
+    def keys():
+        job.key_for("download", ["url"])
+        return dict(stage_inputs(job, ("fr", "de")))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        job = JobStore("abc", root=tmp)
+        try:
+            before = keys()
+            Config.TTS_MAX_BYTES = 1000
+            after = keys()
+            assert after["words"] == before["words"]
+            for name in ("grouped", "translated", "translated_de"):
+                assert after[name] != before[name], name
+
+            Config.TTS_MAX_BYTES = saved[1]
+            Config.SEGMENT_MAX_BYTES = 500
+            after = keys()
+            assert after["grouped"] != before["grouped"]
+            assert after["translated"] != before["translated"]
+        finally:
+            Config.SEGMENT_MAX_BYTES, Config.TTS_MAX_BYTES = saved
+    print("✅ Limites de découpage incluses dans les clés")
+
+
+def test_concurrent_saves():
+    """Deux jobs d'une même vidéo enregistrent la même étape sans se gêner"""
+    errors = []
+
+    def save(job, n):
+        try:
+            for _ in range(50):
+                job.save("words", f"k{n}", {"n": n})
+        except Exception as e:
+            errors.append(e)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        threads = [
+            threading.Thread(target=save, args=(JobStore("abc", root=tmp), n))
+            for n in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors, errors
+        assert [p.name for p in (Path(tmp) / "abc").iterdir()] == ["words.json"]
+    print("✅ Écritures concurrentes d'une étape")
+
+
+if __name__ == "__main__":
+    test_video_id_from_url()
+    test_stage_skipped_until_inputs_change()
+    test_segmentation_limits_change_keys()
+    test_concurrent_saves()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests hors-ligne des mesures
+"""
+
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import metrics
+
+
+def test_job_metrics_follow_threads():
+    """Les mesures faites dans un thread propagé vont au registre du job"""
+    job = metrics.start_job("test")
+
+    def work():
+        with metrics.api_call("tts", "synthesize_speech") as call:
+            call.sent(chars=12)
+            call.received(2048)
+
+    thread = threading.Thread(target=metrics.propagate(work))
+    thread.start()
+    thread.join()
+
+    counters = {
+        (c["name"], c["labels"].get("service")): c["value"]
+        for c in job.to_dict()["counters"]
+    }
+    assert counters[("characters_sent_total", "tts")] == 12
+    assert counters[("bytes_downloaded_total", "tts")] == 2048
+    print("✅ Mesures propagées aux threads")
+
+
+def test_stage_span_and_prometheus_export():
+    """Une étape produit un span et un histogramme Prometheus"""
+    job = metrics.start_job("test")
+
+    @metrics.timed_stage("grouping")
+    def group():
+        yield 1
+        yield 2
+
+    assert list(group()) == [1, 2]
+    assert [span["name"] for span in job.spans] == ["grouping"]
+
+    text = job.to_prometheus()
+    assert "# TYPE youtube_translator_stage_duration_seconds histogram" in text
+    assert 'youtube_translator_stage_duration_seconds_count{stage="grouping"} 1' in text
+    print("✅ Spans et export Prometheus")
+
+
+def test_concurrent_reports():
+    """Jobs simultanés : export Prometheus remplacé d'un bloc, sans reste"""
+    with tempfile.TemporaryDirectory() as tmp:
+        threads = [
+            threading.Thread(
+                target=metrics.write_reports, args=(metrics.Metrics(f"job{n}"), tmp)
+            )
+            for n in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        names = sorted(p.name for p in Path(tmp).iterdir())
+        assert names == [f"job{n}.json" for n in range(8)] + ["youtube_translator.prom"]
+    print("✅ Rapports de jobs simultanés")
+
+
+if __name__ == "__main__":
+    test_job_metrics_follow_threads()
+    test_stage_span_and_prometheus_export()
+    test_concurrent_reports()
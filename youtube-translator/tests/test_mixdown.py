@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests hors-ligne du mixage en une passe
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from mixdown import build_concat_list, encode_pcm, mp3_duration, silent_mp3_frame
+from timeline import PCMTimeline
+
+# ffmpeg factice : recopie l'entrée standard dans le fichier de sortie et note
+# ses arguments
+FAKE_FFMPEG = """#!/bin/sh
+echo "$@" >> "$(dirname "$0")/calls.txt"
+for last; do :; done
+cat > "$last"
+"""
+
+
+def test_mp3_duration_counts_frames():
+    """La durée d'un MP3 est déduite du nombre de trames"""
+    frame = silent_mp3_frame(24000)  # 576 échantillons à 24 kHz = 24 ms
+    assert abs(mp3_duration(frame * 125) - 3.0) < 1e-9
+    tagged = b"ID3\x03\x00\x00\x00\x00\x00\x02ab" + frame
+    assert abs(mp3_duration(tagged) - 0.024) < 1e-9
+    print("✅ Durée MP3 calculée")
+
+
+def test_concat_list_places_clips():
+    """Un silence ajusté précède chaque clip dont l'horodatage est plus loin"""
+    frame = silent_mp3_frame(24000)
+    with tempfile.TemporaryDirectory() as tmp:
+        clips = []
+        for i, start in enumerate([0.0, 5.0, 6.1]):
+            clip = Path(tmp) / f"clip{i}.mp3"
+            clip.write_bytes(frame * 50)  # 1,2 s
+            clips.append((str(clip), start))
+
+        lines, longest_gap = build_concat_list(clips, Path(tmp) / "silence.mp3")
+
+    outpoints = [line for line in lines if line.startswith("outpoint")]
+    assert outpoints == ["outpoint 3.800"]  # 6,1 s tombe pendant le 2e clip
+    assert abs(longest_gap - 3.8) < 1e-9
+    assert sum(line.startswith("file") for line in lines) == 4
+    print("✅ Clips placés à leur horodatage")
+
+
+def test_encode_pcm_single_pass():
+    """La timeline PCM part vers un seul ffmpeg par l'entrée standard"""
+    with tempfile.TemporaryDirectory() as tmp:
+        ffmpeg = Path(tmp) / "ffmpeg"
+        ffmpeg.write_text(FAKE_FFMPEG)
+        ffmpeg.chmod(0o755)
+        path = os.environ["PATH"]
+        os.environ["PATH"] = f"{tmp}{os.pathsep}{path}"
+        try:
+            timeline = PCMTimeline(1.0, sample_rate=24000)
+            timeline.place(0.5, b"\x05\x00" * 100, min_gap_ms=0)
+            output = Path(tmp) / "final.mp3"
+            assert encode_pcm(timeline, str(output), ["-metadata", "title=t"])
+        finally:
+            os.environ["PATH"] = path
+
+        assert output.read_bytes() == bytes(timeline.pcm())
+        calls = (Path(tmp) / "calls.txt").read_text().splitlines()
+        assert len(calls) == 1
+        assert "-f s16le -ar 24000 -ac 1 -i pipe:0" in calls[0]
+    print("✅ Encodage unique depuis la timeline PCM")
+
+
+if __name__ == "__main__":
+    test_mp3_duration_counts_frames()
+    test_concat_list_places_clips()
+    test_encode_pcm_single_pass()
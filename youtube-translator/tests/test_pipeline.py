@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests hors-ligne du pipeline en flux
+"""
+
+import contextvars
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import Config
+import metrics
+from metrics import timed_stage
+from pipeline import background, iter_speaker_turns, stream_translated_segments
+from pipeline import use_streaming_pipeline
+from tts_pool import synthesize_stream
+
+
+def group(words):
+    """Regroupement minimal par locuteur (même contrat que les scripts)"""
+    grouped = []
+    for w in words:
+        if grouped and grouped[-1]["speaker"] == w["speaker"]:
+            grouped[-1]["text"] += " " + w["word"]
+            grouped[-1]["end_time"] = w["end_time"]
+        else:
+            grouped.append(
+                {
+                    "speaker": w["speaker"],
+                    "text": w["word"],
+                    "start_time": w["start_time"],
+                    "end_time": w["end_time"],
+                }
+            )
+    return grouped
+
+
+def word(text, t, speaker):
+    return {"word": text, "start_time": t, "end_time": t + 0.4, "speaker": speaker}
+
+
+def test_turn_spanning_chunks_kept_whole():
+    """Une réplique à cheval sur deux morceaux reste un seul segment"""
+    chunks = [
+        [word("hi", 0, 1), word("how", 1, 2), word("are", 2, 2)],
+        [word("you", 3, 2), word("fine", 4, 1)],
+    ]
+    batches = list(iter_speaker_turns(iter(chunks), group))
+    texts = [s["text"] for batch in batches for s in batch]
+
+    assert texts == ["hi", "how are you", "fine"]
+    assert len(batches[0]) == 1  # "how are" attend le morceau suivant
+    print("✅ Répliques conservées entre morceaux")
+
+
+def test_background_propagates_errors():
+    """Une erreur du producteur remonte au consommateur"""
+
+    def producer():
+        yield 1
+        raise ValueError("panne")
+
+    items = []
+    try:
+        for item in background(producer(), maxsize=1):
+            items.append(item)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("erreur non propagée")
+    assert items == [1]
+    print("✅ Erreurs propagées")
+
+
+def test_synthesize_stream_ordered():
+    """Le flux TTS rend les segments dans l'ordre d'arrivée"""
+    results = list(
+        synthesize_stream(iter(range(10)), lambda i, s: s * 2, max_workers=3)
+    )
+    assert [r["output"] for r in results] == [i * 2 for i in range(10)]
+    print("✅ Flux TTS ordonné")
+
+
+def test_grouping_measured_once():
+    """Le regroupement en flux compte une mesure par appel de `group`"""
+    chunks = [[word("hi", 0, 1), word("how", 1, 2)], [word("fine", 2, 1)]]
+
+    def run():
+        job = metrics.start_job("grouping")
+        list(iter_speaker_turns(iter(chunks), timed_stage("grouping")(group)))
+        return job
+
+    job = contextvars.Context().run(run)  # Registre limité à ce test
+    spans = [span for span in job.spans if span["name"] == "grouping"]
+    assert len(spans) == 3  # "hi", "how", puis "fine"
+    print("✅ Regroupement mesuré une fois")
+
+
+def test_inline_transcription_not_streamed():
+    """TRANSCRIBE_MODE=inline passe par le mode séquentiel"""
+    saved = Config.PIPELINE_MODE, Config.TRANSCRIBE_MODE
+    Config.PIPELINE_MODE, Config.TRANSCRIBE_MODE = "streaming", "inline"
+    try:
+        assert not use_streaming_pipeline()
+        assert use_streaming_pipeline(streamed=True)
+        try:
+            stream_translated_segments("audio.wav", None, None, group)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("mode inline ignoré")
+        Config.TRANSCRIBE_MODE = "chunked"
+        assert use_streaming_pipeline()
+    finally:
+        Config.PIPELINE_MODE, Config.TRANSCRIBE_MODE = saved
+    print("✅ Transcription inline en mode séquentiel")
+
+
+if __name__ == "__main__":
+    test_turn_spanning_chunks_kept_whole()
+    test_background_propagates_errors()
+    test_synthesize_stream_ordered()
+    test_grouping_measured_once()
+    test_inline_transcription_not_streamed()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test de bout en bout hors-ligne : main() sur backends factices
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import Config
+from fakes import FakeBackend, install, offline_env
+import translate_youtube_complete
+
+
+def test_complete_pipeline_offline():
+    """Une vidéo synthétique de 3 minutes traverse tout le pipeline"""
+    backend = FakeBackend()
+    with tempfile.TemporaryDirectory() as tmp, offline_env(tmp):
+        restore = install(backend, minutes=3)
+        try:
+            output = translate_youtube_complete.main(
+                "https://youtu.be/offline0000", preflight=False
+            )
+            if shutil.which("ffmpeg"):
+                assert output and Path(output).exists()
+            # Rien d'intermédiaire dans le répertoire courant, espace de travail supprimé
+            assert not [
+                p.name
+                for p in Path(tmp).iterdir()
+                if p.name.startswith("temp_") or p.suffix in (".json", ".wav", ".txt")
+            ]
+            assert not list((Path(tmp) / ".cache" / "work").iterdir())
+        finally:
+            restore()
+
+    assert backend.calls["yt_dlp.extract_info"] == 1
+    assert backend.calls["speech.long_running_recognize"] == 1
+    assert backend.calls["translate.translate"] <= 2  # Traduction par lots
+    assert backend.calls["tts.synthesize_speech"] >= 10
+    print("✅ Pipeline complet hors-ligne")
+
+
+def test_checkpoints_survive_tts_failure():
+    """Pipeline en flux : mots, segments et traductions sont enregistrés avant
+    la synthèse, une erreur TTS ne les perd pas"""
+    synthesize = translate_youtube_complete.synthesize_to_timeline
+
+    def failing_synthesis(segments, *args, **kwargs):
+        for _ in segments:
+            pass
+        raise RuntimeError("TTS indisponible")
+
+    backend = FakeBackend()
+    with tempfile.TemporaryDirectory() as tmp, offline_env(tmp):
+        restore = install(backend, minutes=1)
+        translate_youtube_complete.synthesize_to_timeline = failing_synthesis
+        try:
+            try:
+                translate_youtube_complete.main(
+                    "https://youtu.be/ttsfailure1", preflight=False
+                )
+            except SystemExit:
+                pass
+            else:
+                raise AssertionError("échec TTS non signalé")
+            job_dir = Path(Config.JOBS_DIR) / "ttsfailure1"
+            for name in ("words", "grouped", "translated"):
+                assert (job_dir / f"{name}.json").exists(), name
+
+            # Relance : traduction reprise, ni transcription ni traduction
+            translate_youtube_complete.synthesize_to_timeline = synthesize
+            calls = dict(backend.calls)
+            try:
+                translate_youtube_complete.main(
+                    "https://youtu.be/ttsfailure1", preflight=False
+                )
+            except SystemExit:
+                pass  # Seule la reprise des étapes importe ici
+            for api in ("speech.long_running_recognize", "translate.translate"):
+                assert backend.calls.get(api, 0) == calls.get(api, 0), api
+        finally:
+            translate_youtube_complete.synthesize_to_timeline = synthesize
+            restore()
+    print("✅ Points de reprise conservés après un échec TTS")
+
+
+def test_failed_download_cleans_up():
+    """Un téléchargement en échec (sys.exit) supprime quand même l'espace de
+    travail et écrit le rapport de mesures"""
+    download = translate_youtube_complete.download_audio
+
+    def failing_download(url, output_base="temp_audio"):
+        print("❌ Erreur de téléchargement: vidéo indisponible")
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as tmp, offline_env(tmp):
+        restore = install(FakeBackend(), minutes=1)
+        translate_youtube_complete.download_audio = failing_download
+        try:
+            try:
+                translate_youtube_complete.main(
+                    "https://youtu.be/nodownload1", preflight=False
+                )
+            except SystemExit:
+                pass
+            else:
+                raise AssertionError("échec du téléchargement non signalé")
+            work = Path(tmp) / ".cache" / "work"
+            assert not work.exists() or not list(work.iterdir())
+            assert list(Path(Config.METRICS_DIR).glob("nodownload1_*.json"))
+        finally:
+            translate_youtube_complete.download_audio = download
+            restore()
+    print("✅ Espace de travail supprimé après un échec de téléchargement")
+
+
+if __name__ == "__main__":
+    test_complete_pipeline_offline()
+    test_checkpoints_survive_tts_failure()
+    test_failed_download_cleans_up()
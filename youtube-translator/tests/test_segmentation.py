@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests du découpage des tours de parole sous les limites des API
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from segmentation import (
+    fit_tts_limit,
+    segment_turns,
+    split_points,
+    split_text,
+    utf8_len,
+)
+from word_timeline import WordTimeline
+
+
+def monologue(sentences, speaker=1):
+    timeline = WordTimeline()
+    t = 0.0
+    for s in range(sentences):
+        sentence = [f"mot{s}"] * 9 + [f"fin{s}."]
+        for word in sentence:
+            timeline.append(word, t, t + 0.3, speaker)
+            t += 0.5
+    return timeline
+
+
+def test_split_at_sentence_ends():
+    """Un long tour est coupé aux fins de phrase, sous la limite, avec timings"""
+    timeline = monologue(50)
+    segments = segment_turns(timeline, max_bytes=200)
+
+    assert len(segments) > 1
+    assert all(utf8_len(s["text"]) <= 200 for s in segments)
+    assert all(s["text"].endswith(".") for s in segments)
+    assert " ".join(s["text"] for s in segments) == " ".join(timeline.words)
+    for current, following in zip(segments, segments[1:]):
+        assert current["end_time"] < following["start_time"]
+    assert segments[0]["start_time"] == 0.0
+    assert segments[-1]["end_time"] == timeline.ends[-1]
+    print("✅ Coupure aux fins de phrase")
+
+
+def test_pieces_filled():
+    """Les morceaux sont remplis : pas de coupure à chaque phrase"""
+    words = "Oui. " + "a " * 60 + "b."
+    points = split_points(words.split(), 100)
+    sizes = [
+        utf8_len(" ".join(words.split()[a:b]))
+        for a, b in zip([0, *points], [*points, len(words.split())])
+    ]
+    assert all(size <= 100 for size in sizes)
+    assert sizes[0] > 50  # pas de morceau « Oui. » isolé
+    print("✅ Morceaux remplis")
+
+
+def test_short_turns_unchanged():
+    """Les tours sous la limite restent identiques au regroupement simple"""
+    timeline = WordTimeline()
+    for i, speaker in enumerate([1, 1, 2, 1]):
+        timeline.append(f"w{i}.", float(i), i + 0.5, speaker)
+    assert segment_turns(timeline) == timeline.speaker_turns()
+    print("✅ Tours courts inchangés")
+
+
+def test_split_text_bytes():
+    """Limite en octets UTF-8, y compris pour un texte sans espaces"""
+    text = "Été éprouvant, déjà ; " * 40
+    pieces = split_text(text, 120)
+    assert all(utf8_len(p) <= 120 for p in pieces)
+    assert " ".join(pieces) == " ".join(text.split())
+
+    pieces = split_text("é" * 300, 100)
+    assert [utf8_len(p) for p in pieces] == [100] * 6
+    print("✅ Limite en octets")
+
+
+def test_fit_tts_limit():
+    """Une traduction trop longue se partage la durée du segment"""
+    segment = {
+        "speaker": 1,
+        "text": "long",
+        "text_fr": "Une phrase française. " * 20,
+        "start_time": 10.0,
+        "end_time": 30.0,
+    }
+    parts = fit_tts_limit(segment, max_bytes=150)
+    assert len(parts) > 1
+    assert all(utf8_len(p["text_fr"]) <= 150 for p in parts)
+    assert parts[0]["start_time"] == 10.0
+    assert abs(parts[-1]["end_time"] - 30.0) < 1e-9
+    assert fit_tts_limit({**segment, "text_fr": "court"}) == [
+        {**segment, "text_fr": "court"}
+    ]
+    print("✅ Découpage des traductions longues")
+
+
+if __name__ == "__main__":
+    test_split_at_sentence_ends()
+    test_pieces_filled()
+    test_short_turns_unchanged()
+    test_split_text_bytes()
+    test_fit_tts_limit()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests hors-ligne du mode serveur (API HTTP locale et file de jobs)
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import lazy
+from fakes import FakeBackend, install, offline_env
+from server import JobQueue, make_handler
+
+
+def request(base, path, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(base + path, data=data, method="POST" if data else "GET")
+    try:
+        with urllib.request.urlopen(req) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def wait_finished(base, job_id, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        _, job = request(base, f"/jobs/{job_id}")
+        if job["status"] in ("ok", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError("job non terminé")
+
+
+def test_jobs_over_http():
+    """Jobs soumis, suivis et terminés ; clients réutilisés d'un job à l'autre"""
+    backend = FakeBackend()
+    with tempfile.TemporaryDirectory() as tmp, offline_env(tmp):
+        restore = install(backend, minutes=1)
+        queue = JobQueue(workers=2)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(queue, time.time()))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            status, health = request(base, "/health")
+            assert status == 200 and health["status"] == "ok"
+
+            status, job = request(base, "/jobs", {"url": "https://youtu.be/server00001"})
+            assert status == 202 and job["status"] == "queued"
+            status, again = request(base, "/jobs", {"url": "https://youtu.be/server00001"})
+            assert status == 200 and again["id"] == job["id"]  # Doublon réutilisé
+            watch = "https://www.youtube.com/watch?v=server00001&t=30"
+            status, again = request(base, "/jobs", {"url": watch})
+            assert status == 200 and again["id"] == job["id"]  # Même vidéo
+            # Autre moteur, même vidéo : exécuté après le premier
+            status, other = request(
+                base,
+                "/jobs",
+                {"url": "https://youtu.be/server00001", "engine": "complete"},
+            )
+            assert status == 202 and other["id"] != job["id"]
+
+            first = wait_finished(base, job["id"])
+            other = wait_finished(base, other["id"])
+            assert other["started_at"] >= first["finished_at"]
+            assert "download" in first["progress"]["done"]
+            assert first["progress"]["api_calls"]["tts"] >= 1
+            if shutil.which("ffmpeg"):
+                assert first["status"] == "ok", first["error"]
+            clients = {
+                name: client.warm() for name, client in lazy.shared_clients().items()
+            }
+            assert set(clients) >= {"speech", "translate", "tts"}
+
+            _, second = request(
+                base,
+                "/jobs",
+                {"url": "https://youtu.be/server00002", "engine": "complete"},
+            )
+            wait_finished(base, second["id"])
+            for name, client in lazy.shared_clients().items():
+                if name in clients:
+                    assert client.warm() is clients[name]
+
+            _, jobs = request(base, "/jobs")
+            assert [j["id"] for j in jobs] == [job["id"], other["id"], second["id"]]
+            assert request(base, "/jobs/inconnu")[0] == 404
+            assert request(base, "/jobs", {"engine": "simple"})[0] == 400
+            assert request(base, "/jobs", {"url": "x", "engine": "turbo"})[0] == 400
+        finally:
+            server.shutdown()
+            server.server_close()
+            queue.shutdown()
+            restore()
+    print("✅ Jobs via l'API HTTP")
+
+
+if __name__ == "__main__":
+    test_jobs_over_http()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests du cache des audios sources (par identifiant vidéo et format)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import Config
+from fakes import FakeBackend, install
+import source_cache
+from source_cache import SourceCache
+import translate_youtube_complete
+
+
+def _info(video_id, ext="webm"):
+    return {"id": video_id, "title": f"Video {video_id}", "ext": ext, "extra": "x"}
+
+
+def test_lookup_links_into_job():
+    """Un audio en cache est lié vers le chemin demandé, avec son info"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SourceCache(Path(tmp) / "cache", max_bytes=10_000)
+        audio = Path(tmp) / "download.webm"
+        audio.write_bytes(b"a" * 100)
+        cache.store("abc", "bestaudio", audio, _info("abc"))
+
+        assert cache.lookup("abc", "worstaudio", Path(tmp) / "job") is None
+        audio_file, info = cache.lookup("abc", "bestaudio", Path(tmp) / "job")
+        assert audio_file == f"{Path(tmp) / 'job'}.webm"
+        assert Path(audio_file).read_bytes() == b"a" * 100
+        assert info["title"] == "Video abc" and "extra" not in info
+
+        # Relu depuis le disque par un nouveau processus
+        reopened = SourceCache(Path(tmp) / "cache", max_bytes=10_000)
+        assert reopened.lookup("abc", "bestaudio", Path(tmp) / "again")
+    print("✅ Audio source lié depuis le cache")
+
+
+def test_eviction_keeps_recent():
+    """Au-delà du plafond, l'entrée la moins récemment utilisée est évincée"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SourceCache(Path(tmp) / "cache", max_bytes=250)
+        for video_id in ("one", "two"):
+            audio = Path(tmp) / f"{video_id}.webm"
+            audio.write_bytes(b"x" * 100)
+            cache.store(video_id, "f", audio, _info(video_id))
+        cache.lookup("one", "f", Path(tmp) / "use")  # "one" devient récent
+        audio = Path(tmp) / "three.webm"
+        audio.write_bytes(b"x" * 100)
+        cache.store("three", "f", audio, _info("three"))
+
+        assert cache.path("two", "f") is None
+        assert cache.path("one", "f") and cache.path("three", "f")
+        assert cache.stats() == {"entries": 2, "bytes": 200}
+    print("✅ Éviction LRU sous plafond")
+
+
+def test_store_is_best_effort():
+    """Un cache inutilisable n'empêche pas le téléchargement de réussir"""
+    with tempfile.TemporaryDirectory() as tmp:
+        blocked = Path(tmp) / "blocked"
+        blocked.write_text("fichier, pas un répertoire")
+        cache = SourceCache(blocked / "cache", max_bytes=10_000)
+        audio = Path(tmp) / "download.webm"
+        audio.write_bytes(b"a" * 100)
+        cache.store("abc", "bestaudio", audio, _info("abc"))
+        assert cache.path("abc", "bestaudio") is None
+        assert cache.directory.is_absolute()
+    print("✅ Écriture du cache sans effet bloquant")
+
+
+def test_repeat_download_skips_network():
+    """Deuxième téléchargement de la même vidéo : aucun appel yt-dlp"""
+    backend = FakeBackend()
+    saved = Config.SOURCE_CACHE_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        Config.SOURCE_CACHE_DIR = str(Path(tmp) / "cache")
+        source_cache._default_cache = None
+        restore = install(backend, minutes=0.2)
+        try:
+            url = "https://youtu.be/cachedvid01"
+            first, _ = translate_youtube_complete.download_audio(url, f"{tmp}/a")
+            second, metadata = translate_youtube_complete.download_audio(
+                url, f"{tmp}/b"
+            )
+        finally:
+            restore()
+            Config.SOURCE_CACHE_DIR = saved
+            source_cache._default_cache = None
+
+        assert backend.calls["yt_dlp.extract_info"] == 1
+        assert Path(second).read_bytes() == Path(first).read_bytes()
+        assert metadata["title"] == "Synthetic 0.2 min"
+    print("✅ Téléchargement répété servi par le cache")
+
+
+if __name__ == "__main__":
+    test_lookup_links_into_job()
+    test_eviction_keeps_recent()
+    test_store_is_best_effort()
+    test_repeat_download_skips_network()
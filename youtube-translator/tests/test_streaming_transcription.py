@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests hors-ligne de la transcription en flux (trames fixes, flux relancés)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import Config
+import streaming_transcription
+from streaming_transcription import iter_frames, iter_stream_words
+from fakes import FakeBackend, install, write_synthetic_wav
+
+
+def test_frames_have_fixed_size():
+    """Le WAV est lu par trames de 100 ms, jamais en entier"""
+    with tempfile.TemporaryDirectory() as tmp:
+        wav = write_synthetic_wav(Path(tmp) / "a.wav", 10)
+        frames = list(iter_frames(wav, 2.0, 7.0, frame_ms=100))
+    assert {len(f) for f in frames} == {3200}
+    assert sum(len(f) for f in frames) == 5 * 32000
+    print("✅ Trames de taille fixe")
+
+
+def check_words(words):
+    assert words
+    assert all(a < b for a, b in zip(words.starts, words.starts[1:]))
+    assert set(words.speakers) <= {1, 2}
+
+
+def test_streams_restart_at_limit():
+    """Un flux par tranche ; les mots arrivent avant la fin de la transcription"""
+    saved = Config.STREAM_LIMIT_SECONDS
+    backend = FakeBackend()
+    restore = install(backend)
+    interim = []
+    Config.STREAM_LIMIT_SECONDS = 60
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            wav = write_synthetic_wav(Path(tmp) / "a.wav", 200)
+            client = streaming_transcription.speech.SpeechClient()
+            chunks = iter_stream_words(wav, client, on_interim=interim.append)
+            first = next(chunks)
+            assert len(backend.stream_seconds) == 1  # Premier flux seulement
+            words = first
+            for chunk in chunks:
+                words.extend(chunk)
+    finally:
+        Config.STREAM_LIMIT_SECONDS = saved
+        restore()
+
+    assert len(backend.stream_seconds) == 4
+    assert max(backend.stream_seconds) <= 60
+    assert backend.max_frame_bytes == 16000 * 2 * Config.STREAM_FRAME_MS // 1000
+    assert interim
+    check_words(words)
+    assert words.ends[-1] > 190
+    print("✅ Flux relancés à la limite de durée")
+
+
+def test_stream_resumes_after_error():
+    """Une erreur temporaire rouvre le flux après le dernier mot reçu"""
+    saved = Config.RETRY_BASE_DELAY
+    backend = FakeBackend()
+    backend.stream_failures = 1
+    restore = install(backend)
+    Config.RETRY_BASE_DELAY = 0.0
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            wav = write_synthetic_wav(Path(tmp) / "a.wav", 60)
+            client = streaming_transcription.speech.SpeechClient()
+            words = streaming_transcription.transcribe_streaming(wav, client)
+    finally:
+        Config.RETRY_BASE_DELAY = saved
+        restore()
+
+    assert len(backend.stream_seconds) == 2
+    assert backend.stream_seconds[1] < backend.stream_seconds[0]
+    check_words(words)
+    assert words.ends[-1] > 55
+    print("✅ Reprise du flux après erreur")
+
+
+if __name__ == "__main__":
+    test_frames_have_fixed_size()
+    test_streams_restart_at_limit()
+    test_stream_resumes_after_error()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests hors-ligne de la timeline PCM
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from timeline import PCMTimeline, decode_linear16, expected_duration
+from fakes import synthetic_wav_bytes
+
+
+def test_clips_placed_at_start_time():
+    """Les clips sont écrits à leur instant, le reste est du silence"""
+    timeline = PCMTimeline(1.0, sample_rate=10)
+    timeline.place(0.2, b"\x01\x00" * 3, min_gap_ms=0)
+    timeline.place(0.8, b"\x02\x00" * 2, min_gap_ms=0)
+
+    assert bytes(timeline.pcm()) == (
+        b"\x00\x00" * 2 + b"\x01\x00" * 3 + b"\x00\x00" * 3 + b"\x02\x00" * 2
+    )
+    print("✅ Clips placés à leur instant")
+
+
+def test_overlap_pushed_and_growth():
+    """Un clip trop long repousse le suivant et agrandit le tampon"""
+    timeline = PCMTimeline(0.5, sample_rate=10)
+    timeline.place(0.0, b"\x01\x00" * 8, min_gap_ms=0)
+    position = timeline.place(0.5, b"\x02\x00" * 4, min_gap_ms=0)
+
+    assert position == 0.8
+    assert timeline.duration() == 1.2
+    print("✅ Chevauchement évité et tampon agrandi")
+
+
+def test_memory_mapped_backing():
+    """La timeline fonctionne sur fichier mappé et le supprime à la fermeture"""
+    with tempfile.TemporaryDirectory() as tmp:
+        backing = Path(tmp) / "timeline.pcm"
+        timeline = PCMTimeline(0.2, sample_rate=10, backing_file=str(backing))
+        timeline.place(0.1, b"\x03\x00" * 5, min_gap_ms=0)
+        assert bytes(timeline.pcm()) == b"\x00\x00" + b"\x03\x00" * 5
+        timeline.close()
+        assert not backing.exists()
+    print("✅ Timeline sur fichier mappé")
+
+
+def test_decode_linear16():
+    """Réponse LINEAR16 décodée en mémoire, fréquence vérifiée"""
+    wav = synthetic_wav_bytes(0.5, 24000)
+    pcm = decode_linear16(wav, 24000)
+    assert len(pcm) == 24000 and pcm == wav[-len(pcm) :]
+    assert decode_linear16(b"\x01\x00\x02\x00", 24000) == b"\x01\x00\x02\x00"
+    try:
+        decode_linear16(wav, 16000)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("fréquence inattendue acceptée")
+    print("✅ Décodage LINEAR16 en mémoire")
+
+
+def test_unknown_duration():
+    """Durée inconnue (None chez yt-dlp) : fin du dernier segment, ou croissance"""
+    segments = [{"end_time": 4.0}, {"end_time": 12.5}]
+    assert expected_duration(None, segments) == 12.5
+    assert expected_duration(0, iter(segments)) == 0
+    assert expected_duration(30, segments) == 30
+
+    timeline = PCMTimeline(None, sample_rate=1000)
+    timeline.place(2.0, b"\x01\x00" * 100)
+    assert timeline.length == 2100 * 2
+    print("✅ Durée de vidéo inconnue")
+
+
+if __name__ == "__main__":
+    test_clips_placed_at_start_time()
+    test_overlap_pushed_and_growth()
+    test_memory_mapped_backing()
+    test_decode_linear16()
+    test_unknown_duration()
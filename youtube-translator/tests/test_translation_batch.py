@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests hors-ligne de la traduction par lots
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import metrics
+from translation_batch import apply_translations, pack_batches, translate_texts
+
+
+class BatchClient:
+    """Client factice : échoue sur tout lot contenant "boom" """
+
+    def __init__(self):
+        self.calls = 0
+
+    def translate(self, values, source_language=None, target_language=None):
+        self.calls += 1
+        if isinstance(values, str):
+            if values == "boom":
+                raise RuntimeError("erreur")
+            return {"translatedText": values.upper()}
+        if "boom" in values:
+            raise RuntimeError("lot refusé")
+        return [{"translatedText": v.upper()} for v in values]
+
+
+def test_pack_batches_limits():
+    """Les lots respectent le nombre de chaînes et de caractères"""
+    texts = ["a" * 10] * 7
+    assert pack_batches(texts, max_strings=3, max_chars=1000) == [
+        [0, 1, 2],
+        [3, 4, 5],
+        [6],
+    ]
+    assert pack_batches(texts, max_strings=100, max_chars=25) == [
+        [0, 1],
+        [2, 3],
+        [4, 5],
+        [6],
+    ]
+    assert pack_batches(["x" * 50, "y"], max_strings=10, max_chars=20) == [[0], [1]]
+    print("✅ Limites des lots respectées")
+
+
+def test_per_item_fallback():
+    """Seuls les éléments du lot en échec sont retentés un par un"""
+    client = BatchClient()
+    results = translate_texts(client, ["hello", "boom", "world"])
+
+    assert results[0] == ("HELLO", None)
+    assert results[2] == ("WORLD", None)
+    assert results[1][0] is None and isinstance(results[1][1], RuntimeError)
+    assert client.calls == 4  # 1 lot + 3 retentatives
+    print("✅ Retentative par élément")
+
+
+def test_failed_translation_dropped():
+    """Un segment non traduit est abandonné et signalé, pas doublé en anglais"""
+    job = metrics.start_job("test_drop")
+    segments = [
+        {"text": "hello", "start_time": 0.0},
+        {"text": "boom", "start_time": 2.0},
+    ]
+    results = [("bonjour", None), (None, RuntimeError("quota"))]
+    translated = list(apply_translations(segments, results))
+
+    assert translated == [{"text": "hello", "start_time": 0.0, "text_fr": "bonjour"}]
+    assert job.dropped[0]["stage"] == "translation"
+    assert job.dropped[0]["index"] == 1
+    print("✅ Segment non traduit abandonné et signalé")
+
+
+def test_html_entities_decoded():
+    """Les entités HTML de Translation v2 ne passent ni en mémoire ni en TTS"""
+
+    class HtmlClient:
+        def translate(self, values, source_language=None, target_language=None):
+            return [{"translatedText": "l&#39;été &amp; l&#39;hiver"} for _ in values]
+
+    assert translate_texts(HtmlClient(), ["summer and winter"]) == [
+        ("l'été & l'hiver", None)
+    ]
+    print("✅ Entités HTML décodées")
+
+
+if __name__ == "__main__":
+    test_pack_batches_limits()
+    test_per_item_fallback()
+    test_failed_translation_dropped()
+    test_html_entities_decoded()
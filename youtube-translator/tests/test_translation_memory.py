@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests hors-ligne de la mémoire de traduction
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from translation_memory import TranslationMemory, translate_with_memory
+
+
+class CountingClient:
+    """Client factice qui compte les chaînes envoyées"""
+
+    def __init__(self):
+        self.sent = []
+
+    def translate(self, values, source_language=None, target_language=None):
+        self.sent.extend(values)
+        return [{"translatedText": f"fr:{v}"} for v in values]
+
+
+def test_memory_shared_between_runs():
+    """Une deuxième vidéo ne renvoie à l'API que les textes inconnus"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "tm.sqlite"
+
+        client = CountingClient()
+        memory = TranslationMemory(path)
+        translate_with_memory(client, ["Welcome back", "Thanks"], memory=memory)
+        memory.close()
+
+        client = CountingClient()
+        memory = TranslationMemory(path)
+        results = translate_with_memory(
+            client, ["Welcome  back", "New topic", "New topic"], memory=memory
+        )
+
+        assert client.sent == ["New topic"]
+        assert [r[0] for r in results] == [
+            "fr:Welcome back",
+            "fr:New topic",
+            "fr:New topic",
+        ]
+        assert memory.stats()["hits"] == 1
+        assert memory.stats()["chars_saved"] == len("Welcome  back")
+        memory.close()
+    print("✅ Mémoire partagée entre exécutions")
+
+
+if __name__ == "__main__":
+    test_memory_shared_between_runs()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests hors-ligne du cache TTS
+"""
+
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tts_cache import TTSCache, cache_key, encoding_tag
+
+
+def test_hit_and_miss():
+    """Deuxième appel servi depuis le disque, même après réouverture"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TTSCache(tmp, max_bytes=1024)
+        key = cache_key("Oui.", "fr-FR-Wavenet-A", "fr-FR", 1.0, "MP3")
+
+        assert cache.get_or_synthesize(key, lambda: b"audio") == b"audio"
+        assert cache.get_or_synthesize(key, lambda: b"autre") == b"audio"
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+        reopened = TTSCache(tmp, max_bytes=1024)
+        assert reopened.get(key) == b"audio"
+    print("✅ Cache persistant")
+
+
+def test_lru_eviction():
+    """L'entrée la moins récemment utilisée est évincée"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TTSCache(tmp, max_bytes=20)
+        cache.put("a", b"x" * 10)
+        cache.put("b", b"x" * 10)
+        cache.get("a")
+        cache.put("c", b"x" * 10)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None and cache.get("c") is not None
+    print("✅ Éviction LRU")
+
+
+def test_identical_requests_collapsed():
+    """Les requêtes identiques simultanées ne synthétisent qu'une fois"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TTSCache(tmp)
+        calls = []
+
+        def synthesize():
+            calls.append(1)
+            time.sleep(0.05)
+            return b"audio"
+
+        threads = [
+            threading.Thread(target=cache.get_or_synthesize, args=("k", synthesize))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+    print("✅ Requêtes identiques fusionnées")
+
+
+def test_encoding_tag():
+    """Même étiquette d'encodage pour un nom ou un membre d'énumération"""
+
+    class AudioEncoding:
+        name = "LINEAR16"
+
+    assert encoding_tag(AudioEncoding()) == encoding_tag("LINEAR16")
+    assert encoding_tag("MP3") != encoding_tag("LINEAR16")
+    print("✅ Étiquette d'encodage commune")
+
+
+if __name__ == "__main__":
+    test_hit_and_miss()
+    test_lru_eviction()
+    test_identical_requests_collapsed()
+    test_encoding_tag()
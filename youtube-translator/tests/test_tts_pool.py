@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests hors-ligne du pool de synthèse TTS
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tts_pool import synthesize_segments
+
+
+def test_order_preserved():
+    """Les résultats suivent l'ordre des segments malgré des latences aléatoires"""
+    segments = [{"text_fr": f"phrase {i}", "speaker": 1} for i in range(20)]
+
+    def synthesize(i, segment):
+        time.sleep(random.uniform(0, 0.01))
+        return segment["text_fr"].encode()
+
+    results = synthesize_segments(segments, synthesize, max_workers=5)
+    assert [r["output"] for r in results] == [s["text_fr"].encode() for s in segments]
+    print("✅ Ordre des segments conservé")
+
+
+def test_failures_reported():
+    """Un segment en échec est reporté sans bloquer les autres"""
+    segments = [{"text_fr": str(i), "speaker": 1} for i in range(5)]
+
+    def synthesize(i, segment):
+        if i == 2:
+            raise RuntimeError("quota")
+        return b"ok"
+
+    results = synthesize_segments(segments, synthesize, max_workers=2)
+    assert isinstance(results[2]["error"], RuntimeError)
+    assert all(r["output"] == b"ok" for i, r in enumerate(results) if i != 2)
+    print("✅ Échecs reportés par segment")
+
+
+if __name__ == "__main__":
+    test_order_preserved()
+    test_failures_reported()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests du WAV mappé en mémoire et de la détection d'activité vocale
+"""
+
+import struct
+import sys
+import tempfile
+import wave
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vad import frame_levels, pcm_levels, silence_runs, speech_regions
+from wav_reader import MappedWav
+from fakes import write_synthetic_wav
+
+
+def test_mapped_samples_match_wave():
+    """Les échantillons mappés sont ceux du fichier, sans lecture complète"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_synthetic_wav(Path(tmp) / "a.wav", 10)
+        with wave.open(str(path), "rb") as w:
+            data = w.readframes(w.getnframes())
+        with MappedWav(path) as wav:
+            assert wav.rate == 16000 and wav.channels == 1
+            assert abs(wav.duration - len(data) / 32000) < 1e-9
+            assert wav.samples.tobytes() == data
+            with wav.pcm(1.0, 2.0) as view:
+                assert bytes(view) == data[32000:64000]
+    print("✅ WAV mappé en mémoire")
+
+
+def test_header_with_extra_chunk():
+    """Un bloc LIST avant les données et une taille déclarée fausse sont tolérés"""
+    pcm = struct.pack("<4h", 1, -2, 3, -4)
+    fmt = struct.pack("<HHIIHH", 1, 1, 16000, 32000, 2, 16)
+    body = (
+        b"WAVE"
+        + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+        + b"LIST" + struct.pack("<I", 3) + b"abc\x00"
+        + b"data" + struct.pack("<I", 0xFFFFFFFF) + pcm
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "b.wav"
+        path.write_bytes(b"RIFF" + struct.pack("<I", len(body)) + body)
+        with MappedWav(path) as wav:
+            assert list(wav.samples) == [1, -2, 3, -4]
+    print("✅ En-tête WAV avec blocs supplémentaires")
+
+
+def test_levels_and_regions():
+    """Niveaux crête par trame, puis silences et régions de parole"""
+    samples = [0, 10, -700, 5] * 2 + [3, -3, 2, 0] * 4 + [900, 0, 0, 0] * 2
+    levels = frame_levels(samples, frame_samples=8, step=1)
+    assert levels == [700, 3, 3, 900]
+    assert pcm_levels(struct.pack(f"<{len(samples)}h", *samples), 8) == [0, 3, 3, 900]
+
+    # 20 ms par trame : parole, 3 trames de silence, parole, 1 trame de silence
+    levels = [800, 900, 0, 0, 0, 700, 100, 600]
+    assert silence_runs(levels, silence_threshold=500) == [(2, 5), (6, 7)]
+    assert silence_runs(levels, silence_threshold=500, min_frames=2) == [(2, 5)]
+    regions = speech_regions(levels, silence_threshold=500, min_silence_ms=40)
+    assert regions == [(0.0, 0.04), (0.1, 0.16)]
+    assert speech_regions([0, 0, 0], silence_threshold=500, min_silence_ms=20) == []
+    print("✅ Régions de parole")
+
+
+if __name__ == "__main__":
+    test_mapped_samples_match_wave()
+    test_header_with_extra_chunk()
+    test_levels_and_regions()
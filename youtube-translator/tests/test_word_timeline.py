@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tests de la timeline de mots en colonnes
+"""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from word_timeline import WordTimeline
+
+
+def reference_grouping(segments):
+    """Regroupement historique (boucle mot par mot)"""
+    grouped = []
+    current_speaker = None
+    current_words = []
+    current_start = 0
+    for segment in segments:
+        if segment["speaker"] != current_speaker:
+            if current_words:
+                grouped.append(
+                    {
+                        "speaker": current_speaker,
+                        "text": " ".join(current_words),
+                        "start_time": current_start,
+                        "end_time": segment["start_time"] - 0.1,
+                    }
+                )
+            current_speaker = segment["speaker"]
+            current_words = [segment["word"]]
+            current_start = segment["start_time"]
+        else:
+            current_words.append(segment["word"])
+    if current_words:
+        grouped.append(
+            {
+                "speaker": current_speaker,
+                "text": " ".join(current_words),
+                "start_time": current_start,
+                "end_time": segments[-1]["end_time"],
+            }
+        )
+    return grouped
+
+
+def random_words(count, seed=0):
+    rng = random.Random(seed)
+    words, t, speaker = [], 0.0, 1
+    for i in range(count):
+        if rng.random() < 0.1:
+            speaker = rng.randint(1, 3)
+        words.append(
+            {"word": f"w{i}", "start_time": t, "end_time": t + 0.25, "speaker": speaker}
+        )
+        t += 0.5
+    return words
+
+
+def test_grouping_matches_loop():
+    """Mêmes tours de parole que la boucle historique"""
+    for count in (0, 1, 2, 500):
+        words = random_words(count, seed=count)
+        assert WordTimeline.from_words(words).speaker_turns() == reference_grouping(words)
+    print("✅ Regroupement identique à la boucle")
+
+
+def test_dict_view():
+    """Vue liste de dicts : indexation, tranches, égalité, JSON"""
+    words = random_words(20)
+    timeline = WordTimeline.from_words(words)
+    assert len(timeline) == 20
+    assert timeline[3] == words[3]
+    assert timeline[-1] == words[-1]
+    assert isinstance(timeline[5:10], WordTimeline)
+    assert timeline[5:10] == words[5:10]
+    assert timeline == words
+    assert WordTimeline.from_words(timeline) is timeline
+    assert json.loads(json.dumps(timeline, default=list)) == words
+    print("✅ Vue liste de dicts")
+
+
+def test_boundaries_and_views():
+    """Frontières de locuteurs, suffixe temporel, renommage"""
+    timeline = WordTimeline()
+    for i, speaker in enumerate([1, 1, 2, 2, 2, 1, 3]):
+        timeline.append(f"w{i}", float(i), i + 0.5, speaker)
+    assert timeline.speaker_boundaries() == [0, 2, 5, 6]
+    assert WordTimeline().speaker_boundaries() == []
+    assert timeline.since(4.0).words == ["w4", "w5", "w6"]
+
+    renamed = timeline.remap_speakers({2: 7})
+    assert list(renamed.speakers) == [1, 1, 7, 7, 7, 1, 3]
+    assert list(timeline.speakers) == [1, 1, 2, 2, 2, 1, 3]
+
+    joined = WordTimeline.concat([timeline[:3], timeline[3:]])
+    assert joined == timeline
+    print("✅ Frontières et vues")
+
+
+if __name__ == "__main__":
+    test_grouping_matches_loop()
+    test_dict_view()
+    test_boundaries_and_views()
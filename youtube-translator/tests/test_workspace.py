@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests des espaces de travail isolés par job
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import Config
+import workspace
+from workspace import Workspace, workspace_root
+
+
+def test_workspaces_isolated():
+    """Deux jobs de la même vidéo ont des répertoires distincts ; le nettoyage
+    d'un job ne touche ni l'autre ni les fichiers voisins"""
+    with tempfile.TemporaryDirectory() as tmp:
+        neighbour = Path(tmp) / "notes.info.json"
+        neighbour.write_text("{}")
+        first = Workspace("abc", root=tmp)
+        second = Workspace("abc", root=tmp)
+        assert first.dir != second.dir
+
+        Path(first.path("audio_mono.wav")).write_bytes(b"1")
+        Path(second.path("audio_mono.wav")).write_bytes(b"2")
+        first.cleanup()
+
+        assert not first.dir.exists()
+        assert Path(second.path("audio_mono.wav")).read_bytes() == b"2"
+        assert neighbour.exists()
+        second.cleanup()
+    print("✅ Espaces de travail isolés")
+
+
+def test_tmpfs_root():
+    """tmpfs utilisé seulement s'il est demandé et présent"""
+    saved = (Config.WORKSPACE_TMPFS, workspace.TMPFS_ROOT)
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            Config.WORKSPACE_TMPFS = True
+            workspace.TMPFS_ROOT = Path(tmp)
+            assert workspace_root() == Path(tmp) / "youtube-translator"
+            workspace.TMPFS_ROOT = Path(tmp) / "absent"
+            assert workspace_root() == Path(Config.WORKSPACE_DIR)
+            Config.WORKSPACE_TMPFS = False
+            workspace.TMPFS_ROOT = Path(tmp)
+            assert workspace_root() == Path(Config.WORKSPACE_DIR)
+        finally:
+            Config.WORKSPACE_TMPFS, workspace.TMPFS_ROOT = saved
+    print("✅ Racine tmpfs optionnelle")
+
+
+if __name__ == "__main__":
+    test_workspaces_isolated()
+    test_tmpfs_root()
@@ -0,0 +1,127 @@
+"""
+Timeline PCM préallouée pour l'assemblage final
+Un seul tampon dimensionné d'après les timings : chaque clip est écrit à sa
+position, les silences sont les zéros du tampon (coût linéaire)
+"""
+
+import io
+import mmap
+import os
+import wave
+
+from config import Config
+
+
+def decode_linear16(data, sample_rate=None):
+    """PCM 16 bits mono d'une réponse Text-to-Speech LINEAR16
+
+    La réponse est un WAV (en-tête RIFF) lu en mémoire, sans ffmpeg ; des
+    octets sans en-tête sont rendus tels quels.
+    """
+    sample_rate = sample_rate or Config.TTS_SAMPLE_RATE
+    if data[:4] != b"RIFF":
+        return data
+    with wave.open(io.BytesIO(data)) as wav:
+        layout = (wav.getnchannels(), wav.getsampwidth(), wav.getframerate())
+        if layout != (1, 2, sample_rate):
+            raise ValueError(
+                f"LINEAR16 inattendu: {layout[0]} canal(aux), {layout[1] * 8} bits, {layout[2]} Hz"
+            )
+        return wav.readframes(wav.getnframes())
+
+
+def expected_duration(duration, segments=None):
+    """Durée de la sortie : celle de la vidéo, à défaut la fin du dernier segment
+
+    yt-dlp peut renvoyer une durée inconnue (None) ; sans liste de segments
+    (flux), 0 : la timeline s'agrandit au fil des clips.
+    """
+    if duration:
+        return duration
+    if isinstance(segments, list) and segments:
+        return max(segment["end_time"] for segment in segments)
+    return 0
+
+
+class PCMTimeline:
+    """Tampon PCM 16 bits où l'on place des clips à leur instant de départ
+
+    Avec `backing_file`, le tampon est un fichier mappé en mémoire : la sortie
+    de plusieurs heures ne réside pas dans le tas Python.
+    """
+
+    def __init__(
+        self,
+        duration_seconds,
+        sample_rate=None,
+        channels=1,
+        sample_width=2,
+        backing_file=None,
+    ):
+        self.sample_rate = sample_rate or Config.SAMPLE_RATE
+        self.channels = channels
+        self.sample_width = sample_width
+        self.frame_size = channels * sample_width
+        self.backing_file = backing_file
+        self.length = 0  # Octets écrits jusqu'à la fin du dernier clip
+        self.cursor = 0  # Fin du dernier clip placé
+
+        capacity = max(self.seconds_to_offset(duration_seconds or 0), self.frame_size)
+        if backing_file:
+            self._file = open(backing_file, "w+b")
+            self._file.truncate(capacity)
+            self.buffer = mmap.mmap(self._file.fileno(), capacity)
+        else:
+            self._file = None
+            self.buffer = bytearray(capacity)
+
+    def seconds_to_offset(self, seconds):
+        """Position en octets (alignée sur une trame) d'un instant"""
+        return int(max(seconds, 0) * self.sample_rate) * self.frame_size
+
+    def _ensure_capacity(self, size):
+        capacity = len(self.buffer)
+        if size <= capacity:
+            return
+        new_capacity = max(size, capacity * 2)
+        if self._file:
+            self._file.truncate(new_capacity)
+            self.buffer.resize(new_capacity)
+        else:
+            self.buffer.extend(bytes(new_capacity - capacity))
+
+    def place(self, start_seconds, pcm, min_gap_ms=None):
+        """Écrit un clip PCM à son instant de départ, sans chevaucher le précédent
+
+        Un écart inférieur à `min_gap_ms` avec le clip précédent est supprimé.
+        Renvoie la position effective (secondes) du clip.
+        """
+        min_gap_ms = Config.MIN_SILENCE_MS if min_gap_ms is None else min_gap_ms
+        offset = self.seconds_to_offset(start_seconds)
+        min_gap = self.seconds_to_offset(min_gap_ms / 1000)
+        if offset - self.cursor <= min_gap:
+            offset = self.cursor
+
+        end = offset + len(pcm) - len(pcm) % self.frame_size
+        self._ensure_capacity(end)
+        self.buffer[offset:end] = pcm[: end - offset]
+
+        self.cursor = end
+        self.length = max(self.length, end)
+        return offset / (self.sample_rate * self.frame_size)
+
+    def duration(self):
+        """Durée (secondes) jusqu'à la fin du dernier clip"""
+        return self.length / (self.sample_rate * self.frame_size)
+
+    def pcm(self):
+        """Vue sans copie sur les octets utiles"""
+        return memoryview(self.buffer)[: self.length]
+
+    def close(self):
+        """Libère le tampon et supprime le fichier de support"""
+        if self._file:
+            self.buffer.close()
+            self._file.close()
+            os.remove(self.backing_file)
+            self._file = None
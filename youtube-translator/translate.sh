@@ -13,21 +13,6 @@ echo "   GOOGLE_APPLICATION_CREDENTIALS: $GOOGLE_APPLICATION_CREDENTIALS"
 echo "   GOOGLE_CLOUD_PROJECT: $GOOGLE_CLOUD_PROJECT"
 echo ""
 
-# Vérification rapide des APIs
-echo "🧪 Vérification rapide des APIs..."
-if ! uv run python -c "
-from google.cloud import speech, translate_v2, texttospeech
-speech.SpeechClient()
-translate_v2.Client()
-texttospeech.TextToSpeechClient()
-print('✅ APIs Google Cloud opérationnelles')
-"; then
-	echo "❌ Problème avec les APIs Google Cloud"
-	exit 1
-fi
-
-echo ""
-
 # Lancement du traducteur
 if [ $# -eq 0 ]; then
 	echo "Usage: $0 'https://youtu.be/VIDEO_ID'"
@@ -40,4 +25,5 @@ echo "🎵 Lancement de la traduction..."
 echo "   URL: $URL"
 echo ""
 
-uv run python translate_youtube.py "$URL"
+# Vérification préalable faite dans le même processus que la traduction
+exec uv run python main.py --engine simple "$@"
@@ -13,21 +13,6 @@ echo "   GOOGLE_APPLICATION_CREDENTIALS: $GOOGLE_APPLICATION_CREDENTIALS"
 echo "   GOOGLE_CLOUD_PROJECT: $GOOGLE_CLOUD_PROJECT"
 echo ""
 
-# Test des APIs
-echo "🧪 Test rapide des APIs..."
-if ! uv run python -c "
-from google.cloud import speech, translate_v2, texttospeech
-speech.SpeechClient()
-translate_v2.Client()
-texttospeech.TextToSpeechClient()
-print('✅ APIs opérationnelles')
-" 2>/dev/null; then
-	echo "❌ Problème avec les APIs Google Cloud"
-	exit 1
-fi
-
-echo ""
-
 # Lancement du traducteur complet
 if [ $# -eq 0 ]; then
 	echo "Usage: $0 'https://youtu.be/VIDEO_ID'"
@@ -48,4 +33,5 @@ echo "   URL: $URL"
 echo "   Sortie: MP3 avec voix distinctes (masculin/féminin)"
 echo ""
 
-uv run python translate_youtube_complete.py "$URL"
+# Vérification préalable faite dans le même processus que la traduction
+exec uv run python main.py --engine complete "$@"
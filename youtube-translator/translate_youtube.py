@@ -6,68 +6,110 @@ Utilise Google Cloud APIs avec voix premium Wavenet
 
 import os
 import sys
-import io
+from datetime import datetime
 from pathlib import Path
-from google.cloud import speech, translate_v2, texttospeech
-from pydub import AudioSegment
-import yt_dlp
 from config import Config
+from lazy import shared_client, speech, texttospeech, translate_v2, yt_dlp
+from preflight import preflight
+from limits import limit
+from governance import governed
+import metrics
+from metrics import api_call, timed_stage
+from batch import is_batch_source, run_batch
+from audio_utils import convert_to_wav
+from source_cache import get_source_cache
+from audio_stream import fetch_metadata, iter_url_words, transcribe_url
+from chunked_transcription import transcribe_chunked
+from streaming_transcription import transcribe_streaming
+from translation_batch import apply_translations
+from translation_memory import translate_with_memory, get_translation_memory
+from pipeline import stream_translated_segments, use_streaming_pipeline
+from timeline import PCMTimeline, decode_linear16, expected_duration
+from mixdown import encode_pcm
+from jobs import JobStore, resume_stage, run_stage, save_checkpoint, stage_inputs
+from jobs import video_id_from_url
+from workspace import Workspace
+from word_timeline import WordTimeline
+from segmentation import segment_turns
+from tts_pool import synthesize_stream, report_failures
+from tts_cache import cache_key, encoding_tag, get_or_synthesize, get_tts_cache
+from tts_cache import print_cache_stats
 
 
 def test_basic_connectivity():
-    """Test minimal de connexion aux APIs Google"""
-    try:
-        speech.SpeechClient()
-        translate_v2.Client()
-        texttospeech.TextToSpeechClient()
-        print("✅ Connexion Google Cloud APIs: OK")
-        return True
-    except Exception as e:
-        print(f"❌ Erreur de connexion: {e}")
-        print(
-            "Vérifiez vos variables d'environnement GOOGLE_APPLICATION_CREDENTIALS et GOOGLE_CLOUD_PROJECT"
-        )
-        return False
+    """Vérification préalable rapide (identifiants, yt-dlp, ffmpeg), sans client"""
+    return preflight()
 
 
-def download_audio(url):
-    """Télécharge l'audio YouTube avec métadonnées"""
+@timed_stage("download")
+def download_audio(url, output_base="temp_audio"):
+    """Télécharge l'audio YouTube avec métadonnées (ou le reprend du cache)"""
     ydl_opts = {
-        "format": "bestaudio/best",
-        "outtmpl": "temp_audio.%(ext)s",
+        "format": Config.DOWNLOAD_FORMAT,
+        "outtmpl": f"{output_base}.%(ext)s",
         "extract_flat": False,
         "writeinfojson": True,
         "writethumbnail": False,
         "quiet": True,
     }
 
+    video_id = video_id_from_url(url)
+    source_cache = get_source_cache()
+    cached = source_cache and source_cache.lookup(
+        video_id, Config.DOWNLOAD_FORMAT, output_base
+    )
+
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=True)
-            if not info:
-                raise Exception("Impossible d'extraire les informations de la vidéo")
-
-            audio_file = f"temp_audio.{info.get('ext', 'mp3')}"
-            metadata = {
-                "title": info.get("title", "Unknown Title"),
-                "uploader": info.get("uploader", "Unknown Uploader"),
-                "duration": info.get("duration", 0),
-                "description": info.get("description", "")[:200]
-                if info.get("description")
-                else "",
-            }
-            print(f"✅ Audio téléchargé: {audio_file}")
-            return audio_file, metadata
+        if cached:
+            audio_file, info = cached
+            print("♻️ Audio source repris du cache")
+        else:
+            with limit("download"), api_call("youtube", "download") as call:
+                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                    info = ydl.extract_info(url, download=True)
+                    if not info:
+                        raise Exception(
+                            "Impossible d'extraire les informations de la vidéo"
+                        )
+
+                audio_file = f"{output_base}.{info.get('ext', 'mp3')}"
+                call.received(Path(audio_file).stat().st_size)
+            if source_cache:
+                source_cache.store(video_id, Config.DOWNLOAD_FORMAT, audio_file, info)
+
+        metadata = {
+            "title": info.get("title", "Unknown Title"),
+            "uploader": info.get("uploader", "Unknown Uploader"),
+            "duration": info.get("duration") or 0,
+            "description": info.get("description", "")[:200]
+            if info.get("description")
+            else "",
+        }
+        print(f"✅ Audio téléchargé: {audio_file}")
+        return audio_file, metadata
     except Exception as e:
         print(f"❌ Erreur téléchargement: {e}")
         sys.exit(1)
 
 
-def transcribe_with_diarization(audio_file):
+@timed_stage("transcription")
+def transcribe_with_diarization(audio_file, wav_file="temp_audio_mono.wav"):
     """Transcrit avec séparation des locuteurs"""
-    client = speech.SpeechClient()
+    client = shared_client("speech", lambda: speech.SpeechClient())
 
     try:
+        if Config.TRANSCRIBE_MODE in ("chunked", "streaming"):
+            wav_file = convert_to_wav(audio_file, wav_file)
+            if wav_file.endswith(".wav"):
+                if Config.TRANSCRIBE_MODE == "streaming":
+                    segments = transcribe_streaming(wav_file, client)
+                else:
+                    segments = transcribe_chunked(wav_file, client)
+                print(
+                    f"✅ Transcription terminée: {len(segments)} mots, {len(set(segments.speakers))} locuteurs"
+                )
+                return segments
+
         with open(audio_file, "rb") as audio:
             content = audio.read()
 
@@ -88,22 +130,20 @@ def transcribe_with_diarization(audio_file):
         if not response or not hasattr(response, "results"):
             raise Exception("Réponse de transcription invalide")
 
-        segments = []
+        segments = WordTimeline()
         for result in response.results:
             if not result.alternatives:
                 continue
             for word in result.alternatives[0].words:
                 segments.append(
-                    {
-                        "word": word.word,
-                        "start_time": word.start_time.total_seconds(),
-                        "end_time": word.end_time.total_seconds(),
-                        "speaker": word.speaker_tag,
-                    }
+                    word.word,
+                    word.start_time.total_seconds(),
+                    word.end_time.total_seconds(),
+                    word.speaker_tag,
                 )
 
         print(
-            f"✅ Transcription terminée: {len(segments)} mots, {len(set(s['speaker'] for s in segments))} locuteurs"
+            f"✅ Transcription terminée: {len(segments)} mots, {len(set(segments.speakers))} locuteurs"
         )
         return segments
 
@@ -112,203 +152,290 @@ def transcribe_with_diarization(audio_file):
         sys.exit(1)
 
 
+@timed_stage("grouping")
 def group_segments_by_speaker(segments):
-    """Regroupe les mots par locuteur avec timings"""
-    grouped = []
-    current_speaker = None
-    current_words = []
-    current_start = 0
-
-    for segment in segments:
-        if segment["speaker"] != current_speaker:
-            if current_words:
-                grouped.append(
-                    {
-                        "speaker": current_speaker,
-                        "text": " ".join(current_words),
-                        "start_time": current_start,
-                        "end_time": segment["start_time"] - 0.1,
-                    }
-                )
-
-            current_speaker = segment["speaker"]
-            current_words = [segment["word"]]
-            current_start = segment["start_time"]
-        else:
-            current_words.append(segment["word"])
-
-    # Dernier segment
-    if current_words:
-        grouped.append(
-            {
-                "speaker": current_speaker,
-                "text": " ".join(current_words),
-                "start_time": current_start,
-                "end_time": segments[-1]["end_time"] if segments else current_start + 1,
-            }
-        )
+    """Regroupe les mots par locuteur avec timings
 
-    return grouped
+    `segments` : WordTimeline ou liste de dicts (points de reprise). Les tours
+    trop longs pour les API sont découpés aux fins de phrase.
+    """
+    return segment_turns(segments)
 
 
-def translate_segments(segments):
-    """Traduit chaque segment en français"""
-    client = translate_v2.Client()
-    translated = []
+@timed_stage("translation")
+def translate_segments(segments, language="fr"):
+    """Traduit chaque segment (français par défaut) ; texte sous `text_<langue>`"""
+    # Aucun client si la mémoire de traduction couvre tous les segments
+    client = shared_client("translate", lambda: translate_v2.Client())
 
     print("⏳ Traduction en cours...")
-    for segment in segments:
-        try:
-            result = client.translate(
-                segment["text"], source_language="en", target_language="fr"
-            )
-            translated.append({**segment, "text_fr": result["translatedText"]})
-        except Exception as e:
-            print(f"⚠️ Erreur traduction segment: {e}")
-            translated.append(
-                {
-                    **segment,
-                    "text_fr": segment["text"],  # Fallback
-                }
-            )
+    results = translate_with_memory(
+        client,
+        [segment["text"] for segment in segments],
+        "en",
+        language,
+        memory=get_translation_memory(),
+    )
+    translated = list(apply_translations(segments, results, key=f"text_{language}"))
 
     print(f"✅ Traduction terminée: {len(translated)} segments")
     return translated
 
 
-def generate_premium_tts(text, speaker_id):
-    """Génère audio TTS avec voix premium"""
-    client = texttospeech.TextToSpeechClient()
-
-    voice_name = Config.VOICES.get(speaker_id, Config.VOICES[1])
-
-    synthesis_input = texttospeech.SynthesisInput(text=text)
-    voice = texttospeech.VoiceSelectionParams(language_code="fr-FR", name=voice_name)
-    audio_config = texttospeech.AudioConfig(
-        audio_encoding=texttospeech.AudioEncoding.MP3, speaking_rate=1.0
-    )
+def generate_premium_tts(text, speaker_id, client=None, caches=None, language="fr"):
+    """Génère audio TTS avec voix premium (WAV LINEAR16 à TTS_SAMPLE_RATE)
 
-    response = client.synthesize_speech(
-        input=synthesis_input, voice=voice, audio_config=audio_config
-    )
+    `caches` : caches TTS consultés dans l'ordre (cache partagé par défaut).
+    `language` : langue cible (Config.LANGUAGES), pour le code et les voix.
+    """
+    client = client or shared_client("tts", lambda: texttospeech.TextToSpeechClient())
 
-    return response.audio_content
+    voices = Config.LANGUAGES[language]["voices"]
+    language_code = Config.LANGUAGES[language]["code"]
+    voice_name = voices.get(speaker_id, voices[1])
+    encoding = "LINEAR16"
 
+    def synthesize():
+        synthesis_input = texttospeech.SynthesisInput(text=text)
+        voice = texttospeech.VoiceSelectionParams(
+            language_code=language_code, name=voice_name
+        )
+        audio_config = texttospeech.AudioConfig(
+            audio_encoding=texttospeech.AudioEncoding[encoding],
+            speaking_rate=Config.SPEAKING_RATE,
+            sample_rate_hertz=Config.TTS_SAMPLE_RATE,
+        )
 
-def assemble_final_audio(translated_segments):
-    """Assemble l'audio final avec pauses préservées"""
-    final_audio = AudioSegment.empty()
-    current_time = 0
+        def send():
+            with api_call("tts", "synthesize_speech") as call:
+                call.sent(chars=len(synthesis_input.text))
+                response = client.synthesize_speech(
+                    input=synthesis_input, voice=voice, audio_config=audio_config
+                )
+                call.received(len(response.audio_content))
+            return response.audio_content
+
+        return governed("tts").call(send)
+
+    caches = caches if caches is not None else [get_tts_cache()]
+    key = cache_key(
+        text,
+        voice_name,
+        language_code,
+        Config.SPEAKING_RATE,
+        encoding_tag(encoding),
+    )
+    return get_or_synthesize(key, synthesize, caches)
+
+
+@timed_stage("tts_assembly")
+def assemble_final_audio(
+    translated_segments,
+    duration=0,
+    caches=None,
+    timeline_file="temp_timeline.pcm",
+    language="fr",
+):
+    """Assemble l'audio final avec pauses préservées
+
+    `translated_segments` peut être une liste ou un flux de segments traduits.
+    `duration` (secondes, estimation) dimensionne la timeline dès le départ.
+    Les clips LINEAR16 sont décodés en mémoire par les workers ; renvoie la
+    timeline PCM (à encoder une seule fois par `export_with_metadata`).
+    """
+    client = shared_client("tts", lambda: texttospeech.TextToSpeechClient())
+    total = (
+        len(translated_segments) if hasattr(translated_segments, "__len__") else "?"
+    )
 
-    print("⏳ Génération audio TTS...")
-    for i, segment in enumerate(translated_segments):
-        # Calculer le silence nécessaire
-        silence_duration = (segment["start_time"] - current_time) * 1000
-        if silence_duration > Config.MIN_SILENCE_MS:
-            silence = AudioSegment.silent(duration=silence_duration)
-            final_audio += silence
-
-        # Générer TTS
-        try:
-            tts_audio_data = generate_premium_tts(
-                segment["text_fr"], segment["speaker"]
+    def synthesize(i, segment):
+        return decode_linear16(
+            generate_premium_tts(
+                segment[f"text_{language}"], segment["speaker"], client, caches, language
             )
-            tts_segment = AudioSegment.from_mp3(io.BytesIO(tts_audio_data))
-            final_audio += tts_segment
-            current_time = segment["end_time"]
+        )
 
-            print(
-                f"  Segment {i + 1}/{len(translated_segments)}: Locuteur {segment['speaker']}"
-            )
+    duration = expected_duration(duration, translated_segments)
+    backing_file = (
+        timeline_file if duration > Config.TIMELINE_MMAP_MIN_SECONDS else None
+    )
+    timeline = PCMTimeline(
+        duration, sample_rate=Config.TTS_SAMPLE_RATE, backing_file=backing_file
+    )
+    results = []
 
-        except Exception as e:
-            print(f"⚠️ Erreur TTS segment {i + 1}: {e}")
+    print("⏳ Génération audio TTS...")
+    for result in synthesize_stream(translated_segments, synthesize):
+        results.append(result)
+        if result["error"] is not None:
             continue
+        segment = result["segment"]
+        timeline.place(segment["start_time"], result["output"])
+        print(f"  Segment {result['index'] + 1}/{total}: Locuteur {segment['speaker']}")
 
+    report_failures(results)
+    print_cache_stats(get_tts_cache())
     print("✅ Audio assemblé")
-    return final_audio
+    return timeline
 
 
-def export_with_metadata(audio, metadata, output_name=None):
-    """Exporte le MP3 final avec métadonnées"""
+@timed_stage("export")
+def export_with_metadata(timeline, metadata, output_name=None, language="fr"):
+    """Encode la timeline PCM en MP3 final avec métadonnées, puis la libère"""
     if not output_name:
         safe_title = metadata["title"].replace("/", "_").replace("\\", "_")
-        output_name = f"{safe_title}_traduit.mp3"
+        suffix = "" if language == "fr" else f"_{language}"
+        output_name = f"{safe_title}_traduit{suffix}.mp3"
 
     # Tags ID3
     tags = {
-        "title": f"{metadata['title']} (Traduit FR)",
+        "title": f"{metadata['title']} (Traduit {language.upper()})",
         "artist": metadata["uploader"],
         "album": "Traduction automatique YouTube",
-        "comment": f"Traduit automatiquement anglais→français. Durée originale: {metadata['duration']}s. Voix premium Google Wavenet.",
+        "comment": f"Traduit automatiquement anglais→{Config.LANGUAGES[language]['name']}. Durée originale: {metadata['duration']}s. Voix premium Google Wavenet.",
         "genre": "Speech",
         "year": "2025",
     }
 
-    audio.export(output_name, format="mp3", tags=tags)
+    arguments = [arg for k, v in tags.items() for arg in ("-metadata", f"{k}={v}")]
+    try:
+        if not encode_pcm(timeline, output_name, arguments):
+            raise Exception("Échec de l'encodage MP3")
+    finally:
+        timeline.close()
     print(f"✅ Fichier créé: {output_name}")
     return output_name
 
 
-def cleanup_temp_files():
-    """Nettoie les fichiers temporaires"""
-    for file in Path(".").glob("temp_audio.*"):
-        file.unlink(missing_ok=True)
-    for file in Path(".").glob("*.json"):
-        if "info" in file.name:
-            file.unlink(missing_ok=True)
+def cleanup_temp_files(workspace):
+    """Nettoie les fichiers temporaires du job (et seulement eux)"""
+    workspace.cleanup()
 
 
-def main(url):
-    """Fonction principale"""
+def main(url, preflight=True):
+    """Fonction principale, renvoie le chemin du fichier produit"""
     print("🎵 Traducteur YouTube: Anglais → Français")
     print("=" * 50)
 
     # Test de connexion
-    if not test_basic_connectivity():
+    if preflight and not test_basic_connectivity():
         sys.exit(1)
 
+    job = JobStore.for_url(url) if Config.JOBS_ENABLED else None
+    job_metrics = metrics.start_job(
+        f"{video_id_from_url(url)}_{datetime.now():%Y%m%d_%H%M%S}"
+    )
+    workspace = Workspace(video_id_from_url(url))
+    wav_path = workspace.path("audio_mono.wav")
+
     try:
-        # Téléchargement
-        audio_file, metadata = download_audio(url)
+        # Téléchargement (en mode flux, seulement les métadonnées : l'audio
+        # est lu directement par la transcription, sans fichier)
+        streamed = Config.DOWNLOAD_MODE == "stream"
+        if streamed:
+            audio_file, metadata = run_stage(
+                job, "download", [url, "stream"], lambda: (None, fetch_metadata(url))
+            )
+        else:
+            # L'audio source est conservé avec les points de reprise
+            output_base = str(job.dir / "source") if job else workspace.path("source")
+            audio_file, metadata = run_stage(
+                job,
+                "download",
+                [url, Config.DOWNLOAD_FORMAT],
+                lambda: download_audio(url, output_base),
+                valid=lambda data: Path(data[0]).exists(),
+            )
 
-        # Transcription
-        segments = transcribe_with_diarization(audio_file)
+        words_done = translated_done = False
+        if job:
+            keys = stage_inputs(job)
+            words_done = job.has("words", keys["words"])
+            translated_done = job.has("translated", keys["translated"])
 
-        # Regroupement
-        grouped_segments = group_segments_by_speaker(segments)
+        # Le flux n'a d'intérêt que si la transcription reste à faire
+        streaming = use_streaming_pipeline(streamed) and not (
+            words_done or translated_done
+        )
+        wav_file = audio_file
+        if streaming and not streamed:
+            wav_file = convert_to_wav(audio_file, wav_path)
+
+        if streaming and (streamed or wav_file.endswith(".wav")):
+            # Transcription, regroupement et traduction en flux
+            speech_client = shared_client("speech", lambda: speech.SpeechClient())
+            translated_segments = stream_translated_segments(
+                wav_file,
+                speech_client,
+                shared_client("translate", lambda: translate_v2.Client()),
+                group_segments_by_speaker,
+                save_checkpoint(job),
+                chunk_words=iter_url_words(url, speech_client) if streamed else None,
+            )
+        else:
+            # Étapes avec les clés de stage_inputs ; une étape reprise
+            # n'exécute (ni ne relit) les précédentes
+            def grouped_segments():
+                segments = resume_stage(
+                    job,
+                    "words",
+                    lambda: (
+                        transcribe_url(url)
+                        if streamed
+                        else transcribe_with_diarization(audio_file, wav_path)
+                    ),
+                )
+                grouped = resume_stage(
+                    job, "grouped", lambda: group_segments_by_speaker(segments)
+                )
+                metrics.inc("segments_total", len(grouped), kind="grouped")
+                return grouped
 
-        # Traduction
-        translated_segments = translate_segments(grouped_segments)
+            translated_segments = resume_stage(
+                job, "translated", lambda: translate_segments(grouped_segments())
+            )
 
         # Génération audio
-        final_audio = assemble_final_audio(translated_segments)
+        caches = [job.tts_cache(), get_tts_cache()] if job else None
+        final_audio = assemble_final_audio(
+            translated_segments,
+            metadata["duration"],
+            caches,
+            workspace.path("timeline.pcm"),
+        )
 
         # Export final
         output_file = export_with_metadata(final_audio, metadata)
 
-        # Nettoyage
-        cleanup_temp_files()
-
         print(f"🎉 Traduction terminée avec succès!")
         print(f"📁 Fichier: {output_file}")
+        return output_file
 
     except KeyboardInterrupt:
         print("\n⏹️ Interrompu par l'utilisateur")
-        cleanup_temp_files()
         sys.exit(1)
     except Exception as e:
         print(f"❌ Erreur inattendue: {e}")
-        cleanup_temp_files()
+        if job:
+            print(f"♻️ Étapes conservées dans {job.dir}, relancez pour reprendre")
         sys.exit(1)
+    finally:
+        # Aussi après sys.exit (échec du téléchargement ou de la transcription)
+        cleanup_temp_files(workspace)
+        metrics.write_reports(job_metrics)
 
 
 if __name__ == "__main__":
-    import io  # Pour BytesIO dans TTS
-
-    if len(sys.argv) != 2:
+    if len(sys.argv) < 2:
         print("Usage: uv run python translate_youtube.py 'https://youtu.be/VIDEO_ID'")
+        print("       uv run python translate_youtube.py PLAYLIST_URL | urls.txt ...")
         sys.exit(1)
 
+    if len(sys.argv) > 2 or is_batch_source(sys.argv[1]):
+        if not test_basic_connectivity():
+            sys.exit(1)
+        summary = run_batch(sys.argv[1:], main)
+        sys.exit(0 if summary["failed"] == 0 else 1)
+
     url = sys.argv[1]
     main(url)
@@ -9,96 +9,108 @@ import sys
 import io
 import subprocess
 import tempfile
+from datetime import datetime
 from pathlib import Path
-from google.cloud import speech, translate_v2, texttospeech
-import yt_dlp
+from config import Config
+from lazy import shared_client, speech, texttospeech, translate_v2, yt_dlp
+from preflight import preflight
+from limits import limit
+from governance import governed
+import metrics
+from metrics import api_call, timed_stage
+from batch import is_batch_source, run_batch
+from audio_utils import convert_to_wav
+from source_cache import get_source_cache
+from audio_stream import fetch_metadata, iter_url_words, transcribe_url
+from chunked_transcription import transcribe_chunked
+from streaming_transcription import transcribe_streaming
+from translation_batch import apply_translations
+from translation_memory import translate_with_memory, get_translation_memory
+from pipeline import stream_translated_segments, use_streaming_pipeline
+from tts_pool import synthesize_stream, report_failures
+from tts_cache import cache_key, encoding_tag, get_or_synthesize, get_tts_cache
+from tts_cache import print_cache_stats
+from mixdown import mixdown, mixdown_timeline, metadata_args
+from timeline import PCMTimeline, decode_linear16, expected_duration
+from jobs import JobStore, resume_stage, run_stage, save_checkpoint, stage_inputs
+from jobs import video_id_from_url
+from workspace import Workspace
+from segmentation import segment_turns
 
 
 def test_basic_connectivity():
-    """Test de connexion aux APIs Google"""
-    try:
-        speech.SpeechClient()
-        translate_v2.Client()
-        texttospeech.TextToSpeechClient()
-        print("✅ Connexion Google Cloud APIs: OK")
-        return True
-    except Exception as e:
-        print(f"❌ Erreur de connexion: {e}")
-        return False
+    """Vérification préalable rapide (identifiants, yt-dlp, ffmpeg), sans client"""
+    return preflight()
 
 
-def download_audio(url):
-    """Télécharge l'audio YouTube"""
+@timed_stage("download")
+def download_audio(url, output_base="temp_audio"):
+    """Télécharge l'audio YouTube (ou le reprend du cache)"""
     ydl_opts = {
-        "format": "bestaudio/best",
-        "outtmpl": "temp_audio.%(ext)s",
+        "format": Config.DOWNLOAD_FORMAT,
+        "outtmpl": f"{output_base}.%(ext)s",
         "extract_flat": False,
         "writeinfojson": True,
         "quiet": True,
     }
 
+    video_id = video_id_from_url(url)
+    source_cache = get_source_cache()
+    cached = source_cache and source_cache.lookup(
+        video_id, Config.DOWNLOAD_FORMAT, output_base
+    )
+
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=True)
-            if not info:
-                raise Exception("Impossible d'extraire les informations de la vidéo")
-
-            ext = info.get("ext", "mp3")
-            audio_file = f"temp_audio.{ext}"
-            metadata = {
-                "title": info.get("title", "Unknown Title"),
-                "uploader": info.get("uploader", "Unknown Uploader"),
-                "duration": info.get("duration", 0),
-            }
-            print(f"✅ Audio téléchargé: {metadata['title']}")
-            return audio_file, metadata
+        if cached:
+            audio_file, info = cached
+            print("♻️ Audio source repris du cache")
+        else:
+            with limit("download"), api_call("youtube", "download") as call:
+                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                    info = ydl.extract_info(url, download=True)
+                    if not info:
+                        raise Exception(
+                            "Impossible d'extraire les informations de la vidéo"
+                        )
+
+                ext = info.get("ext", "mp3")
+                audio_file = f"{output_base}.{ext}"
+                call.received(Path(audio_file).stat().st_size)
+            if source_cache:
+                source_cache.store(video_id, Config.DOWNLOAD_FORMAT, audio_file, info)
+
+        metadata = {
+            "title": info.get("title", "Unknown Title"),
+            "uploader": info.get("uploader", "Unknown Uploader"),
+            "duration": info.get("duration") or 0,
+        }
+        print(f"✅ Audio téléchargé: {metadata['title']}")
+        return audio_file, metadata
     except Exception as e:
         print(f"❌ Erreur téléchargement: {e}")
         sys.exit(1)
 
 
-def convert_to_wav(input_file):
-    """Convertit l'audio en WAV mono pour Google Speech-to-Text"""
-    output_file = "temp_audio_mono.wav"
-
-    try:
-        # Convertir en WAV mono 16kHz (format requis par Google)
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-i",
-            input_file,
-            "-ac",
-            "1",  # Mono
-            "-ar",
-            "16000",  # 16kHz
-            "-acodec",
-            "pcm_s16le",  # WAV format
-            output_file,
-        ]
-
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"⚠️ Erreur ffmpeg: {result.stderr}")
-            # Si ffmpeg échoue, essayer de continuer avec le fichier original
-            return input_file
-
-        print("✅ Conversion audio: WAV mono 16kHz")
-        return output_file
-
-    except FileNotFoundError:
-        print("⚠️ ffmpeg non trouvé, utilisation du fichier original")
-        return input_file
-
-
+@timed_stage("transcription")
 def transcribe_with_diarization(audio_file):
-    """Transcrit avec séparation des locuteurs (version simplifiée pour test)"""
-    client = speech.SpeechClient()
+    """Transcrit avec séparation des locuteurs (par morceaux ou en flux si WAV disponible)"""
+    client = shared_client("speech", lambda: speech.SpeechClient())
 
     try:
-        # Pour l'instant, transcription basique (limite Google Cloud)
-        # TODO: Implémenter GCS pour fichiers longs + diarization
+        mode = Config.TRANSCRIBE_MODE
+        if mode in ("chunked", "streaming") and audio_file.endswith(".wav"):
+            if mode == "streaming":
+                segments = transcribe_streaming(audio_file, client)
+            else:
+                segments = transcribe_chunked(audio_file, client)
+            if not segments:
+                raise Exception("Aucune transcription obtenue")
+            print(
+                f"✅ Transcription terminée: {len(segments)} mots, {len(set(segments.speakers))} locuteurs"
+            )
+            return segments
 
+        # Mode inline : transcription basique limitée à 60 secondes
         with open(audio_file, "rb") as audio:
             content = audio.read()
 
@@ -141,117 +153,156 @@ def transcribe_with_diarization(audio_file):
         sys.exit(1)
 
 
+@timed_stage("grouping")
 def group_segments_by_speaker(segments):
-    """Regroupe les mots par locuteur avec timings"""
-    grouped = []
-    current_speaker = None
-    current_words = []
-    current_start = 0
-
-    for segment in segments:
-        if segment["speaker"] != current_speaker:
-            if current_words:
-                grouped.append(
-                    {
-                        "speaker": current_speaker,
-                        "text": " ".join(current_words),
-                        "start_time": current_start,
-                        "end_time": segment["start_time"] - 0.1,
-                    }
-                )
+    """Regroupe les mots par locuteur avec timings
 
-            current_speaker = segment["speaker"]
-            current_words = [segment["word"]]
-            current_start = segment["start_time"]
-        else:
-            current_words.append(segment["word"])
-
-    # Dernier segment
-    if current_words:
-        grouped.append(
-            {
-                "speaker": current_speaker,
-                "text": " ".join(current_words),
-                "start_time": current_start,
-                "end_time": segments[-1]["end_time"] if segments else current_start + 1,
-            }
-        )
-
-    return grouped
+    `segments` : WordTimeline ou liste de dicts (points de reprise). Les tours
+    trop longs pour les API sont découpés aux fins de phrase.
+    """
+    return segment_turns(segments)
 
 
+@timed_stage("translation")
 def translate_segments(segments):
     """Traduit chaque segment en français"""
-    client = translate_v2.Client()
-    translated = []
+    # Aucun client si la mémoire de traduction couvre tous les segments
+    client = shared_client("translate", lambda: translate_v2.Client())
 
     print("⏳ Traduction en cours...")
-    for segment in segments:
-        try:
-            result = client.translate(
-                segment["text"], source_language="en", target_language="fr"
-            )
-            translated.append({**segment, "text_fr": result["translatedText"]})
-        except Exception as e:
-            print(f"⚠️ Erreur traduction segment: {e}")
-            translated.append(
-                {
-                    **segment,
-                    "text_fr": segment["text"],  # Fallback
-                }
-            )
+    results = translate_with_memory(
+        client,
+        [segment["text"] for segment in segments],
+        memory=get_translation_memory(),
+    )
+    translated = list(apply_translations(segments, results))
 
     print(f"✅ Traduction terminée: {len(translated)} segments")
     return translated
 
 
-def generate_tts_audio(segments, output_dir="temp_tts_segments"):
-    """Génère les fichiers TTS pour chaque segment"""
-    Path(output_dir).mkdir(exist_ok=True)
+def synthesize_segment(segment, client=None, caches=None):
+    """Synthétise un segment traduit (octets) : WAV LINEAR16 en mode d'assemblage
+    « pcm », MP3 sinon
 
-    print("⏳ Génération audio TTS...")
-    tts_files = []
+    `caches` : caches TTS consultés dans l'ordre (cache partagé par défaut).
+    """
+    client = client or shared_client("tts", lambda: texttospeech.TextToSpeechClient())
 
-    for i, segment in enumerate(segments):
-        try:
-            client = texttospeech.TextToSpeechClient()
+    voice_name = Config.VOICES.get(segment["speaker"], Config.VOICES[1])
+    encoding = "LINEAR16" if Config.ASSEMBLY_MODE == "pcm" else "MP3"
 
-            voice_name = (
-                "fr-FR-Wavenet-A" if segment["speaker"] == 1 else "fr-FR-Wavenet-E"
-            )
+    def synthesize():
+        synthesis_input = texttospeech.SynthesisInput(text=segment["text_fr"])
+        voice = texttospeech.VoiceSelectionParams(
+            language_code="fr-FR", name=voice_name
+        )
+        audio_config = texttospeech.AudioConfig(
+            audio_encoding=texttospeech.AudioEncoding[encoding],
+            speaking_rate=Config.SPEAKING_RATE,
+            sample_rate_hertz=Config.TTS_SAMPLE_RATE,
+        )
 
-            synthesis_input = texttospeech.SynthesisInput(text=segment["text_fr"])
-            voice = texttospeech.VoiceSelectionParams(
-                language_code="fr-FR", name=voice_name
-            )
-            audio_config = texttospeech.AudioConfig(
-                audio_encoding=texttospeech.AudioEncoding.MP3
-            )
+        def send():
+            with api_call("tts", "synthesize_speech") as call:
+                call.sent(chars=len(synthesis_input.text))
+                response = client.synthesize_speech(
+                    input=synthesis_input, voice=voice, audio_config=audio_config
+                )
+                call.received(len(response.audio_content))
+            return response.audio_content
 
-            response = client.synthesize_speech(
-                input=synthesis_input, voice=voice, audio_config=audio_config
+        return governed("tts").call(send)
+
+    caches = caches if caches is not None else [get_tts_cache()]
+    key = cache_key(
+        segment["text_fr"],
+        voice_name,
+        "fr-FR",
+        Config.SPEAKING_RATE,
+        encoding_tag(encoding),
+    )
+    return get_or_synthesize(key, synthesize, caches)
+
+
+@timed_stage("tts")
+def generate_tts_audio(segments, output_dir="temp_tts_segments", caches=None):
+    """Génère les fichiers TTS pour chaque segment
+
+    `segments` peut être une liste ou un flux de segments traduits.
+    """
+    Path(output_dir).mkdir(exist_ok=True)
+
+    print("⏳ Génération audio TTS...")
+    client = shared_client("tts", lambda: texttospeech.TextToSpeechClient())
+    total = len(segments) if hasattr(segments, "__len__") else "?"
+
+    def synthesize(i, segment):
+        audio_content = synthesize_segment(segment, client, caches)
+        tts_file = f"{output_dir}/segment_{i:03d}_speaker_{segment['speaker']}.mp3"
+        with open(tts_file, "wb") as f:
+            f.write(audio_content)
+        return tts_file
+
+    results = []
+    for result in synthesize_stream(segments, synthesize):
+        results.append(result)
+        if result["error"] is None:
+            print(
+                f"  Segment {result['index'] + 1}/{total}: Locuteur {result['segment']['speaker']}"
             )
+    report_failures(results)
+    print_cache_stats(get_tts_cache())
+
+    tts_files = [
+        (r["output"], r["segment"]["start_time"]) for r in results if r["error"] is None
+    ]
+
+    print("✅ Audio TTS généré")
+    return tts_files, [r["segment"] for r in results]
 
-            tts_file = f"{output_dir}/segment_{i:03d}_speaker_{segment['speaker']}.mp3"
-            with open(tts_file, "wb") as f:
-                f.write(response.audio_content)
 
-            tts_files.append((tts_file, segment["start_time"]))
-            print(f"  Segment {i + 1}/{len(segments)}: Locuteur {segment['speaker']}")
+@timed_stage("tts")
+def synthesize_to_timeline(segments, duration=0, caches=None, timeline_file=None):
+    """Synthétise les segments en PCM et les place sur la timeline à leur arrivée
 
-        except Exception as e:
-            print(f"⚠️ Erreur TTS segment {i + 1}: {e}")
-            continue
+    Ni fichier par segment ni décodage par ffmpeg : les clips LINEAR16 sont lus
+    en mémoire, le MP3 final est encodé une seule fois (`mixdown_timeline`).
+    Renvoie (timeline, segments synthétisés ou non).
+    """
+    print("⏳ Génération audio TTS...")
+    client = shared_client("tts", lambda: texttospeech.TextToSpeechClient())
+    total = len(segments) if hasattr(segments, "__len__") else "?"
+
+    def synthesize(i, segment):
+        return decode_linear16(synthesize_segment(segment, client, caches))
+
+    duration = expected_duration(duration, segments)
+    backing_file = (
+        timeline_file if duration > Config.TIMELINE_MMAP_MIN_SECONDS else None
+    )
+    timeline = PCMTimeline(
+        duration, sample_rate=Config.TTS_SAMPLE_RATE, backing_file=backing_file
+    )
+    results = []
+    for result in synthesize_stream(segments, synthesize):
+        results.append(result)
+        if result["error"] is None:
+            segment = result["segment"]
+            timeline.place(segment["start_time"], result["output"])
+            print(f"  Segment {result['index'] + 1}/{total}: Locuteur {segment['speaker']}")
+    report_failures(results)
+    print_cache_stats(get_tts_cache())
 
     print("✅ Audio TTS généré")
-    return tts_files
+    return timeline, [r["segment"] for r in results]
 
 
-def concatenate_audio_files(tts_files, output_file):
+@timed_stage("assembly")
+def concatenate_audio_files(tts_files, output_file, concat_file="temp_concat.txt"):
     """Concatène les fichiers audio avec ffmpeg"""
     try:
         # Créer une liste de fichiers pour ffmpeg
-        concat_file = "temp_concat.txt"
         with open(concat_file, "w") as f:
             for tts_file, _ in tts_files:
                 f.write(f"file '{tts_file}'\n")
@@ -271,7 +322,8 @@ def concatenate_audio_files(tts_files, output_file):
             output_file,
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        with limit("ffmpeg"), api_call("ffmpeg", "concat"):
+            result = subprocess.run(cmd, capture_output=True, text=True)
         if result.returncode != 0:
             print(f"⚠️ Erreur ffmpeg concat: {result.stderr}")
             return False
@@ -286,34 +338,24 @@ def concatenate_audio_files(tts_files, output_file):
         return False
 
 
+@timed_stage("metadata")
 def add_metadata_to_mp3(input_file, output_file, metadata):
     """Ajoute les métadonnées ID3 au fichier MP3"""
     try:
         # Utiliser ffmpeg pour ajouter les métadonnées
-        title = metadata["title"].replace("'", "\\'")[:100]
-        artist = metadata["uploader"].replace("'", "\\'")[:100]
-
         cmd = [
             "ffmpeg",
             "-y",
             "-i",
             input_file,
-            "-metadata",
-            f"title={title} (Traduit)",
-            "-metadata",
-            f"artist={artist}",
-            "-metadata",
-            "album=Traduction automatique YouTube",
-            "-metadata",
-            f"comment=Traduit automatiquement anglais→français. Durée originale: {metadata['duration']}s. Voix premium Google Wavenet.",
-            "-metadata",
-            "genre=Speech",
+            *metadata_args(metadata),
             "-codec",
             "copy",
             output_file,
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        with limit("ffmpeg"), api_call("ffmpeg", "metadata"):
+            result = subprocess.run(cmd, capture_output=True, text=True)
         if result.returncode != 0:
             print(f"⚠️ Erreur métadonnées: {result.stderr}")
             # Copier quand même le fichier
@@ -331,101 +373,170 @@ def add_metadata_to_mp3(input_file, output_file, metadata):
         shutil.copy(input_file, output_file)
 
 
-def cleanup_temp_files():
-    """Nettoie les fichiers temporaires"""
-    temp_files = [
-        "temp_audio.mp3",
-        "temp_audio.m4a",
-        "temp_audio.webm",
-        "temp_audio.wav",
-        "temp_audio_mono.wav",
-        "temp_concat.txt",
-    ]
-
-    # Supprimer les fichiers individuels
-    for file in temp_files:
-        if os.path.exists(file):
-            os.remove(file)
-
-    # Supprimer le répertoire TTS
-    import shutil
-
-    if os.path.exists("temp_tts_segments"):
-        shutil.rmtree("temp_tts_segments")
-
-    # Supprimer les fichiers JSON de yt-dlp
-    for file in Path(".").glob("*.json"):
-        if "info" in file.name or "temp_audio" in file.name:
-            file.unlink(missing_ok=True)
-
+def cleanup_temp_files(workspace):
+    """Nettoie les fichiers temporaires du job (et seulement eux)"""
+    workspace.cleanup()
     print("🧹 Nettoyage terminé")
 
 
-def main(url):
-    """Fonction principale"""
+def main(url, preflight=True):
+    """Fonction principale, renvoie le chemin du fichier produit"""
     print("🎵 Traducteur YouTube Complet avec ffmpeg")
     print("=" * 50)
 
     # Test de connexion
-    if not test_basic_connectivity():
+    if preflight and not test_basic_connectivity():
         return
 
+    job = JobStore.for_url(url) if Config.JOBS_ENABLED else None
+    job_metrics = metrics.start_job(
+        f"{video_id_from_url(url)}_{datetime.now():%Y%m%d_%H%M%S}"
+    )
+    workspace = Workspace(video_id_from_url(url))
+    wav_path = workspace.path("audio_mono.wav")
+    tts_dir = workspace.path("tts_segments")
+
     try:
-        # Téléchargement
-        audio_file, metadata = download_audio(url)
+        # Téléchargement (en mode flux, seulement les métadonnées : l'audio
+        # est lu directement par la transcription, sans fichier)
+        streamed = Config.DOWNLOAD_MODE == "stream"
+        if streamed:
+            audio_file, metadata = run_stage(
+                job, "download", [url, "stream"], lambda: (None, fetch_metadata(url))
+            )
+        else:
+            # L'audio source est conservé avec les points de reprise
+            output_base = str(job.dir / "source") if job else workspace.path("source")
+            audio_file, metadata = run_stage(
+                job,
+                "download",
+                [url, Config.DOWNLOAD_FORMAT],
+                lambda: download_audio(url, output_base),
+                valid=lambda data: Path(data[0]).exists(),
+            )
 
-        # Conversion pour Google
-        wav_file = convert_to_wav(audio_file)
+        words_done = translated_done = False
+        if job:
+            keys = stage_inputs(job)
+            words_done = job.has("words", keys["words"])
+            translated_done = job.has("translated", keys["translated"])
 
-        # Transcription
-        segments = transcribe_with_diarization(wav_file)
+        # Conversion pour Google
+        wav_file = audio_file
+        if not (streamed or words_done or translated_done):
+            wav_file = convert_to_wav(audio_file, wav_path)
 
-        # Regroupement
-        grouped_segments = group_segments_by_speaker(segments)
+        # Le flux n'a d'intérêt que si la transcription reste à faire
+        streaming = use_streaming_pipeline(streamed) and not (
+            words_done or translated_done
+        )
+        if streaming and (streamed or wav_file.endswith(".wav")):
+            # Transcription, regroupement et traduction en flux
+            speech_client = shared_client("speech", lambda: speech.SpeechClient())
+            translated_segments = stream_translated_segments(
+                wav_file,
+                speech_client,
+                shared_client("translate", lambda: translate_v2.Client()),
+                group_segments_by_speaker,
+                save_checkpoint(job),
+                chunk_words=iter_url_words(url, speech_client) if streamed else None,
+            )
+        else:
+            # Étapes avec les clés de stage_inputs ; une étape reprise
+            # n'exécute (ni ne relit) les précédentes
+            def grouped_segments():
+                segments = resume_stage(
+                    job,
+                    "words",
+                    lambda: (
+                        transcribe_url(url)
+                        if streamed
+                        else transcribe_with_diarization(wav_file)
+                    ),
+                )
+                grouped = resume_stage(
+                    job, "grouped", lambda: group_segments_by_speaker(segments)
+                )
+                metrics.inc("segments_total", len(grouped), kind="grouped")
+                return grouped
 
-        # Traduction
-        translated_segments = translate_segments(grouped_segments)
+            translated_segments = resume_stage(
+                job, "translated", lambda: translate_segments(grouped_segments())
+            )
 
         # Génération TTS
-        tts_files = generate_tts_audio(translated_segments)
+        caches = [job.tts_cache(), get_tts_cache()] if job else None
+        if Config.ASSEMBLY_MODE == "pcm":
+            timeline, translated_segments = synthesize_to_timeline(
+                translated_segments,
+                metadata["duration"],
+                caches,
+                workspace.path("timeline.pcm"),
+            )
+        else:
+            tts_files, translated_segments = generate_tts_audio(
+                translated_segments, tts_dir, caches
+            )
 
         # Assemblage final
-        temp_output = "temp_final.mp3"
-        if concatenate_audio_files(tts_files, temp_output):
+        safe_title = metadata["title"].replace("/", "_").replace("\\", "_")
+        final_output = f"output/{safe_title}_traduit.mp3"
+        temp_output = workspace.path("final.mp3")
+
+        if Config.ASSEMBLY_MODE == "pcm":
+            # Clips PCM en mémoire, un seul encodage MP3
+            assembled = mixdown_timeline(timeline, final_output, metadata)
+        elif Config.ASSEMBLY_MODE == "mixdown":
+            # Clips placés à leur horodatage, métadonnées incluses, un seul encodage
+            assembled = mixdown(tts_files, final_output, metadata, tts_dir)
+        elif concatenate_audio_files(
+            tts_files, temp_output, workspace.path("concat.txt")
+        ):
             # Métadonnées
-            safe_title = metadata["title"].replace("/", "_").replace("\\", "_")
-            final_output = f"output/{safe_title}_traduit.mp3"
             add_metadata_to_mp3(temp_output, final_output, metadata)
+            assembled = True
+        else:
+            assembled = False
 
-            # Nettoyage
-            cleanup_temp_files()
-            if os.path.exists(temp_output):
-                os.remove(temp_output)
-
+        if assembled:
             print(f"🎉 Traduction terminée avec succès!")
             print(f"📁 Fichier: {final_output}")
             print(
                 f"📊 Stats: {len(translated_segments)} segments, {len(set(s['speaker'] for s in translated_segments))} locuteurs"
             )
+            return final_output
         else:
             print("❌ Échec de l'assemblage audio")
 
     except KeyboardInterrupt:
         print("\n⏹️ Interrompu par l'utilisateur")
-        cleanup_temp_files()
         sys.exit(1)
     except Exception as e:
         print(f"❌ Erreur inattendue: {e}")
-        cleanup_temp_files()
+        if job:
+            print(f"♻️ Étapes conservées dans {job.dir}, relancez pour reprendre")
         sys.exit(1)
+    finally:
+        # Aussi après sys.exit (échec du téléchargement ou de la transcription)
+        cleanup_temp_files(workspace)
+        metrics.write_reports(job_metrics)
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
+    if len(sys.argv) < 2:
         print(
             "Usage: uv run python translate_youtube_complete.py 'https://youtu.be/VIDEO_ID'"
         )
+        print(
+            "       uv run python translate_youtube_complete.py PLAYLIST_URL | urls.txt ..."
+        )
         sys.exit(1)
 
+    if len(sys.argv) > 2 or is_batch_source(sys.argv[1]):
+        if not test_basic_connectivity():
+            sys.exit(1)
+        summary = run_batch(sys.argv[1:], main)
+        sys.exit(0 if summary["failed"] == 0 else 1)
+
     url = sys.argv[1]
     main(url)
@@ -0,0 +1,117 @@
+"""
+Traduction par lots : plusieurs segments par requête Translation API
+Respecte les limites par requête (nombre de chaînes et de caractères)
+"""
+
+import html
+
+from config import Config
+from governance import governed
+from metrics import api_call, drop, retry
+from segmentation import fit_tts_limit
+
+
+def pack_batches(texts, max_strings=None, max_chars=None):
+    """Regroupe les indices de `texts` en lots respectant les limites
+
+    Un texte plus long que `max_chars` part seul dans son lot.
+    """
+    max_strings = max_strings or Config.TRANSLATE_MAX_STRINGS
+    max_chars = max_chars or Config.TRANSLATE_MAX_CHARS
+
+    batches = []
+    current, current_chars = [], 0
+    for i, text in enumerate(texts):
+        size = len(text)
+        if current and (
+            len(current) >= max_strings or current_chars + size > max_chars
+        ):
+            batches.append(current)
+            current, current_chars = [], 0
+        current.append(i)
+        current_chars += size
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def translated_text(item):
+    """Texte d'un résultat Translation v2, entités HTML décodées
+
+    Le format par défaut de v2 est html (`&#39;`, `&amp;`...) ; la mémoire de
+    traduction et la synthèse reçoivent du texte brut, comme avec v3.
+    """
+    return html.unescape(item["translatedText"])
+
+
+def translate_texts(client, texts, source_language="en", target_language="fr"):
+    """Traduit une liste de textes en un minimum d'appels
+
+    Renvoie une liste alignée sur `texts` de (traduction, erreur). Si un lot échoue,
+    seuls ses éléments sont retentés un par un.
+    """
+    results = [(None, None)] * len(texts)
+    batches = pack_batches(texts)
+
+    for batch in batches:
+        values = [texts[i] for i in batch]
+        try:
+            response = governed("translate").call(
+                _send, client, values, source_language, target_language
+            )
+            for i, item in zip(batch, response):
+                results[i] = (translated_text(item), None)
+            if len(response) != len(batch):
+                raise Exception(
+                    f"réponse incomplète ({len(response)}/{len(batch)} éléments)"
+                )
+        except Exception as e:
+            print(f"⚠️ Erreur traduction lot de {len(batch)} segments: {e}")
+            for i in batch:
+                if results[i][0] is None:
+                    retry("translate")
+                    results[i] = _translate_one(
+                        client, texts[i], source_language, target_language
+                    )
+
+    print(f"   {len(texts)} segments traduits en {len(batches)} requêtes")
+    return results
+
+
+def _send(client, values, source_language, target_language):
+    """Une requête Translation API (une chaîne ou une liste)"""
+    with api_call("translate", "translate") as call:
+        if isinstance(values, str):
+            call.sent(chars=len(values))
+        else:
+            call.sent(chars=sum(len(v) for v in values))
+        return client.translate(
+            values, source_language=source_language, target_language=target_language
+        )
+
+
+def _translate_one(client, text, source_language, target_language):
+    try:
+        result = governed("translate").call(
+            _send, client, text, source_language, target_language
+        )
+        return translated_text(result), None
+    except Exception as e:
+        return None, e
+
+
+def apply_translations(segments, results, first_index=0, key="text_fr"):
+    """Générateur : segments avec leur traduction (clé `key`, `text_fr` par défaut)
+
+    Un segment dont la traduction a échoué (tentatives épuisées) est abandonné
+    et signalé, plutôt que doublé avec le texte anglais.
+    Une traduction trop longue pour Text-to-Speech est découpée en plusieurs segments.
+    """
+    for i, (segment, (translated, error)) in enumerate(
+        zip(segments, results), first_index
+    ):
+        if error is not None:
+            drop("translation", i, error, start_time=segment["start_time"])
+            continue
+        yield from fit_tts_limit({**segment, key: translated}, key=key)
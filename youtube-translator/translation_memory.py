@@ -0,0 +1,177 @@
+"""
+Mémoire de traduction SQLite partagée entre les vidéos
+Clé = texte source normalisé + langue source + langue cible
+"""
+
+import json
+import sqlite3
+import threading
+import unicodedata
+from pathlib import Path
+
+from config import Config
+from metrics import inc
+from translation_batch import translate_texts
+
+
+def normalize(text):
+    """Normalise un texte source (Unicode NFC, espaces compactés)"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class TranslationMemory:
+    """Mémoire de traduction persistante avec lecture/écriture en masse"""
+
+    def __init__(self, path=None):
+        self.path = Path(path or Config.TRANSLATION_MEMORY_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS memory (
+                source_language TEXT NOT NULL,
+                target_language TEXT NOT NULL,
+                source_text TEXT NOT NULL,
+                translated_text TEXT NOT NULL,
+                uses INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (source_language, target_language, source_text)
+            )
+            """
+        )
+        self._conn.commit()
+
+        self.lookups = 0
+        self.hits = 0
+        self.chars_saved = 0
+
+    def lookup_many(self, texts, source_language, target_language):
+        """Cherche tous les textes en une requête, renvoie {texte normalisé: traduction}"""
+        keys = sorted({normalize(t) for t in texts})
+        if not keys:
+            return {}
+
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT source_text, translated_text FROM memory
+                WHERE source_language = ? AND target_language = ?
+                  AND source_text IN (SELECT value FROM json_each(?))
+                """,
+                (source_language, target_language, json.dumps(keys)),
+            ).fetchall()
+            found = dict(rows)
+            if found:
+                self._conn.execute(
+                    """
+                    UPDATE memory SET uses = uses + 1
+                    WHERE source_language = ? AND target_language = ?
+                      AND source_text IN (SELECT value FROM json_each(?))
+                    """,
+                    (source_language, target_language, json.dumps(list(found))),
+                )
+                self._conn.commit()
+
+            for text in texts:
+                self.lookups += 1
+                if normalize(text) in found:
+                    self.hits += 1
+                    self.chars_saved += len(text)
+
+        return found
+
+    def store_many(self, pairs, source_language, target_language):
+        """Enregistre des couples (source, traduction) en une transaction"""
+        rows = [
+            (source_language, target_language, normalize(src), dst)
+            for src, dst in pairs
+            if src.strip() and dst is not None
+        ]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT OR REPLACE INTO memory
+                    (source_language, target_language, source_text, translated_text)
+                VALUES (?, ?, ?, ?)
+                """,
+                rows,
+            )
+            self._conn.commit()
+
+    def stats(self):
+        """Taux de réussite et caractères économisés depuis l'ouverture"""
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM memory").fetchone()
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": self.hits / self.lookups if self.lookups else 0.0,
+            "chars_saved": self.chars_saved,
+            "entries": entries,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def translate_with_memory(
+    client, texts, source_language="en", target_language="fr", memory=None
+):
+    """Traduit via la mémoire puis l'API pour les seuls textes absents
+
+    Même contrat que `translate_texts` : liste alignée de (traduction, erreur).
+    """
+    inc("segments_total", len(texts), kind="translated")
+    if memory is None:
+        return translate_texts(client, texts, source_language, target_language)
+
+    found = memory.lookup_many(texts, source_language, target_language)
+    results = [(found.get(normalize(t)), None) for t in texts]
+
+    missing = [i for i, (text, _) in enumerate(results) if text is None]
+    if missing:
+        # Les doublons ne sont envoyés qu'une fois
+        unique = list(dict.fromkeys(normalize(texts[i]) for i in missing))
+        translated = dict(
+            zip(
+                unique,
+                translate_texts(client, unique, source_language, target_language),
+            )
+        )
+        for i in missing:
+            results[i] = translated[normalize(texts[i])]
+        memory.store_many(
+            [(src, dst) for src, (dst, error) in translated.items() if error is None],
+            source_language,
+            target_language,
+        )
+
+    missing_set = set(missing)
+    hits = [text for i, text in enumerate(texts) if i not in missing_set]
+    inc("translation_memory_hits_total", len(hits))
+    inc("translation_memory_chars_saved_total", sum(len(text) for text in hits))
+    s = memory.stats()
+    print(
+        f"📚 Mémoire de traduction: {s['hits']}/{s['lookups']} trouvés "
+        f"({s['hit_rate']:.0%}), {s['chars_saved']} caractères économisés"
+    )
+    return results
+
+
+_default_memory = None
+_default_lock = threading.Lock()
+
+
+def get_translation_memory():
+    """Mémoire de traduction partagée par le processus (None si désactivée)"""
+    global _default_memory
+    if not Config.TRANSLATION_MEMORY_ENABLED:
+        return None
+    with _default_lock:
+        if _default_memory is None:
+            _default_memory = TranslationMemory()
+        return _default_memory
@@ -0,0 +1,186 @@
+"""
+Cache disque des audios TTS, adressé par contenu
+Clé = hash de (texte, voix, langue, vitesse, encodage), éviction LRU sous plafond de taille
+"""
+
+import functools
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+
+from config import Config
+
+
+def cache_key(text, voice_name, language_code, speaking_rate, encoding):
+    """Calcule la clé de cache d'une requête de synthèse"""
+    payload = json.dumps(
+        [text, voice_name, language_code, float(speaking_rate), str(encoding)],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def encoding_tag(encoding="LINEAR16"):
+    """Format audio pour `cache_key` : nom de l'encodage et fréquence TTS
+
+    Même étiquette pour un nom ("LINEAR16") ou un membre d'AudioEncoding : les
+    moteurs partagent ainsi les clips en cache.
+    """
+    return f"{getattr(encoding, 'name', encoding)}@{Config.TTS_SAMPLE_RATE}"
+
+
+class TTSCache:
+    """Cache persistant des audios synthétisés avec éviction LRU"""
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = Path(directory or Config.TTS_CACHE_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = (
+            max_bytes if max_bytes is not None else Config.TTS_CACHE_MAX_MB * 1024 * 1024
+        )
+        self.hits = 0
+        self.misses = 0
+        self.collapsed = 0
+
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._entries = OrderedDict()  # clé -> taille, du moins au plus récent
+        self._total_bytes = 0
+
+        files = sorted(self.directory.glob("*.bin"), key=lambda f: f.stat().st_mtime)
+        for file in files:
+            size = file.stat().st_size
+            self._entries[file.stem] = size
+            self._total_bytes += size
+
+    def _path(self, key):
+        return self.directory / f"{key}.bin"
+
+    def get(self, key):
+        """Renvoie l'audio en cache ou None"""
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            with self._lock:
+                self._total_bytes -= self._entries.pop(key, 0)
+            return None
+
+    def put(self, key, data):
+        """Enregistre un audio puis évince les entrées les plus anciennes"""
+        path = self._path(key)
+        tmp = path.with_suffix(f".tmp{threading.get_ident()}")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def _evict(self):
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            old_key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self._path(old_key).unlink(missing_ok=True)
+
+    def get_or_synthesize(self, key, synthesize):
+        """Renvoie l'audio en cache, sinon appelle `synthesize()` une seule fois
+
+        Les requêtes identiques simultanées attendent le même appel.
+        """
+        data = self.get(key)
+        if data is not None:
+            with self._lock:
+                self.hits += 1
+            return data
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+                self.misses += 1
+            else:
+                self.collapsed += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            # Un autre appel a pu remplir le cache entre-temps
+            data = self.get(key)
+            if data is not None:
+                future.set_result(data)
+                return data
+            data = synthesize()
+            self.put(key, data)
+            future.set_result(data)
+            return data
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def stats(self):
+        """Statistiques d'utilisation du cache"""
+        with self._lock:
+            lookups = self.hits + self.misses + self.collapsed
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "collapsed": self.collapsed,
+                "hit_rate": (self.hits + self.collapsed) / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+            }
+
+
+def get_or_synthesize(key, synthesize, caches):
+    """Interroge les caches dans l'ordre, le premier étant le plus proche
+
+    Un audio synthétisé est enregistré dans chaque cache traversé.
+    """
+    for cache in reversed([c for c in caches if c is not None]):
+        synthesize = functools.partial(cache.get_or_synthesize, key, synthesize)
+    return synthesize()
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_tts_cache():
+    """Cache TTS partagé par le processus (None si désactivé)"""
+    global _default_cache
+    if not Config.TTS_CACHE_ENABLED:
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = TTSCache()
+        return _default_cache
+
+
+def print_cache_stats(cache):
+    """Affiche le bilan du cache TTS"""
+    if cache is None:
+        return
+    s = cache.stats()
+    print(
+        f"📦 Cache TTS: {s['hits']} hits, {s['misses']} misses, "
+        f"{s['collapsed']} doublons fusionnés ({s['hit_rate']:.0%})"
+    )
@@ -0,0 +1,83 @@
+"""
+Synthèse TTS concurrente avec pool de workers borné
+Les résultats sont rendus dans l'ordre des segments, quel que soit l'ordre d'arrivée
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from config import Config
+from metrics import drop, inc, propagate
+
+
+def synthesize_segments(segments, synthesize, max_workers=None, on_done=None):
+    """Synthétise tous les segments en parallèle
+
+    `synthesize(index, segment)` renvoie le résultat d'un segment (octets audio, chemin...).
+    Renvoie une liste alignée sur `segments` de dicts
+    {"index", "segment", "output", "error"} : un échec n'interrompt pas les autres
+    segments, il est simplement reporté dans "error".
+    """
+    max_workers = max_workers or Config.TTS_MAX_WORKERS
+    results = [None] * len(segments)
+
+    if not segments:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(propagate(synthesize), i, segment): i
+            for i, segment in enumerate(segments)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                output, error = future.result(), None
+            except Exception as e:
+                output, error = None, e
+
+            results[i] = {
+                "index": i,
+                "segment": segments[i],
+                "output": output,
+                "error": error,
+            }
+            if on_done:
+                on_done(results[i])
+
+    return results
+
+
+def synthesize_stream(segments, synthesize, max_workers=None):
+    """Générateur : synthétise les segments au fil de leur arrivée
+
+    `segments` peut être un itérateur. Le nombre de requêtes en vol est borné et
+    les résultats sont rendus dans l'ordre d'arrivée des segments.
+    """
+    max_workers = max_workers or Config.TTS_MAX_WORKERS
+    pending = deque()
+
+    def collect(i, segment, future):
+        try:
+            output, error = future.result(), None
+        except Exception as e:
+            output, error = None, e
+        return {"index": i, "segment": segment, "output": output, "error": error}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for i, segment in enumerate(segments):
+            future = executor.submit(propagate(synthesize), i, segment)
+            pending.append((i, segment, future))
+            if len(pending) >= max_workers * 2:
+                yield collect(*pending.popleft())
+        while pending:
+            yield collect(*pending.popleft())
+
+
+def report_failures(results):
+    """Signale les segments abandonnés (tentatives épuisées) et renvoie leur nombre"""
+    failures = [r for r in results if r and r["error"] is not None]
+    for r in failures:
+        drop("tts", r["index"], r["error"], start_time=r["segment"].get("start_time"))
+    inc("segments_total", len(results) - len(failures), kind="tts")
+    return len(failures)
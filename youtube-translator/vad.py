@@ -0,0 +1,63 @@
+"""
+Détection d'activité vocale par niveau de trame
+Niveaux, silences et régions de parole sont calculés en une passe, boucles en C
+(map/compress sur des vues d'échantillons) : découpage des morceaux, points de
+relance des flux et lecture en flux partagent les mêmes régions.
+"""
+
+from itertools import compress
+from operator import neg, ne
+
+from config import Config
+
+FRAME_MS = 20
+
+
+def frame_levels(samples, frame_samples, step=4):
+    """Niveau crête de chaque trame (un échantillon sur `step` pour rester rapide)
+
+    `samples` : vue ou tableau d'échantillons 16 bits (aucune copie).
+    """
+    starts = range(0, len(samples), frame_samples)
+    peaks = map(max, (samples[i : i + frame_samples : step] for i in starts))
+    troughs = map(min, (samples[i : i + frame_samples : step] for i in starts))
+    return list(map(max, peaks, map(neg, troughs)))
+
+
+def pcm_levels(data, frame_samples):
+    """Niveaux de trame d'un bloc PCM 16 bits (octets), sans copie du bloc"""
+    with memoryview(data) as raw, raw[: len(raw) // 2 * 2] as even:
+        with even.cast("h") as samples:
+            return frame_levels(samples, frame_samples)
+
+
+def silence_runs(levels, silence_threshold=None, min_frames=1):
+    """Silences (première trame, trame de fin exclue) d'au moins `min_frames`"""
+    silence_threshold = silence_threshold or Config.SILENCE_THRESHOLD
+    if not levels:
+        return []
+    quiet = list(map(silence_threshold.__ge__, levels))
+    edges = compress(range(1, len(quiet)), map(ne, quiet[1:], quiet[:-1]))
+    bounds = [0, *edges, len(quiet)]
+    return [
+        (a, b)
+        for a, b in zip(bounds, bounds[1:])
+        if quiet[a] and b - a >= min_frames
+    ]
+
+
+def speech_regions(
+    levels, frame_ms=FRAME_MS, silence_threshold=None, min_silence_ms=None
+):
+    """Régions de parole (début, fin) en secondes, séparées par les silences
+
+    Les silences plus courts que `min_silence_ms` restent dans la parole.
+    """
+    min_silence_frames = (min_silence_ms or Config.MIN_SILENCE_MS) // frame_ms
+    silences = silence_runs(levels, silence_threshold, max(1, min_silence_frames))
+    bounds = [0, *(edge for run in silences for edge in run), len(levels)]
+    return [
+        (a * frame_ms / 1000, b * frame_ms / 1000)
+        for a, b in zip(bounds[::2], bounds[1::2])
+        if b > a
+    ]
@@ -0,0 +1,81 @@
+"""
+Lecture des WAV PCM 16 bits par projection en mémoire
+Les échantillons sont exposés comme une vue typée sur le fichier mappé : ni
+lecture complète, ni copie dans le tas Python ; le système charge les pages à
+la demande.
+"""
+
+import mmap
+import struct
+
+
+class MappedWav:
+    """WAV PCM 16 bits mappé en mémoire (à utiliser comme gestionnaire de contexte)
+
+    `samples` est une vue 'h' sur les données (sans copie). Les vues rendues
+    par `pcm` doivent être libérées (ou copiées) avant `close`.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Fichier vide
+            self._file.close()
+            raise ValueError(f"WAV vide: {path}")
+        offset, size = self._parse_header(path)
+        # Taille déclarée fausse (écriture en flux par ffmpeg) : bornée au fichier
+        size = min(size, len(self._map) - offset)
+        self._data = memoryview(self._map)[offset : offset + size // 2 * 2]
+        self.samples = self._data.cast("h")
+
+    def _parse_header(self, path):
+        """Lit les blocs RIFF : format (fmt) puis position des données (data)"""
+        if self._map[:4] != b"RIFF" or self._map[8:12] != b"WAVE":
+            self._close_map()
+            raise ValueError(f"pas un fichier WAV: {path}")
+        position = 12
+        while position + 8 <= len(self._map):
+            chunk_id = self._map[position : position + 4]
+            (chunk_size,) = struct.unpack_from("<I", self._map, position + 4)
+            body = position + 8
+            if chunk_id == b"fmt ":
+                audio_format, self.channels, self.rate = struct.unpack_from(
+                    "<HHI", self._map, body
+                )
+                (bits,) = struct.unpack_from("<H", self._map, body + 14)
+                if audio_format != 1 or bits != 16:
+                    self._close_map()
+                    raise ValueError(f"WAV non PCM 16 bits: {path}")
+            elif chunk_id == b"data":
+                return body, chunk_size
+            position = body + chunk_size + chunk_size % 2
+        self._close_map()
+        raise ValueError(f"WAV sans données: {path}")
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.channels / self.rate
+
+    def pcm(self, start, end):
+        """Vue (sans copie) sur les octets PCM entre deux instants"""
+        frame_bytes = 2 * self.channels
+        first = max(0, int(start * self.rate)) * frame_bytes
+        last = max(0, int(end * self.rate)) * frame_bytes
+        return self._data[first:last]
+
+    def _close_map(self):
+        self._map.close()
+        self._file.close()
+
+    def close(self):
+        self.samples.release()
+        self._data.release()
+        self._close_map()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
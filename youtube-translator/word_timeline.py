@@ -0,0 +1,134 @@
+"""
+Mots horodatés en colonnes : débuts, fins et locuteurs dans des tableaux typés,
+les mots dans une liste
+Les changements de locuteur sont trouvés en une passe C (map/compress) ; la
+forme historique liste de dicts reste disponible comme vue paresseuse.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+from itertools import compress
+from operator import ne
+
+
+class WordTimeline(Sequence):
+    """Séquence de mots {"word", "start_time", "end_time", "speaker"}
+
+    Chaque élément n'est construit en dict qu'à la lecture (`timeline[i]`,
+    itération) ; les traitements internes travaillent sur les colonnes.
+    """
+
+    __slots__ = ("words", "starts", "ends", "speakers")
+
+    def __init__(self, words=(), starts=(), ends=(), speakers=()):
+        self.words = list(words)
+        self.starts = array("d", starts)
+        self.ends = array("d", ends)
+        self.speakers = array("i", speakers)
+
+    @classmethod
+    def from_words(cls, words):
+        """Timeline à partir d'une liste de dicts (ou d'une timeline, rendue telle quelle)"""
+        if isinstance(words, cls):
+            return words
+        return cls(
+            [w["word"] for w in words],
+            [w["start_time"] for w in words],
+            [w["end_time"] for w in words],
+            [w["speaker"] for w in words],
+        )
+
+    @classmethod
+    def concat(cls, timelines):
+        timeline = cls()
+        for other in timelines:
+            timeline.extend(other)
+        return timeline
+
+    def append(self, word, start_time, end_time, speaker):
+        self.words.append(word)
+        self.starts.append(start_time)
+        self.ends.append(end_time)
+        self.speakers.append(speaker)
+
+    def extend(self, other):
+        other = WordTimeline.from_words(other)
+        self.words.extend(other.words)
+        self.starts.extend(other.starts)
+        self.ends.extend(other.ends)
+        self.speakers.extend(other.speakers)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return WordTimeline(
+                self.words[index],
+                self.starts[index],
+                self.ends[index],
+                self.speakers[index],
+            )
+        return {
+            "word": self.words[index],
+            "start_time": self.starts[index],
+            "end_time": self.ends[index],
+            "speaker": self.speakers[index],
+        }
+
+    def __eq__(self, other):
+        if isinstance(other, Sequence):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"WordTimeline({len(self)} mots)"
+
+    def to_dicts(self):
+        """Forme liste de dicts (points de reprise JSON, code existant)"""
+        return list(self)
+
+    def since(self, seconds):
+        """Mots commençant à `seconds` ou après (débuts triés)"""
+        return self[bisect_left(self.starts, seconds) :]
+
+    def remap_speakers(self, mapping):
+        """Copie avec les étiquettes de locuteur renommées selon `mapping`"""
+        speakers = self.speakers
+        return WordTimeline(
+            self.words,
+            self.starts,
+            self.ends,
+            map(mapping.get, speakers, speakers),
+        )
+
+    def speaker_boundaries(self):
+        """Indices où commence chaque tour de parole (0 inclus)"""
+        if not self.speakers:
+            return []
+        speakers = self.speakers
+        changes = map(ne, speakers[1:], speakers[:-1])
+        return [0, *compress(range(1, len(speakers)), changes)]
+
+    def speaker_turns(self):
+        """Regroupe les mots par tour de parole, avec timings
+
+        Un tour se termine 0,1 s avant le début du suivant ; le dernier à la fin
+        de son dernier mot.
+        """
+        starts = self.speaker_boundaries()
+        stops = starts[1:] + [len(self)]
+        return [
+            {
+                "speaker": self.speakers[start],
+                "text": " ".join(self.words[start:stop]),
+                "start_time": self.starts[start],
+                "end_time": (
+                    self.starts[stop] - 0.1 if stop < len(self) else self.ends[-1]
+                ),
+            }
+            for start, stop in zip(starts, stops)
+        ]
@@ -0,0 +1,43 @@
+"""
+Espace de travail isolé par job : tous les fichiers intermédiaires (WAV, clips
+TTS, timeline, listes ffmpeg) y sont créés, et seul ce répertoire est nettoyé
+Plusieurs jobs peuvent ainsi tourner en parallèle dans le même répertoire.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from config import Config
+
+TMPFS_ROOT = Path("/dev/shm")
+
+
+def workspace_root():
+    """Racine des espaces de travail (tmpfs si demandé et disponible)"""
+    if Config.WORKSPACE_TMPFS and TMPFS_ROOT.is_dir():
+        return TMPFS_ROOT / "youtube-translator"
+    return Path(Config.WORKSPACE_DIR)
+
+
+class Workspace:
+    """Répertoire temporaire propre à un job, supprimé par `cleanup()`"""
+
+    def __init__(self, name="job", root=None):
+        root = Path(root or workspace_root())
+        root.mkdir(parents=True, exist_ok=True)
+        self.dir = Path(tempfile.mkdtemp(prefix=f"{name}-", dir=root))
+
+    def path(self, name):
+        """Chemin d'un fichier intermédiaire du job"""
+        return str(self.dir / name)
+
+    def cleanup(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cleanup()
+        return False